@@ -0,0 +1,70 @@
+"""
+Script para comparar el backend ONNX (int8) del encoder contra PyTorch.
+Codifica las vacantes del CSV incluido con ambos backends y reporta la
+concordancia de coseno por texto y el throughput (textos/s) de cada uno.
+"""
+import argparse
+import csv
+import sys
+import time
+import numpy as np
+from services.vacante_features_service import VacanteFeaturesService
+from utils import cv_matcher as cm
+
+CSV_DEFAULT = "empleos_estudiantes_saltillo_monterrey_2025-11-06.csv"
+
+
+def leer_textos(path: str, limite: int | None) -> list[str]:
+    with open(path, newline="", encoding="utf-8") as f:
+        textos = [VacanteFeaturesService._vacante_text_from_json(row) for row in csv.DictReader(f)]
+    textos = [t for t in textos if t.strip()]
+    return textos[:limite] if limite else textos
+
+
+def codificar(backend: str, textos: list[str], batch_size: int) -> tuple[np.ndarray, float]:
+    model = cm.load_embedder_backend(backend)
+    model.encode(textos[:batch_size], batch_size=batch_size)  # calentamiento
+    t0 = time.perf_counter()
+    embs = model.encode(textos, batch_size=batch_size, normalize_embeddings=True)
+    return np.asarray(embs, dtype=np.float32), len(textos) / (time.perf_counter() - t0)
+
+
+def comparar(backend: str, csv_path: str, umbral: float, fraccion: float, limite: int | None, batch_size: int) -> bool:
+    if cm.backend_disponible(backend) != backend:
+        raise SystemExit(f"❌ {backend} no está disponible (falta onnxruntime): se compararía torch contra torch")
+    textos = leer_textos(csv_path, limite)
+    print(f"📄 {len(textos)} textos de {csv_path}")
+
+    ref, tp_ref = codificar("torch", textos, batch_size)
+    emb, tp = codificar(backend, textos, batch_size)
+
+    cos = (ref * emb).sum(axis=1)
+    # ¿El vecino más cercano de cada texto es el mismo con ambos backends?
+    sim_ref, sim = ref @ ref.T, emb @ emb.T
+    np.fill_diagonal(sim_ref, -1)
+    np.fill_diagonal(sim, -1)
+    vecino = float((sim_ref.argmax(axis=1) == sim.argmax(axis=1)).mean())
+    ok = float((cos >= umbral).mean())
+
+    print(f"⏱️ torch: {tp_ref:.1f} textos/s | {backend}: {tp:.1f} textos/s ({tp / tp_ref:.2f}x)")
+    print(f"📐 coseno torch vs {backend}: min {cos.min():.4f} | media {cos.mean():.4f} | p5 {np.percentile(cos, 5):.4f}")
+    print(f"   textos con coseno >= {umbral}: {ok:.2%} (mínimo exigido {fraccion:.0%})")
+    print(f"   mismo vecino más cercano: {vecino:.2%}")
+
+    if ok >= fraccion:
+        print("✅ Paridad aceptable")
+        return True
+    print("❌ El backend no alcanza la paridad exigida")
+    return False
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Paridad y throughput del encoder ONNX vs PyTorch")
+    parser.add_argument("--backend", default="onnx-int8", choices=["onnx", "onnx-int8"])
+    parser.add_argument("--csv", default=CSV_DEFAULT, help="CSV de vacantes")
+    parser.add_argument("--umbral", type=float, default=0.98, help="Coseno mínimo por texto")
+    parser.add_argument("--fraccion", type=float, default=0.99, help="Fracción de textos que deben pasar el umbral")
+    parser.add_argument("--limite", type=int, default=None, help="Máximo de textos a usar")
+    parser.add_argument("--batch-size", type=int, default=32)
+    args = parser.parse_args()
+    sys.exit(0 if comparar(args.backend, args.csv, args.umbral, args.fraccion, args.limite, args.batch_size) else 1)
@@ -8,5 +8,9 @@ from .postulacion_dao import PostulacionDAO
 from .cv_dao import CVDAO
 from .cv_features_dao import CVFeaturesDAO
 from .vacantes_features_dao import VacanteFeaturesDAO
+from .skill_dao import SkillDAO
+from .recomendacion_dao import RecomendacionDAO
+from .cv_job_dao import CVJobDAO
+from .contador_cambios_dao import ContadorCambiosDAO
 
-__all__ = ["VacanteDAO", "UsuarioDAO", "EmpresaDAO", "PostulacionDAO", "CVDAO", "CVFeaturesDAO", "VacanteFeaturesDAO"]
+__all__ = ["VacanteDAO", "UsuarioDAO", "EmpresaDAO", "PostulacionDAO", "CVDAO", "CVFeaturesDAO", "VacanteFeaturesDAO", "SkillDAO", "RecomendacionDAO", "CVJobDAO", "ContadorCambiosDAO"]
@@ -0,0 +1,31 @@
+"""
+DAO de los contadores de cambios por tabla.
+
+`bump` se llama dentro de la misma transacción que la escritura: el UPDATE
+bloquea la fila del contador hasta el commit, así que los escritores de una
+tabla se ordenan y el valor visible solo crece en el orden en que se
+confirman (a diferencia de updated_at, que es el inicio de cada transacción).
+"""
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from models.contador_cambios import ContadorCambios
+
+
+class ContadorCambiosDAO:
+    """Data Access Object para ContadorCambios"""
+
+    @staticmethod
+    def bump(db: Session, tabla: str):
+        """Sube el contador de `tabla` (sin commit: lo confirma la escritura que lo acompaña)"""
+        db.execute(
+            text(
+                "INSERT INTO contador_cambios (tabla, n) VALUES (:t, 1) "
+                "ON CONFLICT (tabla) DO UPDATE SET n = contador_cambios.n + 1"
+            ),
+            {"t": tabla},
+        )
+
+    @staticmethod
+    def get(db: Session, tabla: str) -> int:
+        """Valor actual del contador de `tabla` (0 si nunca se escribió)"""
+        return db.query(ContadorCambios.n).filter(ContadorCambios.tabla == tabla).scalar() or 0
@@ -1,37 +1,89 @@
 """
 DAO para operaciones de base de datos de CV
 """
+from sqlalchemy import Row, case, func
 from sqlalchemy.orm import Session
 from models.cv import CV
+from models.usuario import Usuario
 from typing import List, Optional
 
+# Columnas de los listados (CVResponse): nunca el archivo
+CV_META = (CV.id, CV.usuario_id, CV.nombre_archivo, CV.tipo, CV.fecha_subida)
+
 
 class CVDAO:
     """Data Access Object para CV"""
 
     @staticmethod
-    def get_all(db: Session, skip: int = 0, limit: int = 100) -> List[CV]:
-        """Obtiene todos los CVs"""
-        return db.query(CV).offset(skip).limit(limit).all()
+    def get_all(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Row]:
+        """
+        Obtiene los metadatos de todos los CVs (sin el archivo), en orden de ID.
+        Con `after_id` pagina por keyset (id > after_id) en lugar de OFFSET.
+        """
+        query = db.query(*CV_META).order_by(CV.id)
+        if after_id is not None:
+            return query.filter(CV.id > after_id).limit(limit).all()
+        return query.offset(skip).limit(limit).all()
 
     @staticmethod
     def get_by_id(db: Session, cv_id: int) -> Optional[CV]:
-        """Obtiene un CV por su ID"""
+        """Obtiene un CV por su ID (sin el archivo; ver get_archivo)"""
         return db.query(CV).filter(CV.id == cv_id).first()
 
     @staticmethod
-    def get_by_usuario(db: Session, usuario_id: int) -> List[CV]:
-        """Obtiene todos los CVs de un usuario específico"""
-        return db.query(CV).filter(CV.usuario_id == usuario_id).all()
+    def get_by_usuario(db: Session, usuario_id: int) -> List[Row]:
+        """Obtiene los metadatos de los CVs de un usuario específico (sin el archivo)"""
+        return db.query(*CV_META).filter(CV.usuario_id == usuario_id).all()
+
+    @staticmethod
+    def get_latest_id(db: Session, usuario_id: int, bloquear: bool = False) -> Optional[int]:
+        """
+        ID del CV más reciente del usuario. Con `bloquear`, antes toma el lock de
+        la fila del usuario (hasta el commit) para serializar quién escribe sus features.
+        """
+        if bloquear:
+            db.query(Usuario.id).filter(Usuario.id == usuario_id).with_for_update().scalar()
+        return db.query(func.max(CV.id)).filter(CV.usuario_id == usuario_id).scalar()
+
+    @staticmethod
+    def get_archivo(db: Session, cv_id: int) -> Optional[bytes]:
+        """Lee el PDF completo de un CV (la columna está diferida en el modelo)"""
+        return db.query(CV.archivo).filter(CV.id == cv_id).scalar()
+
+    @staticmethod
+    def get_descarga_meta(db: Session, cv_id: int):
+        """
+        Metadatos para descargar un CV sin leer el archivo: nombre, tipo, tamaño
+        y hash. En CVs anteriores a la columna sha256, el md5 se calcula en Postgres.
+        """
+        return (
+            db.query(
+                CV.id,
+                CV.nombre_archivo,
+                CV.tipo,
+                CV.sha256,
+                func.octet_length(CV.archivo).label("tamano"),
+                case((CV.sha256.is_(None), func.md5(CV.archivo)), else_=None).label("md5"),
+            )
+            .filter(CV.id == cv_id)
+            .first()
+        )
+
+    @staticmethod
+    def read_chunk(db: Session, cv_id: int, inicio: int, largo: int) -> bytes:
+        """Lee `largo` bytes del archivo desde `inicio` (0-based) con substring en Postgres"""
+        return db.query(func.substring(CV.archivo, inicio + 1, largo)).filter(CV.id == cv_id).scalar() or b""
 
     @staticmethod
-    def create(db: Session, usuario_id: int, nombre_archivo: str, tipo: str, archivo: bytes) -> CV:
+    def create(db: Session, usuario_id: int, nombre_archivo: str, tipo: str, archivo: bytes,
+               sha256: Optional[str] = None) -> CV:
         """Crea un nuevo CV"""
         cv = CV(
             usuario_id=usuario_id,
             nombre_archivo=nombre_archivo,
             tipo=tipo,
-            archivo=archivo
+            archivo=archivo,
+            sha256=sha256
         )
         db.add(cv)
         db.commit()
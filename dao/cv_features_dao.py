@@ -1,5 +1,7 @@
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from models.features import CVFeatures
+from dao.contador_cambios_dao import ContadorCambiosDAO
 
 class CVFeaturesDAO:
 
@@ -8,19 +10,61 @@ class CVFeaturesDAO:
         return db.query(CVFeatures).get(usuario_id)
 
     @staticmethod
-    def upsert(db: Session, usuario_id: int, texto: str, skills: list, embedding: list[float]) -> CVFeatures:
+    def get_all(db: Session) -> list[CVFeatures]:
+        return db.query(CVFeatures).all()
+
+    @staticmethod
+    def get_by_ids(db: Session, ids: list[int]) -> list[CVFeatures]:
+        return db.query(CVFeatures).filter(CVFeatures.usuario_id.in_(ids)).all()
+
+    @staticmethod
+    def get_stamp(db: Session) -> tuple:
+        """(número de filas, contador de cambios); ver VacanteFeaturesDAO.get_stamp."""
+        count = db.query(func.count(CVFeatures.usuario_id)).scalar()
+        return count, ContadorCambiosDAO.get(db, CVFeatures.__tablename__)
+
+    @staticmethod
+    def get_versions(db: Session) -> dict:
+        """usuario_id -> updated_at, sin cargar texto ni embeddings."""
+        return dict(db.query(CVFeatures.usuario_id, CVFeatures.updated_at).all())
+
+    @staticmethod
+    def set_skill_ids(db: Session, usuario_id: int, skill_ids: list[int]):
+        db.query(CVFeatures).filter(CVFeatures.usuario_id == usuario_id).update(
+            {CVFeatures.skill_ids: skill_ids}, synchronize_session="fetch"
+        )
+        ContadorCambiosDAO.bump(db, CVFeatures.__tablename__)
+        db.commit()
+
+    @staticmethod
+    def set_skill_ids_many(db: Session, skill_ids: dict[int, list[int]]):
+        """Guarda skill_ids de varios usuarios en un solo commit (backfill)."""
+        if not skill_ids:
+            return
+        db.bulk_update_mappings(
+            CVFeatures, [{"usuario_id": u, "skill_ids": ids} for u, ids in skill_ids.items()]
+        )
+        ContadorCambiosDAO.bump(db, CVFeatures.__tablename__)
+        db.commit()
+
+    @staticmethod
+    def upsert(db: Session, usuario_id: int, texto: str, skills: list, embedding: list[float],
+               skill_ids: list[int] | None = None) -> CVFeatures:
         rec = db.query(CVFeatures).get(usuario_id)
         if rec:
             rec.texto = texto
             rec.skills = skills
             rec.embedding = embedding
+            rec.skill_ids = skill_ids
         else:
             rec = CVFeatures(
                 usuario_id=usuario_id,
                 texto=texto,
                 skills=skills,
-                embedding=embedding
+                embedding=embedding,
+                skill_ids=skill_ids
             )
             db.add(rec)
+        ContadorCambiosDAO.bump(db, CVFeatures.__tablename__)
         db.commit(); db.refresh(rec)
         return rec
\ No newline at end of file
@@ -0,0 +1,106 @@
+"""
+DAO para la cola de jobs de CV (tabla cv_jobs)
+"""
+from datetime import timedelta
+from sqlalchemy import or_, and_
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+from models.cv_job import CVJob, PENDIENTE, PROCESANDO, TERMINADO, ERROR, REEMPLAZADO
+from typing import Optional
+
+
+class CVJobDAO:
+    """Data Access Object para CVJob"""
+
+    @staticmethod
+    def get_by_id(db: Session, job_id: int) -> Optional[CVJob]:
+        """Obtiene un job por su ID"""
+        return db.query(CVJob).filter(CVJob.id == job_id).first()
+
+    @staticmethod
+    def create(db: Session, cv_id: int, usuario_id: int) -> CVJob:
+        """Encola un job pendiente para un CV"""
+        job = CVJob(cv_id=cv_id, usuario_id=usuario_id, estado=PENDIENTE, progreso=0)
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        return job
+
+    @staticmethod
+    def claim_next(db: Session, max_intentos: int, timeout_s: int) -> Optional[CVJob]:
+        """
+        Toma el siguiente job pendiente (o uno en proceso cuyo plazo venció, p. ej.
+        por un worker caído) con SELECT ... FOR UPDATE SKIP LOCKED, así varios
+        workers y procesos drenan la cola sin tomar el mismo job.
+        Los jobs vencidos que ya agotaron sus intentos pasan a `error`.
+        """
+        vencido = func.now() - timedelta(seconds=timeout_s)
+        agotados = db.query(CVJob).filter(
+            CVJob.estado == PROCESANDO, CVJob.iniciado_en < vencido, CVJob.intentos >= max_intentos
+        ).update(
+            {"estado": ERROR, "etapa": None, "error": "El último intento no terminó a tiempo",
+             "terminado_en": func.now()},
+            synchronize_session=False,
+        )
+        if agotados:
+            db.commit()
+        job = (
+            db.query(CVJob)
+            .filter(
+                CVJob.intentos < max_intentos,
+                or_(
+                    CVJob.estado == PENDIENTE,
+                    and_(CVJob.estado == PROCESANDO, CVJob.iniciado_en < vencido),
+                ),
+            )
+            .order_by(CVJob.id)
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+        if job is None:
+            db.rollback()
+            return None
+        job.estado = PROCESANDO
+        job.etapa = None
+        job.progreso = 0
+        job.intentos += 1
+        job.iniciado_en = func.now()
+        db.commit()
+        db.refresh(job)
+        return job
+
+    @staticmethod
+    def set_progress(db: Session, job_id: int, progreso: int, etapa: str):
+        """Actualiza el avance de un job en proceso"""
+        db.query(CVJob).filter(CVJob.id == job_id).update(
+            {"progreso": progreso, "etapa": etapa}, synchronize_session=False
+        )
+        db.commit()
+
+    @staticmethod
+    def finish(db: Session, job_id: int):
+        """Marca un job como terminado"""
+        db.query(CVJob).filter(CVJob.id == job_id).update(
+            {"estado": TERMINADO, "progreso": 100, "etapa": None, "error": None, "terminado_en": func.now()},
+            synchronize_session=False,
+        )
+        db.commit()
+
+    @staticmethod
+    def fail(db: Session, job_id: int, error: str, reintentar: bool):
+        """Registra el error; el job vuelve a la cola si le quedan intentos"""
+        valores = {"error": error[:2000], "etapa": None}
+        if reintentar:
+            valores.update(estado=PENDIENTE, progreso=0)
+        else:
+            valores.update(estado=ERROR, terminado_en=func.now())
+        db.query(CVJob).filter(CVJob.id == job_id).update(valores, synchronize_session=False)
+        db.commit()
+
+    @staticmethod
+    def supersede(db: Session, job_id: int):
+        """Cierra un job cuyo CV ya no es el más reciente del usuario"""
+        db.query(CVJob).filter(CVJob.id == job_id).update(
+            {"estado": REEMPLAZADO, "etapa": None, "terminado_en": func.now()}, synchronize_session=False
+        )
+        db.commit()
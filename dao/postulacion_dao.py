@@ -11,9 +11,15 @@ class PostulacionDAO:
     """DAO para Postulacion"""
 
     @staticmethod
-    def get_all(db: Session, skip: int = 0, limit: int = 100) -> List[Postulacion]:
-        """Obtiene todas las postulaciones"""
-        return db.query(Postulacion).offset(skip).limit(limit).all()
+    def get_all(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Postulacion]:
+        """
+        Obtiene todas las postulaciones, en orden de ID.
+        Con `after_id` pagina por keyset (id > after_id) en lugar de OFFSET.
+        """
+        query = db.query(Postulacion).order_by(Postulacion.id)
+        if after_id is not None:
+            return query.filter(Postulacion.id > after_id).limit(limit).all()
+        return query.offset(skip).limit(limit).all()
 
     @staticmethod
     def get_by_id(db: Session, postulacion_id: int) -> Optional[Postulacion]:
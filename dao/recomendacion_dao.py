@@ -0,0 +1,35 @@
+"""
+DAO para las recomendaciones precalculadas
+"""
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+from models.recomendacion import Recomendacion
+from typing import List
+
+
+class RecomendacionDAO:
+    """Data Access Object para Recomendacion"""
+
+    @staticmethod
+    def get_by_usuario(db: Session, usuario_id: int, limit: int = 100, desde: int = 0) -> List[Recomendacion]:
+        """Obtiene el top precalculado de un usuario, en orden, desde la posición `desde` (keyset)"""
+        return (
+            db.query(Recomendacion)
+            .filter(Recomendacion.usuario_id == usuario_id, Recomendacion.posicion >= desde)
+            .order_by(Recomendacion.posicion)
+            .limit(limit)
+            .all()
+        )
+
+    @staticmethod
+    def get_stamp(db: Session, usuario_id: int):
+        """Momento del último precálculo del usuario (None si no tiene)"""
+        return db.query(func.max(Recomendacion.calculado_en)).filter(Recomendacion.usuario_id == usuario_id).scalar()
+
+    @staticmethod
+    def replace_for_usuarios(db: Session, usuario_ids: List[int], filas: List[dict]):
+        """Reemplaza en una sola transacción las recomendaciones de varios usuarios"""
+        db.query(Recomendacion).filter(Recomendacion.usuario_id.in_(usuario_ids)).delete(synchronize_session=False)
+        if filas:
+            db.execute(insert(Recomendacion), filas)
+        db.commit()
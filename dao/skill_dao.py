@@ -0,0 +1,47 @@
+"""
+DAO para el vocabulario canónico de skills
+"""
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from models.skill import Skill, SkillAlias
+from typing import List, Tuple
+
+# Clave del advisory lock que serializa la creación de skills entre procesos
+SKILL_LOCK_KEY = 727_001
+
+
+class SkillDAO:
+    """Data Access Object para Skill y SkillAlias"""
+
+    @staticmethod
+    def get_all(db: Session, since_id: int = 0) -> List[Skill]:
+        """Obtiene las skills canónicas con ID mayor a `since_id`"""
+        return db.query(Skill).filter(Skill.id > since_id).order_by(Skill.id).all()
+
+    @staticmethod
+    def get_aliases(db: Session) -> List[Tuple[str, int]]:
+        """Obtiene todas las variantes (frase, skill_id)"""
+        return db.query(SkillAlias.frase, SkillAlias.skill_id).all()
+
+    @staticmethod
+    def lock(db: Session):
+        """Toma el advisory lock de la transacción actual (se libera en commit/rollback)"""
+        db.execute(text("SELECT pg_advisory_xact_lock(:k)"), {"k": SKILL_LOCK_KEY})
+
+    @staticmethod
+    def create(db: Session, nombre: str) -> int:
+        """Crea (o reutiliza) una skill canónica y retorna su ID. No hace commit."""
+        db.execute(insert(Skill).values(nombre=nombre).on_conflict_do_nothing(index_elements=["nombre"]))
+        return db.query(Skill.id).filter(Skill.nombre == nombre).scalar()
+
+    @staticmethod
+    def add_aliases(db: Session, pares: List[Tuple[str, int]]):
+        """Registra variantes (frase, skill_id). No hace commit."""
+        if not pares:
+            return
+        db.execute(
+            insert(SkillAlias)
+            .values([{"frase": f, "skill_id": i} for f, i in pares])
+            .on_conflict_do_nothing(index_elements=["frase"])
+        )
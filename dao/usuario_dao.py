@@ -10,15 +10,38 @@ class UsuarioDAO:
     """Data Access Object para Usuario"""
 
     @staticmethod
-    def get_all(db: Session, skip: int = 0, limit: int = 100) -> List[Usuario]:
-        """Obtiene todos los usuarios con paginación"""
-        return db.query(Usuario).offset(skip).limit(limit).all()
+    def get_all(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Usuario]:
+        """
+        Obtiene todos los usuarios con paginación, en orden de ID.
+        Con `after_id` pagina por keyset (id > after_id) en lugar de OFFSET.
+        """
+        query = db.query(Usuario).order_by(Usuario.id)
+        if after_id is not None:
+            return query.filter(Usuario.id > after_id).limit(limit).all()
+        return query.offset(skip).limit(limit).all()
 
     @staticmethod
     def get_by_id(db: Session, usuario_id: int) -> Optional[Usuario]:
         """Obtiene un usuario por ID"""
         return db.query(Usuario).filter(Usuario.id == usuario_id).first()
 
+    @staticmethod
+    def get_by_ids(db: Session, ids: List[int]) -> List[Usuario]:
+        """Obtiene varios usuarios por ID (sin orden garantizado)"""
+        if not ids:
+            return []
+        return db.query(Usuario).filter(Usuario.id.in_(ids)).all()
+
+    @staticmethod
+    def ids_by_filters(db: Session, carrera: Optional[str] = None, cuatrimestre: Optional[int] = None) -> List[int]:
+        """IDs de usuarios que cumplen los filtros (carrera parcial, cuatrimestre exacto)"""
+        q = db.query(Usuario.id)
+        if carrera:
+            q = q.filter(Usuario.carrera.ilike(f"%{carrera}%"))
+        if cuatrimestre is not None:
+            q = q.filter(Usuario.cuatrimestre == cuatrimestre)
+        return [r[0] for r in q.all()]
+
     @staticmethod
     def get_by_matricula(db: Session, matricula: str) -> Optional[Usuario]:
         """Obtiene un usuario por matrícula"""
@@ -1,24 +1,107 @@
 """
 DAO para operaciones de base de datos de Vacante
 """
+import csv
+import io
+from types import SimpleNamespace
+from sqlalchemy import Text, case, cast, func, literal, type_coerce, text
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, array
 from sqlalchemy.orm import Session
 from models.vacante import Vacante
+from dao.contador_cambios_dao import ContadorCambiosDAO
+from utils.facetas import FACETAS
 from typing import List, Optional, Any
 import json
 
 
 class VacanteDAO:
-    """Data Access Object para Vacante"""
+    """
+    Data Access Object para Vacante.
+
+    Las lecturas aceptan `campos` (ver utils.proyeccion.parse_campos): con él
+    la consulta trae solo las claves pedidas de `datos_vacante` y devuelve
+    objetos simples (id, nombre_empresa, datos_vacante) en lugar de modelos.
+    """
+
+    @staticmethod
+    def datos_columna(campos: tuple):
+        """Expresión SQL de `datos_vacante` proyectada: jsonb_build_object o el operador `-`"""
+        modo, claves = campos
+        if modo == "fields":
+            pares = []
+            for c in claves:
+                pares += [literal(c, Text), Vacante.datos_vacante.op("->")(literal(c, Text))]
+            expr = func.jsonb_build_object(*pares)
+        else:
+            expr = Vacante.datos_vacante.op("-")(cast(array([literal(c, Text) for c in claves]), ARRAY(Text)))
+        # Filas con datos que no son un objeto JSON (texto suelto) se devuelven igual
+        objeto = func.jsonb_typeof(Vacante.datos_vacante) == "object"
+        return type_coerce(case((objeto, expr), else_=Vacante.datos_vacante), JSONB).label("datos_vacante")
+
+    @staticmethod
+    def _query(db: Session, campos: Optional[tuple]):
+        if campos is None:
+            return db.query(Vacante)
+        return db.query(Vacante.id, Vacante.nombre_empresa, VacanteDAO.datos_columna(campos))
+
+    @staticmethod
+    def _rows(rows, campos: Optional[tuple]) -> list:
+        # Objetos mutables: el ranking les agrega match_score, match_terms, ...
+        return rows if campos is None else [SimpleNamespace(**r._mapping) for r in rows]
+
+    @staticmethod
+    def aplicar_filtros(query, filtros: Optional[dict], excepto: Optional[str] = None):
+        """Filtra por facetas (ver utils.facetas.parse_filtros); `excepto` omite una de ellas"""
+        for faceta, valor in (filtros or {}).items():
+            if faceta == excepto:
+                continue
+            col = getattr(Vacante, faceta)
+            query = query.filter(col == valor if faceta == "apto_estudiantes" else col.in_(valor))
+        return query
+
+    @staticmethod
+    def get_all(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None,
+                campos: Optional[tuple] = None, filtros: Optional[dict] = None) -> List[Vacante]:
+        """
+        Obtiene todas las vacantes con paginación, en orden de ID.
+        Con `after_id` pagina por keyset (id > after_id) en lugar de OFFSET.
+        """
+        query = VacanteDAO.aplicar_filtros(VacanteDAO._query(db, campos), filtros).order_by(Vacante.id)
+        if after_id is not None:
+            return VacanteDAO._rows(query.filter(Vacante.id > after_id).limit(limit).all(), campos)
+        return VacanteDAO._rows(query.offset(skip).limit(limit).all(), campos)
 
     @staticmethod
-    def get_all(db: Session, skip: int = 0, limit: int = 100) -> List[Vacante]:
-        """Obtiene todas las vacantes con paginación"""
-        return db.query(Vacante).offset(skip).limit(limit).all()
+    def get_ids(db: Session, filtros: Optional[dict] = None) -> List[int]:
+        """IDs de las vacantes que cumplen los filtros (solo índices de facetas, sin leer datos)"""
+        return [r[0] for r in VacanteDAO.aplicar_filtros(db.query(Vacante.id), filtros).all()]
 
     @staticmethod
-    def get_by_id(db: Session, vacante_id: int) -> Optional[Vacante]:
+    def facet_counts(db: Session, filtros: Optional[dict] = None) -> dict:
+        """
+        Conteo de vacantes por valor de cada faceta. Cada faceta se cuenta con
+        los filtros de las demás (no la propia), para poder ampliar la selección.
+        """
+        conteos = {"total": VacanteDAO.aplicar_filtros(db.query(func.count(Vacante.id)), filtros).scalar()}
+        for faceta in FACETAS:
+            col = getattr(Vacante, faceta)
+            query = VacanteDAO.aplicar_filtros(db.query(col, func.count(Vacante.id)), filtros, excepto=faceta)
+            filas = query.group_by(col).order_by(func.count(Vacante.id).desc(), col).all()
+            conteos[faceta] = [{"valor": valor, "total": total} for valor, total in filas]
+        return conteos
+
+    @staticmethod
+    def get_by_id(db: Session, vacante_id: int, campos: Optional[tuple] = None) -> Optional[Vacante]:
         """Obtiene una vacante por ID"""
-        return db.query(Vacante).filter(Vacante.id == vacante_id).first()
+        rows = VacanteDAO._rows(VacanteDAO._query(db, campos).filter(Vacante.id == vacante_id).limit(1).all(), campos)
+        return rows[0] if rows else None
+
+    @staticmethod
+    def get_by_ids(db: Session, ids: List[int], campos: Optional[tuple] = None) -> List[Vacante]:
+        """Obtiene varias vacantes por ID (sin orden garantizado)"""
+        if not ids:
+            return []
+        return VacanteDAO._rows(VacanteDAO._query(db, campos).filter(Vacante.id.in_(ids)).all(), campos)
 
     @staticmethod
     def create(db: Session, nombre_empresa: str, datos_vacante: Optional[Any] = None) -> Vacante:
@@ -34,6 +117,7 @@ class VacanteDAO:
             datos_vacante=datos_vacante
         )
         db.add(vacante)
+        ContadorCambiosDAO.bump(db, Vacante.__tablename__)
         db.commit()
         db.refresh(vacante)
         return vacante
@@ -55,6 +139,7 @@ class VacanteDAO:
         if datos_vacante is not None:
             vacante.datos_vacante = datos_vacante
 
+        ContadorCambiosDAO.bump(db, Vacante.__tablename__)
         db.commit()
         db.refresh(vacante)
         return vacante
@@ -67,12 +152,76 @@ class VacanteDAO:
             return False
 
         db.delete(vacante)
+        ContadorCambiosDAO.bump(db, Vacante.__tablename__)
         db.commit()
         return True
 
     @staticmethod
-    def search_by_empresa(db: Session, nombre_empresa: str) -> List[Vacante]:
-        """Busca vacantes por nombre de empresa (búsqueda parcial)"""
-        return db.query(Vacante).filter(
+    def search_by_empresa(db: Session, nombre_empresa: str, skip: int = 0, limit: Optional[int] = None,
+                          campos: Optional[tuple] = None) -> List[Vacante]:
+        """Busca vacantes por nombre de empresa (búsqueda parcial, índice trigram), en orden de ID"""
+        query = VacanteDAO._query(db, campos).filter(
             Vacante.nombre_empresa.ilike(f"%{nombre_empresa}%")
-        ).all()
+        ).order_by(Vacante.id).offset(skip)
+        if limit is not None:
+            query = query.limit(limit)
+        return VacanteDAO._rows(query.all(), campos)
+
+    @staticmethod
+    def search_text(db: Session, q: str, skip: int = 0, limit: int = 100, nombre_empresa: Optional[str] = None,
+                    campos: Optional[tuple] = None) -> List[tuple]:
+        """
+        Búsqueda de texto completo (tsvector generado + índice GIN) ordenada por
+        ts_rank. Devuelve pares (vacante, rank). `q` admite la sintaxis de
+        websearch_to_tsquery: "frase exacta", OR, -excluir.
+        """
+        tsq = func.websearch_to_tsquery("spanish", q)
+        rank = func.ts_rank(Vacante.busqueda, tsq).label("rank")
+        query = VacanteDAO._query(db, campos).add_columns(rank).filter(Vacante.busqueda.op("@@")(tsq))
+        if nombre_empresa:
+            query = query.filter(Vacante.nombre_empresa.ilike(f"%{nombre_empresa}%"))
+        rows = query.order_by(rank.desc(), Vacante.id).offset(skip).limit(limit).all()
+        if campos is None:
+            return [(r[0], r.rank) for r in rows]
+        return [(SimpleNamespace(**{k: v for k, v in r._mapping.items() if k != "rank"}), r.rank) for r in rows]
+
+    @staticmethod
+    def copy_import(db: Session, filas: List[tuple]) -> tuple[int, List[tuple]]:
+        """
+        Importa (nombre_empresa, datos_vacante) en bloque: COPY a una tabla
+        temporal y un solo INSERT ... ON CONFLICT sobre source_url (las ya
+        importadas se omiten). Devuelve (insertadas, pendientes): las vacantes
+        del lote que aún no tienen vacante_features, como (id, datos_vacante),
+        incluidas las de una corrida anterior que no terminó.
+        """
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        for nombre_empresa, datos in filas:
+            writer.writerow([nombre_empresa, json.dumps(datos, ensure_ascii=False)])
+        buf.seek(0)
+
+        db.execute(text(
+            "CREATE TEMP TABLE IF NOT EXISTS vacantes_staging "
+            "(nombre_empresa TEXT, datos_vacante JSONB) ON COMMIT DELETE ROWS"
+        ))
+        cur = db.connection().connection.cursor()
+        try:
+            cur.copy_expert("COPY vacantes_staging (nombre_empresa, datos_vacante) FROM STDIN WITH (FORMAT csv)", buf)
+        finally:
+            cur.close()
+
+        insertadas = db.execute(text(
+            "INSERT INTO vacantes (nombre_empresa, datos_vacante) "
+            "SELECT nombre_empresa, datos_vacante FROM vacantes_staging "
+            "ON CONFLICT ((datos_vacante->>'source_url')) DO NOTHING"
+        )).rowcount
+        pendientes = db.execute(text(
+            "SELECT v.id, v.datos_vacante FROM vacantes v "
+            "LEFT JOIN vacante_features f ON f.vacante_id = v.id "
+            "WHERE v.datos_vacante->>'source_url' IN (SELECT datos_vacante->>'source_url' FROM vacantes_staging) "
+            "AND f.vacante_id IS NULL ORDER BY v.id"
+        )).all()
+        if insertadas:
+            ContadorCambiosDAO.bump(db, Vacante.__tablename__)
+        db.commit()
+        return insertadas, [(r[0], r[1]) for r in pendientes]
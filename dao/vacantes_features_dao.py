@@ -1,5 +1,11 @@
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 from models.features import VacanteFeatures
+from dao.contador_cambios_dao import ContadorCambiosDAO
+
+# Tope de pgvector para hnsw.ef_search: la etapa ANN nunca devuelve más vecinos
+ANN_MAX = 1000
 
 class VacanteFeaturesDAO:
 
@@ -12,20 +18,101 @@ class VacanteFeaturesDAO:
         return db.query(VacanteFeatures).filter(VacanteFeatures.vacante_id.in_(ids)).all()
 
     @staticmethod
-    def upsert(db: Session, vacante_id: int, jd_text: str, jd_terms: list, embedding: list[float]) -> VacanteFeatures:
+    def get_all(db: Session) -> list[VacanteFeatures]:
+        return db.query(VacanteFeatures).all()
+
+    @staticmethod
+    def get_stamp(db: Session) -> tuple:
+        """
+        (número de filas, contador de cambios): cambia con cada escritura confirmada
+        y con los borrados (incluidos los en cascada desde vacantes). Leerlo antes
+        que las filas: así nunca queda asociado a un estado más nuevo que el leído.
+        """
+        count = db.query(func.count(VacanteFeatures.vacante_id)).scalar()
+        return count, ContadorCambiosDAO.get(db, VacanteFeatures.__tablename__)
+
+    @staticmethod
+    def get_versions(db: Session) -> dict:
+        """vacante_id -> updated_at, sin cargar texto ni embeddings."""
+        return dict(db.query(VacanteFeatures.vacante_id, VacanteFeatures.updated_at).all())
+
+    @staticmethod
+    def set_term_ids(db: Session, term_ids: dict[int, list[int]]):
+        """Guarda jd_term_ids de varias vacantes en un solo commit (backfill)."""
+        if not term_ids:
+            return
+        db.bulk_update_mappings(
+            VacanteFeatures, [{"vacante_id": i, "jd_term_ids": ids} for i, ids in term_ids.items()]
+        )
+        ContadorCambiosDAO.bump(db, VacanteFeatures.__tablename__)
+        db.commit()
+
+    @staticmethod
+    def bulk_upsert(db: Session, filas: list[dict]):
+        """
+        Inserta o reemplaza varias filas {vacante_id, jd_text, jd_terms, embedding,
+        jd_term_ids} en una sola sentencia INSERT ... ON CONFLICT y un commit.
+        """
+        if not filas:
+            return
+        stmt = insert(VacanteFeatures).values(filas)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[VacanteFeatures.vacante_id],
+            set_={
+                "jd_text": stmt.excluded.jd_text,
+                "jd_terms": stmt.excluded.jd_terms,
+                "jd_term_ids": stmt.excluded.jd_term_ids,
+                "embedding": stmt.excluded.embedding,
+                "updated_at": func.now(),
+            },
+        )
+        db.execute(stmt)
+        ContadorCambiosDAO.bump(db, VacanteFeatures.__tablename__)
+        db.commit()
+
+    @staticmethod
+    def nearest_ids(
+        db: Session, embedding, limit: int,
+        ef_search: int | None = None, probes: int | None = None
+    ) -> list[int]:
+        """
+        IDs de las `limit` vacantes más cercanas por coseno usando el índice ANN.
+        ef_search (HNSW) y probes (IVFFlat) solo aplican a esta transacción.
+        `limit` y ef_search se acotan a ANN_MAX (para más, puntuar sin ANN).
+        """
+        limit = min(limit, ANN_MAX)
+        if ef_search is not None:
+            # HNSW nunca devuelve más de ef_search filas
+            db.execute(text("SELECT set_config('hnsw.ef_search', :v, true)"), {"v": str(min(max(ef_search, limit), ANN_MAX))})
+        if probes is not None:
+            db.execute(text("SELECT set_config('ivfflat.probes', :v, true)"), {"v": str(probes)})
+        rows = (
+            db.query(VacanteFeatures.vacante_id)
+            .order_by(VacanteFeatures.embedding.cosine_distance(embedding))
+            .limit(limit)
+            .all()
+        )
+        return [r[0] for r in rows]
+
+    @staticmethod
+    def upsert(db: Session, vacante_id: int, jd_text: str, jd_terms: list, embedding: list[float],
+               jd_term_ids: list[int] | None = None) -> VacanteFeatures:
         rec = db.query(VacanteFeatures).get(vacante_id)
         if rec:
             rec.jd_text = jd_text
             rec.jd_terms = jd_terms
             rec.embedding = embedding
+            rec.jd_term_ids = jd_term_ids
         else:
             rec = VacanteFeatures(
                 vacante_id=vacante_id,
                 jd_text=jd_text,
                 jd_terms=jd_terms,
-                embedding=embedding
+                embedding=embedding,
+                jd_term_ids=jd_term_ids
             )
             db.add(rec)
+        ContadorCambiosDAO.bump(db, VacanteFeatures.__tablename__)
         db.commit()
         db.refresh(rec)
-        return rec
\ No newline at end of file
+        return rec
@@ -54,6 +54,10 @@ def get_db_context():
 
 def init_db():
     """
-    Inicializa la base de datos creando todas las tablas.
+    Inicializa la base de datos creando todas las tablas y aplicando las
+    migraciones de las tablas que ya existían (ver migraciones.py).
     """
+    from migraciones import aplicar_migraciones, preparar_extensiones
+    preparar_extensiones(engine)
     Base.metadata.create_all(bind=engine)
+    aplicar_migraciones(engine)
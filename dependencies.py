@@ -1,6 +1,7 @@
 """
 Dependencies para FastAPI (Dependency Injection)
 """
+import os
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
@@ -12,6 +13,9 @@ from models.usuario import Usuario
 # OAuth2 scheme para el token
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+# Matrículas con acceso a las rutas de reclutador (separadas por coma); vacío = nadie
+RECLUTADORES = {m.strip() for m in os.getenv("RECLUTADORES", "").split(",") if m.strip()}
+
 
 def get_current_user(
     token: str = Depends(oauth2_scheme),
@@ -42,3 +46,17 @@ def get_current_user(
         raise credentials_exception
     
     return usuario
+
+
+def get_reclutador(current_user: Usuario = Depends(get_current_user)) -> Usuario:
+    """
+    Dependency para rutas de reclutador (datos de otros estudiantes). Todos los
+    usuarios son estudiantes, así que el acceso es por lista explícita de
+    matrículas (RECLUTADORES).
+    """
+    if current_user.matricula not in RECLUTADORES:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Solo los reclutadores pueden ver candidatos"
+        )
+    return current_user
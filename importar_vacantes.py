@@ -0,0 +1,95 @@
+"""
+Script para importar vacantes en bloque desde un CSV (una vacante por fila).
+
+Lee el CSV en streaming, inserta cada lote con COPY a una tabla temporal y un
+solo INSERT ... ON CONFLICT, calcula las features de las vacantes nuevas por
+lotes (nlp.pipe y encode en bloque) repartidas en un pool de procesos, y las
+guarda con un upsert en bloque. Es idempotente por `source_url`: volver a
+correrlo no duplica vacantes y completa las features que hayan quedado
+pendientes. Las filas sin `source_url` se omiten.
+"""
+import argparse
+import csv
+import sys
+import time
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from database import get_db_context
+from dao.vacante_dao import VacanteDAO
+from services.vacante_features_service import VacanteFeaturesService
+
+
+def _features_lote(textos: list[str], n_process: int) -> list[tuple[str, list, list[float]]]:
+    """Trabajo de un proceso del pool: features de un lote de textos."""
+    return VacanteFeaturesService.build_features_many(textos, n_process)
+
+
+def _leer_lotes(ruta: str, lote: int):
+    """Filas del CSV como (nombre_empresa, datos_vacante), de `lote` en `lote`; cuenta las omitidas."""
+    csv.field_size_limit(sys.maxsize)
+    with open(ruta, newline="", encoding="utf-8-sig") as f:
+        filas, omitidas = [], 0
+        for row in csv.DictReader(f):
+            datos = {k: v for k, v in row.items() if k and v not in (None, "")}
+            if not datos.get("source_url"):
+                omitidas += 1
+                continue
+            filas.append((datos.get("company") or "N/D", datos))
+            if len(filas) >= lote:
+                yield filas, omitidas
+                filas, omitidas = [], 0
+        if filas or omitidas:
+            yield filas, omitidas
+
+
+def importar(ruta: str, lote: int, lote_features: int, workers: int, n_process: int):
+    """Importa el CSV y reporta filas por segundo"""
+    t0 = time.perf_counter()
+    leidas = insertadas = omitidas = con_features = 0
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn")) if workers > 1 else None
+
+    with get_db_context() as db:
+        try:
+            for filas, n_omitidas in _leer_lotes(ruta, lote):
+                leidas += len(filas) + n_omitidas
+                omitidas += n_omitidas
+                if not filas:
+                    continue
+                n, pendientes = VacanteDAO.copy_import(db, filas)
+                insertadas += n
+
+                ids = [vid for vid, _ in pendientes]
+                textos = [VacanteFeaturesService._vacante_text_from_json(datos or {}) for _, datos in pendientes]
+                trozos = [textos[i:i + lote_features] for i in range(0, len(textos), lote_features)]
+                if pool is not None:
+                    resultados = pool.map(_features_lote, trozos, [n_process] * len(trozos))
+                else:
+                    resultados = (_features_lote(t, n_process) for t in trozos)
+                features = [f for r in resultados for f in r]
+                con_features += VacanteFeaturesService.bulk_upsert_features(db, ids, features)
+
+                dt = time.perf_counter() - t0
+                print(f"📦 {leidas} filas leídas, {insertadas} vacantes nuevas, "
+                      f"{con_features} con features ({leidas / dt:.1f} filas/s)")
+        except Exception as e:
+            print(f"❌ Error al importar vacantes: {str(e)}")
+            raise
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+    dt = time.perf_counter() - t0
+    print(f"✅ Importación terminada en {dt:.1f} s: {leidas} filas ({leidas / dt:.1f} filas/s), "
+          f"{insertadas} nuevas, {leidas - omitidas - insertadas} ya existentes, "
+          f"{omitidas} sin source_url, {con_features} features guardadas")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Importa vacantes en bloque desde un CSV")
+    parser.add_argument("csv", help="Ruta del CSV (encabezados: title, company, source_url, ...)")
+    parser.add_argument("--lote", type=int, default=1000, help="Filas por COPY/INSERT")
+    parser.add_argument("--lote-features", type=int, default=64, help="Vacantes por lote de features")
+    parser.add_argument("--workers", type=int, default=1, help="Procesos para calcular features (1 = en este proceso)")
+    parser.add_argument("--n-process", type=int, default=1, help="Procesos de spaCy (nlp.pipe) por worker")
+    args = parser.parse_args()
+    importar(args.csv, args.lote, args.lote_features, args.workers, args.n_process)
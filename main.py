@@ -3,8 +3,14 @@ Aplicación principal de FastAPI
 """
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from database import init_db
-from routers import vacante_router, usuario_router, auth_router, empresa_router, postulacion_router, cv_router
+from database import init_db, get_db_context
+from utils.paginacion import CURSOR_HEADER
+from services.vacante_features_service import VacanteFeaturesService
+from services.skill_service import SkillService
+from services.cv_features_service import CVFeaturesService
+from services.cv_job_service import get_cv_worker_pool
+from utils.pdf_extract import get_pdf_extractor
+from routers import vacante_router, usuario_router, auth_router, empresa_router, postulacion_router, cv_router, metricas_router
 
 # Crear la aplicación FastAPI
 app = FastAPI(
@@ -20,6 +26,7 @@ app.add_middleware(
     allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[CURSOR_HEADER, "Location", "ETag", "Content-Range", "Accept-Ranges"],
 )
 
 # Incluir routers
@@ -29,6 +36,7 @@ app.include_router(vacante_router)
 app.include_router(empresa_router)
 app.include_router(postulacion_router)
 app.include_router(cv_router)
+app.include_router(metricas_router)
 
 
 @app.on_event("startup")
@@ -36,6 +44,20 @@ def on_startup():
     """Evento que se ejecuta al iniciar la aplicación"""
     # Inicializar la base de datos (crear tablas)
     init_db()
+    # Cargar el vocabulario de skills y construir una sola vez los índices de vacantes y CVs
+    with get_db_context() as db:
+        SkillService.load(db)
+        VacanteFeaturesService.rebuild_index(db)
+        CVFeaturesService.rebuild_index(db)
+    # Workers que drenan la cola de CVs subidos (cv_jobs)
+    get_cv_worker_pool().start()
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    """Evento que se ejecuta al detener la aplicación"""
+    get_cv_worker_pool().stop()
+    get_pdf_extractor().shutdown()
 
 
 @app.get("/")
@@ -0,0 +1,128 @@
+"""
+Migraciones de esquema que create_all no aplica sobre una base existente.
+
+init_db (database.py) crea las tablas que faltan, pero no agrega columnas ni
+índices a las que ya existen ni cambia su almacenamiento. Antes de create_all
+se crean las extensiones que usan los modelos (EXTENSIONES); después, cada
+paso de PASOS es idempotente y se aplica en orden, en una sola transacción y
+bajo un advisory lock (los workers de gunicorn arrancan a la vez). Solo aplica
+a Postgres. También se puede correr a mano:
+
+    python migraciones.py
+"""
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.schema import CreateColumn, Table
+from models.vacante import Vacante
+from models.features import CVFeatures, VacanteFeatures
+
+# Clave del pg_advisory_xact_lock que serializa las migraciones entre procesos
+MIGRACIONES_LOCK = 7270001
+# pg_trgm: índice gin_trgm_ops de vacantes.nombre_empresa; vector: columnas de pgvector
+EXTENSIONES = ["pg_trgm", "vector"]
+
+
+def _agregar_columnas(conn: Connection, tabla: Table):
+    """
+    Agrega las columnas del modelo que faltan en la tabla, con la misma DDL que
+    usaría create_all (las Computed quedan GENERATED ALWAYS AS (...) STORED).
+    """
+    existentes = {c["name"] for c in inspect(conn).get_columns(tabla.name)}
+    for col in tabla.columns:
+        if col.name in existentes:
+            continue
+        ddl = CreateColumn(col).compile(dialect=conn.dialect)
+        conn.execute(text(f"ALTER TABLE {tabla.name} ADD COLUMN IF NOT EXISTS {ddl}"))
+        print(f"🛠️ Columna {tabla.name}.{col.name} agregada")
+
+
+def _crear_indices(conn: Connection, tabla: Table):
+    """Crea los índices del modelo que faltan; un índice único que choca con datos existentes se omite con aviso."""
+    for idx in sorted(tabla.indexes, key=lambda i: i.name):
+        if idx.unique:
+            savepoint = conn.begin_nested()
+            try:
+                idx.create(conn, checkfirst=True)
+                savepoint.commit()
+            except IntegrityError as e:
+                savepoint.rollback()
+                print(f"⚠️ No se creó {idx.name} (hay filas repetidas): {e.orig}")
+        else:
+            idx.create(conn, checkfirst=True)
+
+
+def _vacantes_busqueda_y_facetas(conn: Connection):
+    """tsvector de búsqueda, facetas generadas y sus índices (trigram, GIN, únicos por source_url)."""
+    _agregar_columnas(conn, Vacante.__table__)
+    _crear_indices(conn, Vacante.__table__)
+
+
+def _cv_sha256(conn: Connection):
+    """Hash del archivo para el ETag de la descarga (CVs anteriores a la columna)."""
+    conn.execute(text("ALTER TABLE cv ADD COLUMN IF NOT EXISTS sha256 VARCHAR(64)"))
+    n = conn.execute(text(
+        "UPDATE cv SET sha256 = encode(sha256(archivo), 'hex') WHERE sha256 IS NULL"
+    )).rowcount
+    if n:
+        print(f"🛠️ cv.sha256 calculado para {n} CVs")
+
+
+def _cv_archivo_external(conn: Connection):
+    """
+    Archivo sin comprimir (STORAGE EXTERNAL) para que substring() lea solo los
+    trozos pedidos. El cambio solo afecta a valores nuevos: las filas existentes
+    se reescriben (`archivo || ''` fuerza un valor nuevo; `archivo = archivo`
+    conservaría el TOAST comprimido).
+    """
+    storage = conn.execute(text(
+        "SELECT attstorage FROM pg_attribute WHERE attrelid = 'cv'::regclass AND attname = 'archivo'"
+    )).scalar()
+    if storage == "e":
+        return
+    conn.execute(text("ALTER TABLE cv ALTER COLUMN archivo SET STORAGE EXTERNAL"))
+    n = conn.execute(text("UPDATE cv SET archivo = archivo || ''::bytea")).rowcount
+    print(f"🛠️ cv.archivo sin comprimir (STORAGE EXTERNAL); {n} CVs reescritos")
+
+
+def _features_ids_y_ann(conn: Connection):
+    """skill_ids / jd_term_ids (vocabulario canónico) e índices HNSW de cv_features y vacante_features."""
+    for tabla in (CVFeatures.__table__, VacanteFeatures.__table__):
+        _agregar_columnas(conn, tabla)
+        _crear_indices(conn, tabla)
+
+
+PASOS = [
+    _cv_sha256,
+    _cv_archivo_external,
+    _vacantes_busqueda_y_facetas,
+    _features_ids_y_ann,
+]
+
+
+def preparar_extensiones(bind: Engine):
+    """Crea las extensiones que necesitan los modelos; va antes de create_all."""
+    if bind.dialect.name != "postgresql":
+        return
+    with bind.begin() as conn:
+        for ext in EXTENSIONES:
+            conn.execute(text(f"CREATE EXTENSION IF NOT EXISTS {ext}"))
+
+
+def aplicar_migraciones(bind: Engine):
+    """Aplica PASOS en orden (no hace nada fuera de Postgres)."""
+    if bind.dialect.name != "postgresql":
+        return
+    with bind.begin() as conn:
+        conn.execute(text("SELECT pg_advisory_xact_lock(:k)"), {"k": MIGRACIONES_LOCK})
+        for paso in PASOS:
+            paso(conn)
+
+
+if __name__ == "__main__":
+    import models  # noqa: F401  (registra todas las tablas)
+    from database import Base, engine
+    preparar_extensiones(engine)
+    Base.metadata.create_all(bind=engine)
+    aplicar_migraciones(engine)
+    print("✅ Migraciones aplicadas")
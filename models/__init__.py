@@ -7,5 +7,9 @@ from .empresa import Empresa
 from .postulacion import Postulacion
 from .cv import CV
 from .features import CVFeatures, VacanteFeatures
+from .skill import Skill, SkillAlias
+from .recomendacion import Recomendacion
+from .cv_job import CVJob
+from .contador_cambios import ContadorCambios
 
-__all__ = ["Vacante", "Usuario", "Empresa", "Postulacion", "CV", "CVFeatures", "VacanteFeatures"]
+__all__ = ["Vacante", "Usuario", "Empresa", "Postulacion", "CV", "CVFeatures", "VacanteFeatures", "Skill", "SkillAlias", "Recomendacion", "CVJob", "ContadorCambios"]
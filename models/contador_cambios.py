@@ -0,0 +1,12 @@
+"""
+Modelo de ContadorCambios (un contador por tabla, sube en cada escritura)
+"""
+from sqlalchemy import Column, BigInteger, String
+from database import Base
+
+
+class ContadorCambios(Base):
+    __tablename__ = "contador_cambios"
+
+    tabla = Column(String(50), primary_key=True)
+    n = Column(BigInteger, nullable=False, default=0)
@@ -2,6 +2,7 @@
 Modelo SQLAlchemy para CV
 """
 from sqlalchemy import Column, Integer, String, LargeBinary, TIMESTAMP, ForeignKey
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 from database import Base
 
@@ -13,5 +14,7 @@ class CV(Base):
     usuario_id = Column(Integer, ForeignKey("usuarios.id"), nullable=False)
     nombre_archivo = Column(String(255), nullable=False)
     tipo = Column(String(100), default="application/pdf")
-    archivo = Column(LargeBinary, nullable=False)
+    # El PDF no se carga con la fila (y acceder a él sin pedirlo falla): se lee con CVDAO.get_archivo
+    archivo = deferred(Column(LargeBinary, nullable=False), raiseload=True)
+    sha256 = Column(String(64), nullable=True)  # hash del archivo (ETag de la descarga)
     fecha_subida = Column(TIMESTAMP(timezone=False), server_default=func.now())
@@ -0,0 +1,30 @@
+"""
+Modelo de CVJob (extracción de features de un CV en segundo plano)
+"""
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
+from database import Base
+
+# Estados de un job
+PENDIENTE = "pendiente"
+PROCESANDO = "procesando"
+TERMINADO = "terminado"
+ERROR = "error"
+REEMPLAZADO = "reemplazado"  # el usuario subió un CV más nuevo antes de que terminara
+
+
+class CVJob(Base):
+    __tablename__ = "cv_jobs"
+    __table_args__ = (Index("ix_cv_jobs_estado_id", "estado", "id"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    cv_id = Column(Integer, ForeignKey("cv.id", ondelete="CASCADE"), nullable=False)
+    usuario_id = Column(Integer, ForeignKey("usuarios.id", ondelete="CASCADE"), nullable=False)
+    estado = Column(String(20), nullable=False, default=PENDIENTE)
+    etapa = Column(String(50), nullable=True)
+    progreso = Column(Integer, nullable=False, default=0)
+    intentos = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+    creado_en = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    iniciado_en = Column(DateTime(timezone=True), nullable=True)
+    terminado_en = Column(DateTime(timezone=True), nullable=True)
@@ -1,21 +1,32 @@
-from sqlalchemy import Column, BigInteger, Text, DateTime, ForeignKey
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import Column, BigInteger, Integer, Text, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import JSONB, ARRAY
 from sqlalchemy.sql import func
 from database import Base
 from pgvector.sqlalchemy import Vector 
 
+# Índices ANN (HNSW, distancia coseno) para la recuperación de candidatos en Postgres
+_HNSW = dict(
+    postgresql_using="hnsw",
+    postgresql_with={"m": 16, "ef_construction": 64},
+    postgresql_ops={"embedding": "vector_cosine_ops"},
+)
+
 class CVFeatures(Base):
     __tablename__ = "cv_features"
+    __table_args__ = (Index("ix_cv_features_embedding_hnsw", "embedding", **_HNSW),)
     usuario_id = Column(BigInteger, ForeignKey("usuarios.id", ondelete="CASCADE"), primary_key=True)
     texto = Column(Text, nullable=False)
     skills = Column(JSONB, nullable=False, default=list)
+    skill_ids = Column(ARRAY(Integer), nullable=True)  # IDs canónicos ordenados (tabla skills)
     embedding = Column(Vector(1024), nullable=False) 
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
 class VacanteFeatures(Base):
     __tablename__ = "vacante_features"
+    __table_args__ = (Index("ix_vacante_features_embedding_hnsw", "embedding", **_HNSW),)
     vacante_id = Column(BigInteger, ForeignKey("vacantes.id", ondelete="CASCADE"), primary_key=True)
     jd_text = Column(Text, nullable=False)
     jd_terms = Column(JSONB, nullable=False, default=list)
+    jd_term_ids = Column(ARRAY(Integer), nullable=True)  # IDs canónicos ordenados (tabla skills)
     embedding = Column(Vector(1024), nullable=False) 
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
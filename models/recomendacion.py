@@ -0,0 +1,22 @@
+"""
+Modelo de Recomendacion (top-K de vacantes precalculado por usuario)
+"""
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+from database import Base
+
+
+class Recomendacion(Base):
+    __tablename__ = "recomendaciones"
+    __table_args__ = (Index("ix_recomendaciones_usuario_posicion", "usuario_id", "posicion"),)
+
+    usuario_id = Column(Integer, ForeignKey("usuarios.id", ondelete="CASCADE"), primary_key=True)
+    vacante_id = Column(Integer, ForeignKey("vacantes.id", ondelete="CASCADE"), primary_key=True)
+    posicion = Column(Integer, nullable=False)
+    score = Column(Float, nullable=False)
+    cos = Column(Float, nullable=True)
+    bm25 = Column(Float, nullable=True)
+    overlap = Column(Float, nullable=True)
+    match_terms = Column(JSONB, nullable=False, default=list)
+    calculado_en = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
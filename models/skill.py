@@ -0,0 +1,21 @@
+"""
+Modelos del vocabulario canónico de skills
+"""
+from sqlalchemy import Column, Integer, Text, ForeignKey
+from database import Base
+
+
+class Skill(Base):
+    """Skill canónica: cada frase normalizada y sus variantes apuntan a un solo ID estable"""
+    __tablename__ = "skills"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    nombre = Column(Text, unique=True, nullable=False)
+
+
+class SkillAlias(Base):
+    """Variante (frase normalizada) plegada a una skill canónica"""
+    __tablename__ = "skill_alias"
+
+    frase = Column(Text, primary_key=True)
+    skill_id = Column(Integer, ForeignKey("skills.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -1,18 +1,59 @@
 """
 Modelo de Vacante
 """
-from sqlalchemy import Column, Integer, String
-from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import Column, Integer, String, Boolean, Text, Computed, Index, text
+from sqlalchemy.orm import relationship, deferred
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from database import Base
 
+# Texto de búsqueda (español) con pesos: título > requisitos y áreas > empresa
+BUSQUEDA_SQL = (
+    "setweight(to_tsvector('spanish', coalesce(datos_vacante->>'title', '')), 'A') || "
+    "setweight(to_tsvector('spanish', coalesce(datos_vacante->>'requirements_summary', '')), 'B') || "
+    "setweight(to_tsvector('spanish', coalesce(datos_vacante->>'matched_utc_areas', '')), 'B') || "
+    "setweight(to_tsvector('spanish', coalesce(datos_vacante->>'company', nombre_empresa)), 'C')"
+)
+
+
+def _faceta_sql(clave: str) -> str:
+    return f"nullif(btrim(datos_vacante->>'{clave}'), '')"
+
+
+# student_friendly llega como booleano JSON o como texto ("True"/"False") desde el CSV
+APTO_ESTUDIANTES_SQL = (
+    "CASE lower(btrim(datos_vacante->>'student_friendly')) "
+    "WHEN 'true' THEN true WHEN 'false' THEN false END"
+)
+
 
 class Vacante(Base):
     __tablename__ = "vacantes"
+    __table_args__ = (
+        Index("ix_vacantes_busqueda", "busqueda", postgresql_using="gin"),
+        # Búsqueda por subcadena (ilike '%...%') de empresa; requiere la extensión pg_trgm
+        Index("ix_vacantes_nombre_empresa_trgm", "nombre_empresa", postgresql_using="gin",
+              postgresql_ops={"nombre_empresa": "gin_trgm_ops"}),
+        # Facetas (filtros y conteos)
+        Index("ix_vacantes_ciudad", "ciudad"),
+        Index("ix_vacantes_estado", "estado"),
+        Index("ix_vacantes_modalidad", "modalidad"),
+        Index("ix_vacantes_tipo_empleo", "tipo_empleo"),
+        Index("ix_vacantes_apto_estudiantes", "apto_estudiantes"),
+        # Una vacante por URL de origen: hace idempotente la importación masiva
+        Index("ux_vacantes_source_url", text("(datos_vacante->>'source_url')"), unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     nombre_empresa = Column(String(255), nullable=False)
     datos_vacante = Column(JSONB, nullable=True)
+    # Columna generada por Postgres; diferida para no traer el tsvector en cada lectura
+    busqueda = deferred(Column(TSVECTOR, Computed(BUSQUEDA_SQL, persisted=True)))
+    # Facetas extraídas de datos_vacante por Postgres (columnas generadas e indexadas)
+    ciudad = Column(Text, Computed(_faceta_sql("city"), persisted=True))
+    estado = Column(Text, Computed(_faceta_sql("state"), persisted=True))
+    modalidad = Column(Text, Computed(_faceta_sql("modality"), persisted=True))
+    tipo_empleo = Column(Text, Computed(_faceta_sql("job_type"), persisted=True))
+    apto_estudiantes = Column(Boolean, Computed(APTO_ESTUDIANTES_SQL, persisted=True))
 
     postulaciones = relationship("Postulacion", back_populates="vacante")
 
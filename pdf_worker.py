@@ -0,0 +1,34 @@
+"""
+Trabajo de extracción de PDFs que corre dentro de los procesos del pool de
+utils.pdf_extract.
+
+Vive fuera del paquete `utils` a propósito: los procesos se crean con spawn y
+al deserializar la tarea importan el módulo de la función. Importar algo de
+`utils` cargaría utils/__init__ (jose, spaCy, sentence-transformers, NLTK) en
+cada proceso del pool, y ese arranque contaría contra PDF_TIMEOUT_S. Aquí solo
+se importan pypdf y pdfminer.
+"""
+from io import BytesIO
+
+
+def pypdf_range(b: bytes, start: int, stop: int) -> tuple[str, int]:
+    """Texto de las páginas [start, stop) con pypdf y total de páginas del documento."""
+    from pypdf import PdfReader
+    pdf = PdfReader(BytesIO(b))
+    n_pages = len(pdf.pages)
+    txt = "\n".join(pdf.pages[i].extract_text() or "" for i in range(start, min(stop, n_pages)))
+    return txt, n_pages
+
+
+def try_pypdf_range(b: bytes, start: int, stop: int) -> tuple[str | None, int]:
+    try:
+        return pypdf_range(b, start, stop)
+    except Exception:
+        return None, 0
+
+
+def pdfminer_text(b: bytes, max_pages: int) -> str:
+    from pdfminer.high_level import extract_text_to_fp
+    bio_in, bio_out = BytesIO(b), BytesIO()
+    extract_text_to_fp(bio_in, bio_out, maxpages=max_pages)
+    return bio_out.getvalue().decode("utf-8", errors="ignore")
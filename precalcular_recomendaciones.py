@@ -0,0 +1,29 @@
+"""
+Script para precalcular las recomendaciones de vacantes de todos los usuarios con CV.
+Pensado para correr en lote (p.ej. cada noche con cron).
+"""
+import argparse
+from database import get_db_context
+from services.recomendacion_service import RecomendacionService
+
+
+def precalcular_recomendaciones(topk: int, lote: int):
+    """Calcula y guarda el top-K de vacantes de cada usuario"""
+    with get_db_context() as db:
+        try:
+            stats = RecomendacionService.precompute_all(db, topk=topk, lote=lote)
+            print(f"✅ Recomendaciones precalculadas:")
+            print(f"   Usuarios: {stats['usuarios']}")
+            print(f"   Filas: {stats['filas']}")
+            print(f"   Tiempo: {stats['segundos']} s")
+        except Exception as e:
+            print(f"❌ Error al precalcular recomendaciones: {str(e)}")
+            raise
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precalcula el top-K de vacantes por usuario")
+    parser.add_argument("--topk", type=int, default=100, help="Vacantes por usuario")
+    parser.add_argument("--lote", type=int, default=256, help="Usuarios por lote de cálculo")
+    args = parser.parse_args()
+    precalcular_recomendaciones(args.topk, args.lote)
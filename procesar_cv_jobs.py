@@ -0,0 +1,28 @@
+"""
+Script para drenar la cola de CVs subidos (cv_jobs) fuera de la API.
+Útil con CV_WORKERS=0 en los workers web, o para vaciar un atraso.
+"""
+import argparse
+import time
+from services.cv_job_service import CVWorkerPool, CV_WORKERS, CV_JOB_POLL_S
+
+
+def procesar(workers: int, poll_s: float):
+    """Corre el pool de workers hasta Ctrl+C"""
+    pool = CVWorkerPool(workers=workers, poll_s=poll_s)
+    pool.start()
+    print(f"✅ Procesando jobs de CV con {workers} workers (Ctrl+C para salir)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pool.stop()
+        print("👋 Workers detenidos")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Procesa la cola de extracción de features de CVs")
+    parser.add_argument("--workers", type=int, default=max(CV_WORKERS, 1), help="Hilos de procesamiento")
+    parser.add_argument("--poll", type=float, default=CV_JOB_POLL_S, help="Segundos entre sondeos de la cola")
+    args = parser.parse_args()
+    procesar(args.workers, args.poll)
@@ -0,0 +1,34 @@
+"""
+Script para recalcular las features (términos/skills y embeddings) de vacantes y CVs.
+Útil tras cambiar el pipeline de extracción o el backend del encoder.
+"""
+import argparse
+from database import get_db_context
+from services.vacante_features_service import VacanteFeaturesService
+from services.cv_features_service import CVFeaturesService
+
+
+def reprocesar(vacantes: bool, cvs: bool, lote: int, n_process: int):
+    """Reprocesa por lotes con nlp.pipe y encode en bloque"""
+    with get_db_context() as db:
+        try:
+            if vacantes:
+                n = VacanteFeaturesService.reprocess_all(db, lote=lote, n_process=n_process)
+                print(f"✅ Vacantes reprocesadas: {n}")
+            if cvs:
+                n = CVFeaturesService.reprocess_all(db, lote=lote, n_process=n_process)
+                print(f"✅ CVs reprocesados: {n}")
+        except Exception as e:
+            print(f"❌ Error al reprocesar features: {str(e)}")
+            raise
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recalcula las features de vacantes y/o CVs")
+    parser.add_argument("--vacantes", action="store_true", help="Reprocesar vacantes")
+    parser.add_argument("--cvs", action="store_true", help="Reprocesar CVs")
+    parser.add_argument("--lote", type=int, default=64, help="Documentos por lote")
+    parser.add_argument("--n-process", type=int, default=1, help="Procesos de spaCy (nlp.pipe)")
+    args = parser.parse_args()
+    todos = not (args.vacantes or args.cvs)
+    reprocesar(args.vacantes or todos, args.cvs or todos, args.lote, args.n_process)
@@ -7,5 +7,6 @@ from .auth_router import router as auth_router
 from .empresa_router import router as empresa_router
 from .postulacion_router import router as postulacion_router
 from .cv_router import router as cv_router
+from .metricas_router import router as metricas_router
 
-__all__ = ["vacante_router", "usuario_router", "auth_router", "postulacion_router", "cv_router"]
+__all__ = ["vacante_router", "usuario_router", "auth_router", "postulacion_router", "cv_router", "metricas_router"]
@@ -1,15 +1,18 @@
 """
 Router para endpoints de CV
 """
-from fastapi import APIRouter, Depends, UploadFile, Form, HTTPException,  File
+from fastapi import APIRouter, Depends, UploadFile, Form, HTTPException,  File, Header
 from sqlalchemy.orm import Session
 from database import get_db
 from services.cv_service import CVService
-from schemas.cv import CVResponse
+from schemas.cv import CVResponse, CVJobResponse
+from services.cv_job_service import CVJobService
 from dependencies import get_current_user
 from models.usuario import Usuario
 from typing import List
-from fastapi.responses import Response
+from utils.paginacion import CURSOR_HEADER, next_id_cursor
+from fastapi.responses import Response, StreamingResponse
+from utils.descargas import etag_matches, parse_range
 
 router = APIRouter(
     prefix="/cv",
@@ -19,13 +22,19 @@ router = APIRouter(
 
 @router.get("/", response_model=List[CVResponse])
 def listar_cvs(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: str | None = None,
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user)
 ):
-    """Obtiene todos los CVs"""
-    return CVService.get_all_cvs(db, skip, limit)
+    """Obtiene todos los CVs (keyset por ID si se pasa `cursor`)"""
+    cvs = CVService.get_all_cvs(db, skip, limit, cursor=cursor)
+    siguiente = next_id_cursor(cvs, limit)
+    if siguiente:
+        response.headers[CURSOR_HEADER] = siguiente
+    return cvs
 
 
 @router.get("/usuario/{usuario_id}", response_model=List[CVResponse])
@@ -38,33 +47,64 @@ def obtener_cvs_usuario(
     return CVService.get_cvs_by_usuario(db, usuario_id)
 
 
-@router.post("/", response_model=CVResponse, status_code=201)
+@router.post("/", response_model=CVJobResponse, status_code=202)
 def subir_cv(
+    response: Response,
     usuario_id: int = Form(...),
     archivo: UploadFile = File(...),
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user)
 ):
-    """Sube un nuevo CV"""
+    """Sube un nuevo CV; la extracción de features corre en segundo plano (ver /cv/jobs/{job_id})"""
     if archivo is None:
         raise HTTPException(status_code=400, detail="Debes enviar un archivo PDF")
     if archivo.content_type not in ("application/pdf", "application/octet-stream"):
         raise HTTPException(status_code=400, detail="Solo se permiten archivos PDF")
-    return CVService.upload_cv(db, usuario_id, archivo)
+    job = CVService.upload_cv(db, usuario_id, archivo)
+    response.headers["Location"] = f"/cv/jobs/{job.id}"
+    return job
+
+
+@router.get("/jobs/{job_id}", response_model=CVJobResponse)
+def estado_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    """Estado y avance de la extracción de features de un CV subido"""
+    return CVJobService.get_job(db, job_id)
 
 
 @router.get("/descargar/{cv_id}")
 def descargar_cv(
     cv_id: int,
+    range_header: str | None = Header(default=None, alias="Range"),
+    if_none_match: str | None = Header(default=None),
+    if_range: str | None = Header(default=None),
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user)
 ):
-    """Descarga un CV en formato PDF"""
-    cv = CVService.get_cv_by_id(db, cv_id)
-    return Response(
-        content=cv.archivo,
-        media_type=cv.tipo,
-        headers={"Content-Disposition": f"attachment; filename={cv.nombre_archivo}"}
+    """Descarga un CV en formato PDF (streaming, con ETag y soporte de Range)"""
+    meta, etag = CVService.get_descarga(db, cv_id)
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f"attachment; filename={meta.nombre_archivo}",
+    }
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    # If-Range: el rango solo aplica si el cliente tiene la misma versión
+    rango = parse_range(range_header, meta.tamano) if if_range in (None, etag) else None
+    inicio, fin = rango or (0, meta.tamano - 1)
+    headers["Content-Length"] = str(fin - inicio + 1)
+    if rango:
+        headers["Content-Range"] = f"bytes {inicio}-{fin}/{meta.tamano}"
+    return StreamingResponse(
+        CVService.iter_archivo(cv_id, inicio, fin, etag),
+        status_code=206 if rango else 200,
+        media_type=meta.tipo,
+        headers=headers,
     )
 
 
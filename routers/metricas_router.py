@@ -0,0 +1,20 @@
+"""
+Router para endpoints de métricas internas
+"""
+from fastapi import APIRouter, Depends
+from services.metricas_service import MetricasService
+from dependencies import get_current_user
+from models.usuario import Usuario
+
+router = APIRouter(
+    prefix="/metricas",
+    tags=["Métricas"]
+)
+
+
+@router.get("/")
+def get_metricas(
+    current_user: Usuario = Depends(get_current_user)
+):
+    """Métricas del worker: profundidad de la cola de encode y llenado de lotes"""
+    return MetricasService.get_metricas()
@@ -1,7 +1,7 @@
 """
 Router para los endpoints de Postulacion
 """
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Response, status
 from sqlalchemy.orm import Session
 from typing import List
 
@@ -10,6 +10,7 @@ from schemas.postulacion import Postulacion, PostulacionCreate, PostulacionUpdat
 from services.postulacion_service import PostulacionService
 from dependencies import get_current_user
 from models.usuario import Usuario
+from utils.paginacion import CURSOR_HEADER, next_id_cursor
 
 router = APIRouter(
     prefix="/postulaciones",
@@ -19,9 +20,19 @@ router = APIRouter(
 
 
 @router.get("/", response_model=List[Postulacion], summary="Obtener todas las postulaciones")
-def get_all_postulaciones(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Obtiene una lista de todas las postulaciones."""
-    return PostulacionService.get_all_postulaciones(db, skip, limit)
+def get_all_postulaciones(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
+    db: Session = Depends(get_db)
+):
+    """Obtiene una lista de todas las postulaciones (keyset por ID si se pasa `cursor`)."""
+    postulaciones = PostulacionService.get_all_postulaciones(db, skip, limit, cursor=cursor)
+    siguiente = next_id_cursor(postulaciones, limit)
+    if siguiente:
+        response.headers[CURSOR_HEADER] = siguiente
+    return postulaciones
 
 
 @router.get("/{postulacion_id}", response_model=Postulacion, summary="Obtener una postulación por ID")
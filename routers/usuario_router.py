@@ -1,7 +1,7 @@
 """
 Router para endpoints de Usuario
 """
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.orm import Session
 from database import get_db
 from services.usuario_service import UsuarioService
@@ -9,6 +9,7 @@ from schemas.usuario import UsuarioCreate, UsuarioUpdate, UsuarioResponse
 from dependencies import get_current_user
 from models.usuario import Usuario
 from typing import List
+from utils.paginacion import CURSOR_HEADER, next_id_cursor
 
 router = APIRouter(
     prefix="/usuarios",
@@ -26,13 +27,19 @@ def get_current_usuario(
 
 @router.get("/", response_model=List[UsuarioResponse])
 def get_all_usuarios(
+    response: Response,
     skip: int = Query(0, ge=0, description="Número de registros a saltar"),
     limit: int = Query(100, ge=1, le=1000, description="Límite de registros"),
+    cursor: str | None = Query(None, description="Cursor de la página siguiente (header X-Next-Cursor)"),
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user)
 ):
-    """Obtiene todos los usuarios con paginación"""
-    return UsuarioService.get_all_usuarios(db, skip, limit)
+    """Obtiene todos los usuarios con paginación (keyset por ID si se pasa `cursor`)"""
+    usuarios = UsuarioService.get_all_usuarios(db, skip, limit, cursor=cursor)
+    siguiente = next_id_cursor(usuarios, limit)
+    if siguiente:
+        response.headers[CURSOR_HEADER] = siguiente
+    return usuarios
 
 
 @router.get("/{usuario_id}", response_model=UsuarioResponse)
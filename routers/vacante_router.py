@@ -1,69 +1,148 @@
 """
 Router para endpoints de Vacante
 """
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.orm import Session
 from database import get_db
 from services.vacante_service import VacanteService
-from schemas.vacante import VacanteCreate, VacanteUpdate, VacanteResponse
-from dependencies import get_current_user
+from schemas.vacante import VacanteCreate, VacanteUpdate, VacanteResponse, FacetasResponse
+from schemas.usuario import CandidatoResponse
+from dependencies import get_current_user, get_reclutador
 from models.usuario import Usuario
 from typing import List
+from utils.paginacion import CURSOR_HEADER, next_id_cursor
+from utils.proyeccion import parse_campos
+from utils.facetas import filtros_vacante
 
 router = APIRouter(
     prefix="/vacantes",
     tags=["Vacantes"]
 )
 
+_FIELDS = Query(None, description="Claves de datos_vacante a devolver, separadas por coma (p. ej. title,city)")
+_EXCLUDE = Query(None, description="Claves de datos_vacante a omitir, separadas por coma")
+
 
 @router.get("/", response_model=List[VacanteResponse])
 def get_all_vacantes(
+    response: Response,
     db: Session = Depends(get_db),
     usuario_id: int | None = Query(None, description="ID"),
     topk: int = 100,
     orden: str = "probabilidad",
-    metrics: bool = False
+    metrics: bool = False,
+    modo: str = Query("precalculado", pattern="^(precalculado|en_vivo)$", description="Embedding del CV guardado o re-codificado"),
+    candidatos: int | None = Query(None, ge=0, le=1000, description="Vecinos ANN a re-rankear (0 = todo el catálogo)"),
+    ef_search: int | None = Query(None, ge=1, le=1000, description="hnsw.ef_search para la etapa ANN"),
+    probes: int | None = Query(None, ge=1, le=1000, description="ivfflat.probes para la etapa ANN"),
+    precalculadas: bool = Query(True, description="Usar recomendaciones precalculadas si están frescas"),
+    max_edad_horas: float | None = Query(None, gt=0, description="Antigüedad máxima de las precalculadas"),
+    cursor: str | None = Query(None, description="Cursor de la página siguiente (header X-Next-Cursor)"),
+    fields: str | None = _FIELDS,
+    exclude: str | None = _EXCLUDE,
+    filtros: dict | None = Depends(filtros_vacante)
 ):
     """
     Obtiene todas las vacantes.
     Si se pasa un usuario_id válido y orden='probabilidad', las ordena de mayor a menor match.
+    `topk` es el tamaño de página; el cursor de la siguiente viene en X-Next-Cursor.
+    `fields`/`exclude` limitan las claves de datos_vacante que se leen y envían.
+    Los filtros de facetas (ciudad, modalidad, ...) se aplican antes de rankear.
     """
+    campos = parse_campos(fields, exclude)
     if usuario_id and orden == "probabilidad":
-        return VacanteService.list_for_user_ranked(db, usuario_id, topk=topk, with_metrics=metrics)
-    return VacanteService.get_all_vacantes(db, limit=topk)
+        vacantes, siguiente = VacanteService.rank_page(
+            db, usuario_id, topk=topk, cursor=cursor, campos=campos, with_metrics=metrics, modo=modo,
+            candidatos=candidatos, ef_search=ef_search, probes=probes,
+            precalculadas=precalculadas, max_edad_horas=max_edad_horas, filtros=filtros
+        )
+    else:
+        vacantes = VacanteService.get_all_vacantes(db, limit=topk, cursor=cursor, campos=campos, filtros=filtros)
+        siguiente = next_id_cursor(vacantes, topk)
+    if siguiente:
+        response.headers[CURSOR_HEADER] = siguiente
+    return vacantes
 
 
 @router.get("/general", response_model=List[VacanteResponse])
 def get_all_vacantes_general(
+    response: Response,
     skip: int = Query(0, ge=0, description="Número de registros a saltar"),
     limit: int = Query(100, ge=1, le=1000, description="Límite de registros"),
+    cursor: str | None = Query(None, description="Cursor de la página siguiente (header X-Next-Cursor)"),
+    fields: str | None = _FIELDS,
+    exclude: str | None = _EXCLUDE,
+    filtros: dict | None = Depends(filtros_vacante),
     db: Session = Depends(get_db)
 ):
     """
     Obtiene todas las vacantes directamente de la base de datos.
-    Sin filtros ni ordenamiento por probabilidad, solo paginación básica.
+    Sin ordenamiento por probabilidad: filtros por facetas y paginación básica.
+    Con `cursor` la paginación es keyset por ID (no escanea las páginas previas).
+    """
+    vacantes = VacanteService.get_all_vacantes(db, skip=skip, limit=limit, cursor=cursor,
+                                               campos=parse_campos(fields, exclude), filtros=filtros)
+    siguiente = next_id_cursor(vacantes, limit)
+    if siguiente:
+        response.headers[CURSOR_HEADER] = siguiente
+    return vacantes
+
+
+@router.get("/facetas", response_model=FacetasResponse)
+def get_facetas(
+    filtros: dict | None = Depends(filtros_vacante),
+    db: Session = Depends(get_db)
+):
     """
-    return VacanteService.get_all_vacantes(db, skip=skip, limit=limit)
+    Conteo de vacantes por ciudad, estado, modalidad, tipo de empleo y apto para
+    estudiantes. Cada faceta se cuenta con los filtros de las demás.
+    """
+    return VacanteService.get_facetas(db, filtros)
 
 
 @router.get("/search", response_model=List[VacanteResponse])
 def search_vacantes(
-    empresa: str = Query(..., description="Nombre de la empresa a buscar"),
+    q: str | None = Query(None, description="Texto a buscar en título, requisitos, áreas y empresa"),
+    empresa: str | None = Query(None, description="Nombre de la empresa a buscar (parcial)"),
+    skip: int = Query(0, ge=0, description="Número de resultados a saltar"),
+    limit: int = Query(100, ge=1, le=1000, description="Límite de resultados"),
+    fields: str | None = _FIELDS,
+    exclude: str | None = _EXCLUDE,
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user) # Este get_current_user viene de auth_service
 ):
-    """Busca vacantes por nombre de empresa"""
-    return VacanteService.search_vacantes_by_empresa(db, empresa)
+    """Busca vacantes por texto (ordenadas por relevancia) y/o por nombre de empresa"""
+    return VacanteService.search_vacantes(
+        db, q=q, empresa=empresa, skip=skip, limit=limit, campos=parse_campos(fields, exclude)
+    )
 
 
 @router.get("/{vacante_id}", response_model=VacanteResponse)
 def get_vacante(
     vacante_id: int,
+    fields: str | None = _FIELDS,
+    exclude: str | None = _EXCLUDE,
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user) # Este get_current_user viene de auth_service
 ):
     """Obtiene una vacante por ID"""
-    return VacanteService.get_vacante_by_id(db, vacante_id)
+    return VacanteService.get_vacante_by_id(db, vacante_id, campos=parse_campos(fields, exclude))
+
+
+@router.get("/{vacante_id}/candidatos", response_model=List[CandidatoResponse])
+def get_candidatos(
+    vacante_id: int,
+    topk: int = Query(50, ge=1, le=1000, description="Número de candidatos"),
+    carrera: str | None = Query(None, description="Filtrar por carrera (parcial)"),
+    cuatrimestre: int | None = Query(None, ge=1, le=12, description="Filtrar por cuatrimestre"),
+    metrics: bool = False,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_reclutador)
+):
+    """Rankea los CVs de estudiantes para una vacante (mejores candidatos primero); solo reclutadores"""
+    return VacanteService.rank_candidates(
+        db, vacante_id, topk=topk, carrera=carrera, cuatrimestre=cuatrimestre, with_metrics=metrics
+    )
 
 
 @router.post("/", response_model=VacanteResponse, status_code=201)
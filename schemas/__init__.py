@@ -1,14 +1,15 @@
 """
 Schemas de Pydantic
 """
-from .vacante import VacanteCreate, VacanteUpdate, VacanteResponse
+from .vacante import VacanteCreate, VacanteUpdate, VacanteResponse, FacetasResponse
 from .empresa import EmpresaCreate, EmpresaUpdate, EmpresaResponse
 from .postulacion import PostulacionCreate, PostulacionUpdate
-from .cv import CVCreate, CVResponse
+from .cv import CVCreate, CVResponse, CVJobResponse
 from .usuario import (
     UsuarioCreate,
     UsuarioUpdate,
     UsuarioResponse,
+    CandidatoResponse,
     UsuarioLogin,
     Token,
     TokenData,
@@ -18,6 +19,7 @@ __all__ = [
     "VacanteCreate",
     "VacanteUpdate",
     "VacanteResponse",
+    "FacetasResponse",
     "EmpresaCreate",
     "EmpresaUpdate",
     "EmpresaResponse",
@@ -25,9 +27,11 @@ __all__ = [
     "PostulacionUpdate",
     "CvCreate",
     "CvResponse",
+    "CVJobResponse",
     "UsuarioCreate",
     "UsuarioUpdate",
     "UsuarioResponse",
+    "CandidatoResponse",
     "UsuarioLogin",
     "Token",
     "TokenData",
@@ -25,3 +25,21 @@ class CVResponse(CVBase):
 
     class Config:
         from_attributes = True
+
+
+class CVJobResponse(BaseModel):
+    """Schema de respuesta de un job de extracción de features de CV"""
+    id: int
+    cv_id: int
+    usuario_id: int
+    estado: str = Field(..., description="pendiente | procesando | terminado | error | reemplazado")
+    etapa: Optional[str] = Field(default=None, description="Paso en curso (texto, skills, embedding, guardando)")
+    progreso: int = Field(..., description="Avance de 0 a 100")
+    intentos: int
+    error: Optional[str] = None
+    creado_en: datetime
+    iniciado_en: Optional[datetime] = None
+    terminado_en: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
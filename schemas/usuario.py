@@ -36,6 +36,25 @@ class UsuarioResponse(UsuarioBase):
         from_attributes = True
 
 
+class CandidatoResponse(BaseModel):
+    """
+    Schema de respuesta de un candidato rankeado para una vacante
+    (sin matrícula ni términos extraídos de su CV)
+    """
+    id: int
+    nombre: str
+    apellidos: str
+    carrera: Optional[str] = None
+    cuatrimestre: Optional[int] = None
+    match_score: Optional[float] = None
+    match_cos: Optional[float] = None
+    match_bm25: Optional[float] = None
+    match_overlap: Optional[float] = None
+
+    class Config:
+        from_attributes = True
+
+
 class UsuarioLogin(BaseModel):
     """Schema para login"""
     matricula: str = Field(..., description="Matrícula del usuario")
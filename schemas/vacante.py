@@ -2,7 +2,7 @@
 Schemas de Pydantic para Vacante
 """
 from pydantic import BaseModel, Field
-from typing import Optional, Any, List
+from typing import Optional, Any, List, Union
 
 
 class VacanteBase(BaseModel):
@@ -34,3 +34,19 @@ class VacanteResponse(VacanteBase):
 
     class Config:
         from_attributes = True
+
+
+class FacetaValor(BaseModel):
+    """Un valor de faceta y cuántas vacantes lo tienen"""
+    valor: Optional[Union[bool, str]] = Field(None, description="Valor de la faceta (null = sin dato)")
+    total: int
+
+
+class FacetasResponse(BaseModel):
+    """Conteos por faceta de las vacantes que cumplen los filtros"""
+    total: int = Field(..., description="Vacantes que cumplen todos los filtros")
+    ciudad: List[FacetaValor] = []
+    estado: List[FacetaValor] = []
+    modalidad: List[FacetaValor] = []
+    tipo_empleo: List[FacetaValor] = []
+    apto_estudiantes: List[FacetaValor] = []
@@ -9,5 +9,9 @@ from .postulacion_service import PostulacionService
 from .cv_service import CVService
 from .cv_features_service import CVFeaturesService
 from .vacante_features_service import VacanteFeaturesService
+from .skill_service import SkillService
+from .recomendacion_service import RecomendacionService
+from .metricas_service import MetricasService
+from .cv_job_service import CVJobService
 
-__all__ = ["VacanteService", "UsuarioService", "AuthService", "EmpresaService", "PostulacionService", "CVService", "CVFeaturesService", "VacanteFeaturesService"]
+__all__ = ["VacanteService", "UsuarioService", "AuthService", "EmpresaService", "PostulacionService", "CVService", "CVFeaturesService", "VacanteFeaturesService", "SkillService", "RecomendacionService", "MetricasService", "CVJobService"]
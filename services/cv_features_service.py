@@ -1,24 +1,121 @@
 from sqlalchemy.orm import Session
 from dao.cv_features_dao import CVFeaturesDAO
+from dao.cv_dao import CVDAO
+from services.skill_service import SkillService
 from utils import cv_matcher as cm
+from utils.feature_index import get_cv_index, FeatureIndex
+from utils.signal_cache import get_signal_cache
 
 class CVFeaturesService:
     """Service para extracción y persistencia de features de un CV (texto/skills/embedding)."""
 
     @staticmethod
-    def build_features_from_pdf_bytes(archivo_bytes: bytes) -> tuple[str, list, list[float]]:
+    def build_features_from_pdf_bytes(archivo_bytes: bytes, progreso=None) -> tuple[str, list, list[float]]:
+        """`progreso(porcentaje, etapa)`, si se da, se llama al empezar cada paso."""
+        avance = progreso or (lambda porcentaje, etapa: None)
         # 1) Leer texto del PDF (bytes)
+        avance(10, "texto")
         texto_raw = cm.read_pdf_text_bytes(archivo_bytes)
         # 2) Normalizar y segmentar en bloques
         texto = cm.normalize_text(texto_raw)
         blocks = cm.split_sections(texto)
         # 3) Skills a partir de bloques
+        avance(30, "skills")
         skills = cm.mine_skills(blocks)
         # 4) Embedding con el texto completo
-        emb = cm.EMB.encode([texto])[0].tolist()
+        avance(70, "embedding")
+        emb = cm.encode_cached(texto).tolist()
         return texto, skills, emb
 
     @staticmethod
-    def upsert_from_pdf(db: Session, usuario_id: int, archivo_bytes: bytes):
-        texto, skills, emb = CVFeaturesService.build_features_from_pdf_bytes(archivo_bytes)
-        return CVFeaturesDAO.upsert(db, usuario_id, texto, skills, emb)
+    def reprocess_all(db: Session, lote: int = 64, n_process: int = cm.SPACY_N_PROCESS) -> int:
+        """
+        Recalcula skills y embedding de todos los CVs a partir del texto ya
+        guardado en cv_features (sin volver a leer PDFs), por lotes con nlp.pipe.
+        """
+        recs = CVFeaturesDAO.get_all(db)
+        for start in range(0, len(recs), lote):
+            chunk = recs[start:start + lote]
+            textos = [r.texto or "" for r in chunk]
+            skills_list = cm.mine_skills_many([cm.split_sections(t) for t in textos], n_process=n_process)
+            embs = cm.encode_cached(textos).tolist()
+            for r, texto, skills, emb in zip(chunk, textos, skills_list, embs):
+                skill_ids = SkillService.intern(db, skills)
+                CVFeaturesDAO.upsert(db, r.usuario_id, texto, skills, emb, skill_ids=skill_ids)
+                get_signal_cache().invalidate_usuario(r.usuario_id)
+        CVFeaturesService.rebuild_index(db)
+        return len(recs)
+
+    @staticmethod
+    def upsert_from_pdf(db: Session, usuario_id: int, archivo_bytes: bytes, progreso=None, cv_id: int | None = None):
+        """
+        Extrae y guarda las features del CV del usuario. Con `cv_id`, solo escribe si
+        ese sigue siendo su CV más reciente (si no, devuelve None sin tocar cv_features):
+        un job de un CV viejo que termina tarde no pisa las features del nuevo.
+        """
+        texto, skills, emb = CVFeaturesService.build_features_from_pdf_bytes(archivo_bytes, progreso)
+        if progreso:
+            progreso(90, "guardando")
+        skill_ids = SkillService.intern(db, skills)
+        if cv_id is not None and CVDAO.get_latest_id(db, usuario_id, bloquear=True) != cv_id:
+            db.rollback()
+            return None
+        rec = CVFeaturesDAO.upsert(db, usuario_id, texto, skills, emb, skill_ids=skill_ids)
+        get_signal_cache().invalidate_usuario(usuario_id)
+        index = get_cv_index()
+        if index.ready:
+            index.upsert(CVFeaturesService._index_row(rec))
+        return rec
+
+    @staticmethod
+    def ensure_skill_ids(db: Session, cvf) -> list[int]:
+        """IDs canónicos de las skills del CV; los calcula y guarda si el registro es anterior al vocabulario."""
+        if cvf.skill_ids is None:
+            CVFeaturesDAO.set_skill_ids(db, cvf.usuario_id, SkillService.intern(db, cvf.skills))
+        return list(cvf.skill_ids or [])
+
+    # ---------- índice en memoria (ranking de candidatos) ----------
+    @staticmethod
+    def _index_row(rec) -> dict:
+        return {
+            "id": rec.usuario_id,
+            "text": rec.texto,
+            "terms": rec.skills or [],
+            "term_ids": rec.skill_ids,
+            "embedding": rec.embedding,
+            "updated_at": rec.updated_at,
+        }
+
+    @staticmethod
+    def rebuild_index(db: Session) -> FeatureIndex:
+        """Construye el índice de CVs desde cv_features (sin inferencia de modelos)."""
+        index = get_cv_index()
+        # La estampa se lee antes que las filas (ver VacanteFeaturesDAO.get_stamp)
+        stamp = CVFeaturesDAO.get_stamp(db)
+        recs = CVFeaturesDAO.get_all(db)
+
+        # Backfill único de skill_ids para filas anteriores al vocabulario canónico
+        faltantes = {r.usuario_id: SkillService.intern(db, r.skills) for r in recs if r.skill_ids is None}
+        if faltantes:
+            CVFeaturesDAO.set_skill_ids_many(db, faltantes)
+            stamp = CVFeaturesDAO.get_stamp(db)
+            recs = CVFeaturesDAO.get_all(db)
+
+        index.build([CVFeaturesService._index_row(r) for r in recs], stamp=stamp)
+        return index
+
+    @staticmethod
+    def sync_index(db: Session) -> FeatureIndex:
+        """Pone al día el índice de CVs recargando solo las filas que cambiaron."""
+        index = get_cv_index()
+        if not index.ready:
+            return CVFeaturesService.rebuild_index(db)
+
+        stamp = CVFeaturesDAO.get_stamp(db)
+        if stamp == index.stamp:
+            return index
+
+        stale, gone = index.diff(CVFeaturesDAO.get_versions(db))
+        rows = [CVFeaturesService._index_row(r) for r in CVFeaturesDAO.get_by_ids(db, stale)] if stale else []
+        index.apply(upserts=rows, removals=gone, stamp=stamp)
+        return index
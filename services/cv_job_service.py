@@ -0,0 +1,133 @@
+"""
+Service para la ingesta de CVs en segundo plano.
+
+`POST /cv` solo guarda el archivo y encola un job en `cv_jobs`; un pool local
+de workers (hilos) drena la tabla con SELECT ... FOR UPDATE SKIP LOCKED,
+extrae las features del PDF y actualiza `cv_features`. Con CV_WORKERS=0 la
+API no procesa jobs y la cola se drena con `procesar_cv_jobs.py`.
+"""
+import os
+import threading
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from database import SessionLocal
+from dao.cv_dao import CVDAO
+from dao.cv_job_dao import CVJobDAO
+from models.cv_job import CVJob
+from services.cv_features_service import CVFeaturesService
+from utils.pdf_extract import PDFError
+
+CV_WORKERS = int(os.getenv("CV_WORKERS", "2"))
+CV_JOB_POLL_S = float(os.getenv("CV_JOB_POLL_S", "5"))
+CV_JOB_MAX_INTENTOS = int(os.getenv("CV_JOB_MAX_INTENTOS", "3"))
+CV_JOB_TIMEOUT_S = int(os.getenv("CV_JOB_TIMEOUT_S", "600"))
+
+
+class CVJobService:
+    """Service para encolar, consultar y procesar jobs de CV"""
+
+    @staticmethod
+    def enqueue(db: Session, cv_id: int, usuario_id: int) -> CVJob:
+        """Encola la extracción de features de un CV y despierta al pool local"""
+        job = CVJobDAO.create(db, cv_id, usuario_id)
+        get_cv_worker_pool().notify()
+        return job
+
+    @staticmethod
+    def get_job(db: Session, job_id: int) -> CVJob:
+        """Obtiene un job por ID"""
+        job = CVJobDAO.get_by_id(db, job_id)
+        if not job:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Job con ID {job_id} no encontrado"
+            )
+        return job
+
+    @staticmethod
+    def process_next(db: Session) -> bool:
+        """Procesa un job de la cola; False si no había ninguno disponible"""
+        job = CVJobDAO.claim_next(db, CV_JOB_MAX_INTENTOS, CV_JOB_TIMEOUT_S)
+        if job is None:
+            return False
+        job_id, intentos = job.id, job.intentos
+        try:
+            # Si el usuario ya subió otro CV, este job no debe escribir sus features
+            if CVDAO.get_latest_id(db, job.usuario_id) != job.cv_id:
+                CVJobDAO.supersede(db, job_id)
+                return True
+            archivo = CVDAO.get_archivo(db, job.cv_id)
+            if archivo is None:
+                raise ValueError(f"CV con ID {job.cv_id} no encontrado")
+
+            def progreso(porcentaje: int, etapa: str):
+                CVJobDAO.set_progress(db, job_id, porcentaje, etapa)
+
+            rec = CVFeaturesService.upsert_from_pdf(db, job.usuario_id, archivo, progreso=progreso, cv_id=job.cv_id)
+            if rec is None:
+                CVJobDAO.supersede(db, job_id)
+            else:
+                CVJobDAO.finish(db, job_id)
+        except Exception as e:
+            db.rollback()
+            # un PDF rechazado por los límites fallaría igual en cada intento
+            reintentar = intentos < CV_JOB_MAX_INTENTOS and not isinstance(e, PDFError)
+            CVJobDAO.fail(db, job_id, str(e), reintentar=reintentar)
+            print(f"❌ Error en job de CV {job_id} (intento {intentos}): {str(e)}")
+        return True
+
+
+class CVWorkerPool:
+    """Hilos que drenan la cola de jobs; cada uno con su propia sesión de BD."""
+
+    def __init__(self, workers: int = CV_WORKERS, poll_s: float = CV_JOB_POLL_S):
+        self.workers = workers
+        self.poll_s = poll_s
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        if self._threads:
+            return
+        self._stop.clear()
+        for i in range(self.workers):
+            t = threading.Thread(target=self._run, name=f"cv-worker-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def stop(self, timeout: float = 10.0):
+        self._stop.set()
+        self._wake.set()
+        for t in self._threads:
+            t.join(timeout)
+        self._threads = []
+
+    def notify(self):
+        """Avisa que hay trabajo nuevo (sin esperar al siguiente sondeo)"""
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                db = SessionLocal()
+                try:
+                    while not self._stop.is_set() and CVJobService.process_next(db):
+                        pass
+                finally:
+                    db.close()
+            except Exception as e:
+                print(f"❌ Error en el pool de CVs: {str(e)}")
+            # Cola vacía: esperar aviso o sondear (jobs encolados por otros procesos)
+            self._wake.wait(self.poll_s)
+            self._wake.clear()
+
+
+_POOL = None
+
+
+def get_cv_worker_pool() -> CVWorkerPool:
+    global _POOL
+    if _POOL is None:
+        _POOL = CVWorkerPool()
+    return _POOL
@@ -1,22 +1,31 @@
 """
 Service para orquestar operaciones de CV
 """
+import hashlib
+import os
+from sqlalchemy import Row
 from sqlalchemy.orm import Session
+from database import SessionLocal
 from dao.cv_dao import CVDAO
 from schemas.cv import CVCreate
 from models.cv import CV
 from fastapi import HTTPException, status, UploadFile
 from typing import List
-from services.cv_features_service import CVFeaturesService
+from services.cv_job_service import CVJobService
+from models.cv_job import CVJob
+from utils.paginacion import after_id
+from utils.descargas import strong_etag
+
+CV_DOWNLOAD_CHUNK = int(os.getenv("CV_DOWNLOAD_CHUNK", str(256 * 1024)))
 
 
 class CVService:
     """Service para la lógica de negocio de CV"""
 
     @staticmethod
-    def get_all_cvs(db: Session, skip: int = 0, limit: int = 100) -> List[CV]:
-        """Obtiene todos los CVs"""
-        return CVDAO.get_all(db, skip, limit)
+    def get_all_cvs(db: Session, skip: int = 0, limit: int = 100, cursor: str | None = None) -> List[Row]:
+        """Obtiene los metadatos de todos los CVs (con `cursor`, paginación keyset por ID)"""
+        return CVDAO.get_all(db, skip, limit, after_id=after_id(cursor))
 
     @staticmethod
     def get_cv_by_id(db: Session, cv_id: int) -> CV:
@@ -30,13 +39,62 @@ class CVService:
         return cv
 
     @staticmethod
-    def get_cvs_by_usuario(db: Session, usuario_id: int) -> List[CV]:
-        """Obtiene todos los CVs de un usuario"""
+    def get_descarga(db: Session, cv_id: int) -> tuple:
+        """Metadatos de descarga (sin el archivo) y su ETag fuerte"""
+        meta = CVDAO.get_descarga_meta(db, cv_id)
+        if not meta:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"CV con ID {cv_id} no encontrado"
+            )
+        return meta, CVService._etag(meta)
+
+    @staticmethod
+    def _etag(meta) -> str:
+        return strong_etag(meta.sha256) if meta.sha256 else strong_etag(meta.md5, "md5")
+
+    @staticmethod
+    def iter_archivo(cv_id: int, inicio: int, fin: int, etag: str, chunk: int = CV_DOWNLOAD_CHUNK):
+        """
+        Genera los bytes [inicio, fin] del archivo en trozos leídos con substring.
+        Abre su propia sesión: corre mientras se envía la respuesta, cuando la
+        sesión de la petición ya se cerró.
+
+        Todos los trozos se leen en una transacción REPEATABLE READ (una sola
+        instantánea) que primero comprueba que el CV sigue siendo el del `etag`
+        ya enviado. Si el CV cambió o se borró antes, o un trozo llega incompleto,
+        se corta la respuesta con un error en lugar de mandar un cuerpo mezclado o
+        truncado bajo el ETag y Content-Length viejos.
+        """
+        db = SessionLocal()
+        try:
+            db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+            actual = CVDAO.get_descarga_meta(db, cv_id)
+            if actual is None or CVService._etag(actual) != etag:
+                print(f"⚠️ El CV {cv_id} cambió antes de descargarse; se corta la respuesta")
+                raise RuntimeError(f"El CV {cv_id} cambió durante la descarga")
+            pos = inicio
+            while pos <= fin:
+                largo = min(chunk, fin - pos + 1)
+                data = CVDAO.read_chunk(db, cv_id, pos, largo)
+                if len(data) != largo:
+                    raise RuntimeError(f"El CV {cv_id} devolvió {len(data)} de {largo} bytes en {pos}")
+                yield data
+                pos += largo
+        finally:
+            db.close()
+
+    @staticmethod
+    def get_cvs_by_usuario(db: Session, usuario_id: int) -> List[Row]:
+        """Obtiene los metadatos de los CVs de un usuario"""
         return CVDAO.get_by_usuario(db, usuario_id)
 
     @staticmethod
-    def upload_cv(db: Session, usuario_id: int, archivo: UploadFile) -> CV:
-        """Sube y guarda un nuevo CV"""
+    def upload_cv(db: Session, usuario_id: int, archivo: UploadFile) -> CVJob:
+        """
+        Guarda un nuevo CV y encola la extracción de sus features.
+        Devuelve el job; `cv_features` se actualiza cuando termina.
+        """
         try:
             contenido = archivo.file.read()
             cv = CVDAO.create(
@@ -44,12 +102,10 @@ class CVService:
                 usuario_id=usuario_id,
                 nombre_archivo=archivo.filename,
                 tipo=archivo.content_type,
-                archivo=contenido
+                archivo=contenido,
+                sha256=hashlib.sha256(contenido).hexdigest()
             )
-        
-            CVFeaturesService.upsert_from_pdf(db, usuario_id, contenido)
-
-            return cv
+            return CVJobService.enqueue(db, cv.id, usuario_id)
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
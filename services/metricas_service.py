@@ -0,0 +1,24 @@
+"""
+Service para exponer métricas internas del proceso (colas, lotes, extracción de PDFs)
+"""
+from utils.model_server import MODEL_SERVER_SOCKET, get_model_client
+from utils.micro_batch import encode_batcher_stats
+from utils.pdf_extract import pdf_stats
+
+
+class MetricasService:
+    """Service para leer métricas de los componentes en memoria"""
+
+    @staticmethod
+    def get_encode_stats() -> dict | None:
+        """Cola de micro-batching de encode: la local o la del servidor de modelos"""
+        if MODEL_SERVER_SOCKET:
+            try:
+                return get_model_client().stats()
+            except (OSError, EOFError, RuntimeError):
+                return None
+        return encode_batcher_stats()
+
+    @staticmethod
+    def get_metricas() -> dict:
+        return {"encode": MetricasService.get_encode_stats(), "pdf": pdf_stats()}
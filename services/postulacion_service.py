@@ -9,15 +9,16 @@ from services.usuario_service import UsuarioService
 from services.vacante_service import VacanteService
 from typing import List
 from fastapi import HTTPException, status
+from utils.paginacion import after_id
 
 
 class PostulacionService:
     """Service para la lógica de negocio de Postulacion"""
 
     @staticmethod
-    def get_all_postulaciones(db: Session, skip: int = 0, limit: int = 100) -> List[Postulacion]:
-        """Obtiene todas las postulaciones"""
-        return PostulacionDAO.get_all(db, skip, limit)
+    def get_all_postulaciones(db: Session, skip: int = 0, limit: int = 100, cursor: str | None = None) -> List[Postulacion]:
+        """Obtiene todas las postulaciones (con `cursor`, paginación keyset por ID)"""
+        return PostulacionDAO.get_all(db, skip, limit, after_id=after_id(cursor))
 
     @staticmethod
     def get_postulacion_by_id(db: Session, postulacion_id: int) -> Postulacion:
@@ -0,0 +1,135 @@
+"""
+Service para precalcular y leer recomendaciones (top-K de vacantes por usuario)
+"""
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+import numpy as np
+from scipy import sparse
+from sqlalchemy.orm import Session
+from dao.recomendacion_dao import RecomendacionDAO
+from dao.vacante_dao import VacanteDAO
+from models.vacante import Vacante
+from services.vacante_features_service import VacanteFeaturesService
+from services.cv_features_service import CVFeaturesService
+from services.skill_service import SkillService
+from utils import cv_matcher as cm
+
+# Pesos (alpha, beta, gamma) del precálculo; coinciden con los de list_for_user_ranked
+PESOS = (0.55, 0.45, 0.15)
+
+
+def _with_cols(m: sparse.csr_matrix, n_cols: int) -> sparse.csr_matrix:
+    return sparse.csr_matrix((m.data, m.indices, m.indptr), shape=(m.shape[0], n_cols))
+
+
+class RecomendacionService:
+    """Service para el ranking en lote de todos los usuarios con CV"""
+
+    @staticmethod
+    def precompute_all(db: Session, topk: int = 100, lote: int = 256) -> dict:
+        """
+        Calcula el top-K de vacantes para TODOS los usuarios con cv_features:
+        coseno como producto matriz-matriz, BM25 con todas las queries del lote
+        a la vez y overlap como producto disperso de IDs de skills.
+        """
+        t0 = time.perf_counter()
+        vac = VacanteFeaturesService.sync_index(db).snapshot()
+        cvs = CVFeaturesService.sync_index(db).snapshot()
+        stats = {"usuarios": 0, "filas": 0, "segundos": 0.0}
+        if not vac["ids"] or not cvs["ids"]:
+            return stats
+        if cvs["embs"].shape[1] != vac["embs"].shape[1]:
+            raise ValueError("Los embeddings de CVs y vacantes tienen dimensiones distintas")
+
+        alpha, beta, gamma = PESOS
+        use_ids = vac["term_matrix"] is not None and cvs["term_matrix"] is not None
+        if use_ids:
+            n_cols = max(vac["term_matrix"].shape[1], cvs["term_matrix"].shape[1])
+            names = SkillService.names(db, list(range(n_cols)))
+            weights = np.array([1.0 if " " in n else 0.6 for n in names])
+            vac_tm = _with_cols(vac["term_matrix"], n_cols)
+            cv_tm = _with_cols(cvs["term_matrix"], n_cols) @ sparse.diags(weights)
+
+        for start in range(0, len(cvs["ids"]), lote):
+            sl = slice(start, start + lote)
+            uids = cvs["ids"][sl]
+
+            cos = cvs["embs"][sl] @ vac["embs"].T
+            bm = vac["bm25"].get_scores_many(cvs["tokens"][sl])
+            if use_ids:
+                ol = np.asarray((cv_tm[sl] @ vac_tm.T).todense())
+            else:
+                ol = np.vstack([cm.batch_overlap(t, vac["terms"])[0] for t in cvs["terms"][sl]])
+            g = np.array([gamma if t else 0.0 for t in cvs["terms"][sl]])
+
+            order, final, c, b, o = cm.fuse_signals_batch(cos, bm, ol, topk, alpha, beta, g)
+
+            filas = []
+            for r, uid in enumerate(uids):
+                cv_ids = set(cvs["term_ids"][start + r] or []) if use_ids else None
+                for p, j in enumerate(order[r]):
+                    if use_ids:
+                        terms = [names[i] for i in sorted(cv_ids.intersection(vac["term_ids"][j]))][:10]
+                    else:
+                        terms = cm.pretty_overlap(cvs["terms"][start + r], vac["terms"][j], top=10)
+                    filas.append({
+                        "usuario_id": uid,
+                        "vacante_id": vac["ids"][j],
+                        "posicion": p,
+                        "score": round(float(final[r, p]), 4),
+                        "cos": round(float(c[r, p]), 4),
+                        "bm25": round(float(b[r, p]), 4),
+                        "overlap": round(float(o[r, p]), 4),
+                        "match_terms": terms,
+                    })
+            RecomendacionDAO.replace_for_usuarios(db, uids, filas)
+            stats["usuarios"] += len(uids)
+            stats["filas"] += len(filas)
+
+        stats["segundos"] = round(time.perf_counter() - t0, 2)
+        return stats
+
+    @staticmethod
+    def get_fresh(
+        db: Session, cvf, topk: int,
+        max_edad_horas: Optional[float] = None,
+        with_metrics: bool = False,
+        offset: int = 0,
+        campos: Optional[tuple] = None,
+        continuacion: bool = False
+    ) -> Optional[List[Vacante]]:
+        """
+        Top precalculado del usuario desde la posición `offset`, o None si no hay,
+        si es anterior a la última actualización del CV, si supera `max_edad_horas`
+        o si no alcanza para `topk`.
+        Con `continuacion=True` (páginas siguientes de un ranking que empezó aquí)
+        solo se exige que no sea anterior al CV: se devuelve lo que quede, aunque
+        sea una página corta o vacía, para no mezclarlo con el ranking en vivo.
+        """
+        recs = RecomendacionDAO.get_by_usuario(db, cvf.usuario_id, topk, desde=offset)
+        if not recs:
+            return [] if continuacion else None
+        calculado = min(r.calculado_en for r in recs)
+        if cvf.updated_at is not None and calculado < cvf.updated_at:
+            return None
+        if not continuacion:
+            if max_edad_horas is not None and datetime.now(timezone.utc) - calculado > timedelta(hours=max_edad_horas):
+                return None
+            if len(recs) < topk and offset + len(recs) < len(VacanteFeaturesService.sync_index(db).snapshot()["ids"]):
+                return None
+
+        vmap = {v.id: v for v in VacanteDAO.get_by_ids(db, [r.vacante_id for r in recs], campos=campos)}
+        ranked = []
+        for r in recs:
+            v = vmap.get(r.vacante_id)
+            if v is None:
+                continue
+            setattr(v, "match_score", r.score)
+            setattr(v, "match_terms", list(r.match_terms or []))
+            if with_metrics:
+                setattr(v, "match_cos", r.cos)
+                setattr(v, "match_bm25", r.bm25)
+                setattr(v, "match_overlap", r.overlap)
+            ranked.append(v)
+        return ranked
@@ -0,0 +1,83 @@
+"""
+Service para el vocabulario canónico de skills (interning de frases a IDs)
+"""
+from sqlalchemy.orm import Session
+from dao.skill_dao import SkillDAO
+from utils import cv_matcher as cm
+from utils.skill_vocab import get_skill_vocab, SkillVocab
+
+
+class SkillService:
+    """Convierte frases de skills/términos en IDs canónicos estables"""
+
+    @staticmethod
+    def load(db: Session) -> SkillVocab:
+        """Carga el vocabulario completo desde la BD"""
+        vocab = get_skill_vocab()
+        vocab.reset()
+        for s in SkillDAO.get_all(db):
+            vocab.add_skill(s.id, s.nombre)
+        for frase, sid in SkillDAO.get_aliases(db):
+            vocab.add_alias(frase, sid)
+        vocab.loaded = True
+        return vocab
+
+    @staticmethod
+    def intern(db: Session, frases: list) -> list[int]:
+        """
+        Retorna los IDs (ordenados, sin repetir) de las frases dadas, creando las
+        skills que no existan. Las variantes difusas se pliegan a un ID existente.
+        """
+        vocab = get_skill_vocab()
+        if not vocab.loaded:
+            SkillService.load(db)
+
+        norm = [p for p in dict.fromkeys(cm.normalize_skill(f) for f in frases or []) if p]
+        ids, nuevas_variantes, faltantes = set(), [], []
+        for p in norm:
+            sid, es_variante = vocab.resolve(p)
+            if sid is None:
+                faltantes.append(p)
+                continue
+            ids.add(sid)
+            if es_variante:
+                nuevas_variantes.append((p, sid))
+
+        try:
+            if faltantes:
+                # Serializa la creación entre procesos y trae lo que otros ya crearon
+                SkillDAO.lock(db)
+                for s in SkillDAO.get_all(db, since_id=vocab.max_id):
+                    vocab.add_skill(s.id, s.nombre)
+                for p in faltantes:
+                    sid, es_variante = vocab.resolve(p)
+                    if sid is None:
+                        sid = SkillDAO.create(db, p)
+                        vocab.add_skill(sid, p)
+                    elif es_variante:
+                        nuevas_variantes.append((p, sid))
+                    ids.add(sid)
+            if nuevas_variantes:
+                SkillDAO.add_aliases(db, nuevas_variantes)
+                for p, sid in nuevas_variantes:
+                    vocab.add_alias(p, sid)
+            if faltantes or nuevas_variantes:
+                db.commit()
+        except Exception:
+            db.rollback()
+            vocab.reset()  # puede tener IDs que no se persistieron; se recarga en la siguiente llamada
+            raise
+
+        return sorted(ids)
+
+    @staticmethod
+    def names(db: Session, skill_ids: list[int]) -> list[str]:
+        """Nombres canónicos de los IDs dados (en el mismo orden)"""
+        vocab = get_skill_vocab()
+        if not vocab.loaded:
+            SkillService.load(db)
+        elif any(i > vocab.max_id for i in skill_ids):
+            # IDs creados por otro proceso
+            for s in SkillDAO.get_all(db, since_id=vocab.max_id):
+                vocab.add_skill(s.id, s.nombre)
+        return vocab.names_for(skill_ids)
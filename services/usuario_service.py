@@ -8,15 +8,16 @@ from models.usuario import Usuario
 from utils.security import get_password_hash
 from typing import List, Optional
 from fastapi import HTTPException, status
+from utils.paginacion import after_id
 
 
 class UsuarioService:
     """Service para la lógica de negocio de Usuario"""
 
     @staticmethod
-    def get_all_usuarios(db: Session, skip: int = 0, limit: int = 100) -> List[Usuario]:
-        """Obtiene todos los usuarios"""
-        return UsuarioDAO.get_all(db, skip, limit)
+    def get_all_usuarios(db: Session, skip: int = 0, limit: int = 100, cursor: str | None = None) -> List[Usuario]:
+        """Obtiene todos los usuarios (con `cursor`, paginación keyset por ID)"""
+        return UsuarioDAO.get_all(db, skip, limit, after_id=after_id(cursor))
 
     @staticmethod
     def get_usuario_by_id(db: Session, usuario_id: int) -> Usuario:
@@ -1,7 +1,10 @@
 import json
 from sqlalchemy.orm import Session
 from utils import cv_matcher as cm
+from utils.feature_index import get_vacante_index, FeatureIndex
 from dao.vacantes_features_dao import VacanteFeaturesDAO
+from dao.vacante_dao import VacanteDAO
+from services.skill_service import SkillService
 
 class VacanteFeaturesService:
     """Service para generar y actualizar los features de una vacante (texto, términos, embedding)."""
@@ -31,20 +34,131 @@ class VacanteFeaturesService:
     @staticmethod
     def build_features(datos: dict | str) -> tuple[str, list, list[float]]:
         """Genera jd_text, jd_terms y embedding a partir de los datos de la vacante."""
-        jd_text = VacanteFeaturesService._vacante_text_from_json(datos)
+        return VacanteFeaturesService.build_features_from_text(
+            VacanteFeaturesService._vacante_text_from_json(datos)
+        )
+
+    @staticmethod
+    def build_features_from_text(jd_text: str) -> tuple[str, list, list[float]]:
+        """Términos y embedding de un jd_text (ambos pasan por la caché por contenido)."""
         if not jd_text.strip():
             jd_terms, emb = [], []
         else:
-            jd_terms = cm.dedup_fuzzy(
-                list(set(cm.keyphrases_spacy(jd_text) + cm.keyphrases_rake(jd_text)))
-            )
-            emb = cm.EMB.encode([jd_text])[0].tolist()
+            jd_terms = cm.extract_jd_terms(jd_text)
+            emb = cm.encode_cached(jd_text).tolist()
         return jd_text, jd_terms, emb
 
+    @staticmethod
+    def build_features_many(jd_texts: list[str], n_process: int = cm.SPACY_N_PROCESS) -> list[tuple[str, list, list[float]]]:
+        """build_features_from_text para muchas vacantes: una pasada de nlp.pipe y un solo encode."""
+        validos = [t for t in jd_texts if t.strip()]
+        terms = dict(zip(validos, cm.extract_jd_terms_many(validos, n_process=n_process)))
+        embs = dict(zip(validos, cm.encode_cached(validos).tolist())) if validos else {}
+        return [(t, terms.get(t, []), embs.get(t, [])) for t in jd_texts]
+
+    @staticmethod
+    def reprocess_all(db: Session, lote: int = 64, n_process: int = cm.SPACY_N_PROCESS) -> int:
+        """Recalcula las features de todas las vacantes por lotes (p.ej. tras cambiar el pipeline)."""
+        total, last_id = 0, None
+        while True:
+            vacantes = VacanteDAO.get_all(db, limit=lote, after_id=last_id)
+            if not vacantes:
+                break
+            textos = [VacanteFeaturesService._vacante_text_from_json(v.datos_vacante or {}) for v in vacantes]
+            for v, (jd_text, jd_terms, emb) in zip(vacantes, VacanteFeaturesService.build_features_many(textos, n_process)):
+                term_ids = SkillService.intern(db, jd_terms)
+                VacanteFeaturesDAO.upsert(db, v.id, jd_text, jd_terms, emb, jd_term_ids=term_ids)
+            total += len(vacantes)
+            last_id = vacantes[-1].id
+        VacanteFeaturesService.rebuild_index(db)
+        return total
+
+    @staticmethod
+    def bulk_upsert_features(db: Session, vacante_ids: list[int], features: list[tuple[str, list, list[float]]]) -> int:
+        """
+        Guarda features ya calculadas (salida de build_features_many) de varias
+        vacantes en una sola sentencia; omite las que no tienen embedding (texto vacío).
+        """
+        filas = [
+            {"vacante_id": vid, "jd_text": jd_text, "jd_terms": jd_terms, "embedding": emb,
+             "jd_term_ids": SkillService.intern(db, jd_terms)}
+            for vid, (jd_text, jd_terms, emb) in zip(vacante_ids, features) if len(emb) > 0
+        ]
+        VacanteFeaturesDAO.bulk_upsert(db, filas)
+        return len(filas)
+
     @staticmethod
     def upsert_from_vacante(db: Session, vacante):
-        """Recibe una instancia de Vacante y crea/actualiza su registro en vacante_features."""
-        datos = vacante.datos_vacante or {}
-        jd_text, jd_terms, emb = VacanteFeaturesService.build_features(datos)
-        return VacanteFeaturesDAO.upsert(db, vacante.id, jd_text, jd_terms, emb)
+        """
+        Recibe una instancia de Vacante y crea/actualiza su registro en vacante_features.
+        Si el jd_text resultante es el mismo que ya está guardado no recalcula nada.
+        """
+        jd_text = VacanteFeaturesService._vacante_text_from_json(vacante.datos_vacante or {})
+        prev = VacanteFeaturesDAO.get_by_id(db, vacante.id)
+        if (prev is not None and prev.jd_text == jd_text
+                and prev.embedding is not None and prev.jd_term_ids is not None):
+            return prev
+        jd_text, jd_terms, emb = VacanteFeaturesService.build_features_from_text(jd_text)
+        term_ids = SkillService.intern(db, jd_terms)
+        rec = VacanteFeaturesDAO.upsert(db, vacante.id, jd_text, jd_terms, emb, jd_term_ids=term_ids)
+        index = get_vacante_index()
+        if index.ready:
+            index.upsert(VacanteFeaturesService._index_row(rec))
+        return rec
+
+    # ---------- índice en memoria ----------
+    @staticmethod
+    def _index_row(rec) -> dict:
+        return {
+            "id": rec.vacante_id,
+            "text": rec.jd_text,
+            "terms": rec.jd_terms or [],
+            "term_ids": rec.jd_term_ids,
+            "embedding": rec.embedding,
+            "updated_at": rec.updated_at,
+        }
+
+    @staticmethod
+    def rebuild_index(db: Session) -> FeatureIndex:
+        """Construye el índice de vacantes desde vacante_features (sin inferencia de modelos)."""
+        index = get_vacante_index()
+        # La estampa se lee antes que las filas (ver VacanteFeaturesDAO.get_stamp)
+        stamp = VacanteFeaturesDAO.get_stamp(db)
+        recs = VacanteFeaturesDAO.get_all(db)
+
+        # Backfill único de IDs de términos para filas anteriores al vocabulario canónico
+        faltantes = {r.vacante_id: SkillService.intern(db, r.jd_terms) for r in recs if r.jd_term_ids is None}
+        if faltantes:
+            VacanteFeaturesDAO.set_term_ids(db, faltantes)
+            stamp = VacanteFeaturesDAO.get_stamp(db)
+            recs = VacanteFeaturesDAO.get_all(db)
+
+        index.build([VacanteFeaturesService._index_row(r) for r in recs], stamp=stamp)
+        return index
+
+    @staticmethod
+    def sync_index(db: Session) -> FeatureIndex:
+        """
+        Pone al día el índice con los cambios hechos por otros procesos.
+        Solo consulta (id, updated_at) y recarga las filas que cambiaron.
+        """
+        index = get_vacante_index()
+        if not index.ready:
+            return VacanteFeaturesService.rebuild_index(db)
+
+        stamp = VacanteFeaturesDAO.get_stamp(db)
+        if stamp == index.stamp:
+            return index
+
+        stale, gone = index.diff(VacanteFeaturesDAO.get_versions(db))
+        rows = [VacanteFeaturesService._index_row(r) for r in VacanteFeaturesDAO.get_by_ids(db, stale)] if stale else []
+        index.apply(upserts=rows, removals=gone, stamp=stamp)
+        return index
+
+    @staticmethod
+    def remove_from_index(vacante_id: int):
+        """Quita una vacante eliminada del índice en memoria."""
+        index = get_vacante_index()
+        if index.ready:
+            index.remove(vacante_id)
 
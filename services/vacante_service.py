@@ -8,22 +8,47 @@ from models.vacante import Vacante
 from typing import List
 from fastapi import HTTPException, status
 from services.vacante_features_service import VacanteFeaturesService
-from dao.vacantes_features_dao import VacanteFeaturesDAO
+from services.cv_features_service import CVFeaturesService
+from services.skill_service import SkillService
+from services.recomendacion_service import RecomendacionService, PESOS
+from dao.recomendacion_dao import RecomendacionDAO
+from dao.contador_cambios_dao import ContadorCambiosDAO
 from dao.cv_features_dao import CVFeaturesDAO
+from dao.usuario_dao import UsuarioDAO
+from models.usuario import Usuario
+from dao.vacantes_features_dao import VacanteFeaturesDAO, ANN_MAX
 from utils import cv_matcher as cm
+from utils.signal_cache import get_signal_cache
+from utils.paginacion import after_id, encode_cursor, decode_cursor
+import hashlib
+import os
+
+# Recuperación ANN (pgvector) antes del re-ranking híbrido; 0 = puntuar todo el índice
+ANN_CANDIDATOS = int(os.getenv("ANN_CANDIDATOS", "0"))
+ANN_EF_SEARCH = int(os.getenv("ANN_EF_SEARCH", "100"))
+ANN_PROBES = int(os.getenv("ANN_PROBES", "10"))
 
 class VacanteService:
     """Service para la lógica de negocio de Vacante"""
 
     @staticmethod
-    def get_all_vacantes(db: Session, skip: int = 0, limit: int = 100) -> List[Vacante]:
-        """Obtiene todas las vacantes"""
-        return VacanteDAO.get_all(db, skip, limit)
+    def get_all_vacantes(db: Session, skip: int = 0, limit: int = 100, cursor: str | None = None,
+                         campos: tuple | None = None, filtros: dict | None = None) -> List[Vacante]:
+        """
+        Obtiene todas las vacantes (con `cursor`, paginación keyset por ID; `campos`
+        proyecta datos_vacante; `filtros` restringe por facetas)
+        """
+        return VacanteDAO.get_all(db, skip, limit, after_id=after_id(cursor), campos=campos, filtros=filtros)
+
+    @staticmethod
+    def get_facetas(db: Session, filtros: dict | None = None) -> dict:
+        """Conteos por faceta (ciudad, estado, modalidad, tipo de empleo, apto para estudiantes)"""
+        return VacanteDAO.facet_counts(db, filtros)
 
     @staticmethod
-    def get_vacante_by_id(db: Session, vacante_id: int) -> Vacante:
+    def get_vacante_by_id(db: Session, vacante_id: int, campos: tuple | None = None) -> Vacante:
         """Obtiene una vacante por ID"""
-        vacante = VacanteDAO.get_by_id(db, vacante_id)
+        vacante = VacanteDAO.get_by_id(db, vacante_id, campos=campos)
         if not vacante:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -86,13 +111,38 @@ class VacanteService:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Error al eliminar la vacante"
             )
+
+        VacanteFeaturesService.remove_from_index(vacante_id)
         
         return {"message": "Vacante eliminada exitosamente"}
 
     @staticmethod
-    def search_vacantes_by_empresa(db: Session, nombre_empresa: str) -> List[Vacante]:
-        """Busca vacantes por nombre de empresa"""
-        return VacanteDAO.search_by_empresa(db, nombre_empresa)
+    def search_vacantes(
+        db: Session,
+        q: str | None = None,
+        empresa: str | None = None,
+        skip: int = 0,
+        limit: int = 100,
+        campos: tuple | None = None
+    ) -> List[Vacante]:
+        """
+        Con `q`, búsqueda de texto completo en título, requisitos, áreas y empresa
+        (ordenada por relevancia, que se devuelve en match_score); `empresa`
+        filtra además por nombre de empresa. Solo con `empresa`, búsqueda parcial
+        por nombre en orden de ID.
+        """
+        if q and q.strip():
+            ranked = []
+            for v, rank in VacanteDAO.search_text(db, q.strip(), skip, limit, nombre_empresa=empresa, campos=campos):
+                setattr(v, "match_score", round(float(rank), 4))
+                ranked.append(v)
+            return ranked
+        if empresa:
+            return VacanteDAO.search_by_empresa(db, empresa, skip, limit, campos=campos)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Indica `q` (texto a buscar) o `empresa`"
+        )
     
     @staticmethod
     def list_for_user_ranked(
@@ -100,52 +150,147 @@ class VacanteService:
         usuario_id: int,
         topk: int = 100,
         alpha: float = 0.55, beta: float = 0.45, gamma: float = 0.15,
-        with_metrics: bool = False
+        with_metrics: bool = False,
+        modo: str = "precalculado",
+        candidatos: int | None = None,
+        ef_search: int | None = None,
+        probes: int | None = None,
+        precalculadas: bool = True,
+        max_edad_horas: float | None = None,
+        offset: int = 0,
+        campos: tuple | None = None,
+        filtros: dict | None = None
     ) -> List[Vacante]:
+        """
+        Rankea las vacantes para el CV del usuario.
+        modo='precalculado' usa solo el embedding y skills guardados en cv_features
+        (sin inferencia en la petición); modo='en_vivo' re-codifica el texto del CV.
+        Con candidatos > 0, Postgres devuelve primero los N vecinos más cercanos
+        (índice HNSW/IVFFlat) y solo esos se re-puntúan con BM25 y overlap.
+        Con precalculadas=True se sirve la tabla recomendaciones si está fresca
+        (ver RecomendacionService.get_fresh) y si no se rankea en vivo.
+        Las señales crudas se cachean por (usuario, updated_at del CV, versión del
+        índice): otros pesos, topk o métricas solo repiten la fusión.
+        `offset` salta las primeras posiciones del ranking (ver rank_page).
+        `campos` solo afecta qué claves de datos_vacante se leen del top final.
+        Con `filtros` (facetas) solo se puntúan las vacantes que los cumplen
+        (sin etapa ANN ni precalculadas).
+        """
+        return VacanteService._ranking(
+            db, usuario_id, topk=topk, alpha=alpha, beta=beta, gamma=gamma, with_metrics=with_metrics,
+            modo=modo, candidatos=candidatos, ef_search=ef_search, probes=probes, precalculadas=precalculadas,
+            max_edad_horas=max_edad_horas, offset=offset, campos=campos, filtros=filtros
+        )[0]
+
+    @staticmethod
+    def _ranking(
+        db: Session,
+        usuario_id: int,
+        topk: int = 100,
+        alpha: float = 0.55, beta: float = 0.45, gamma: float = 0.15,
+        with_metrics: bool = False,
+        modo: str = "precalculado",
+        candidatos: int | None = None,
+        ef_search: int | None = None,
+        probes: int | None = None,
+        precalculadas: bool = True,
+        max_edad_horas: float | None = None,
+        offset: int = 0,
+        campos: tuple | None = None,
+        filtros: dict | None = None,
+        plan: dict | None = None
+    ) -> tuple[List[Vacante], dict | None]:
+        """
+        list_for_user_ranked y el plan con que se rankeó: {"f": fuente ("rec" =
+        tabla recomendaciones, "vivo" = índice en memoria), "n": vecinos ANN}.
+        Con `plan` (de una página anterior) se repite esa misma fuente y ese
+        mismo pool de candidatos, en vez de decidirlos según esta página.
+        """
         # 1) CV del usuario
         cvf = CVFeaturesDAO.get_by_usuario(db, usuario_id)
         if not cvf:
-            return VacanteDAO.get_all(db, 0, topk)
+            return VacanteDAO.get_all(db, 0, topk, campos=campos, filtros=filtros), None
 
-        # 2) Vacantes + sus features ya calculadas
-        vacs = VacanteDAO.get_all(db, 0, 10_000)
-        if not vacs:
-            return []
+        # 1b) Top precalculado en lote, si aplica a esta petición
+        if plan is not None and plan.get("f") == "rec":
+            ranked = RecomendacionService.get_fresh(
+                db, cvf, topk, max_edad_horas, with_metrics, offset, campos, continuacion=True
+            )
+            return (ranked if ranked is not None else []), plan
+        if (plan is None and precalculadas and modo == "precalculado" and not candidatos and not filtros
+                and (alpha, beta, gamma) == PESOS):
+            ranked = RecomendacionService.get_fresh(db, cvf, topk, max_edad_horas, with_metrics, offset, campos)
+            if ranked is not None:
+                return ranked, {"f": "rec", "n": 0}
 
-        feats = VacanteFeaturesDAO.get_by_ids(db, [v.id for v in vacs])
-        fmap = {f.vacante_id: f for f in feats}
+        # 2) Índice de vacantes en memoria (BM25 + embeddings + términos), al día con la BD
+        index = VacanteFeaturesService.sync_index(db).snapshot()
+        if not index["ids"]:
+            return [], None
 
-        kept, docs = [], []
-        for v in vacs:
-            f = fmap.get(v.id)
-            if not f or not f.jd_text:
-                continue
-            kept.append(v)
-            docs.append({"id": str(v.id), "text": f.jd_text})
+        # 3) Rankear usando el CV como query (texto para BM25, embedding guardado para coseno)
+        gamma_eff = gamma if (getattr(cvf, "skills", None) and len(cvf.skills) > 0) else 0.0
 
-        if not docs:
-            return []
+        # Señales cacheadas por variante de recuperación; los pesos y topk no entran en la clave
+        # El pool ANN se fija en la primera página: las siguientes re-rankean los mismos candidatos
+        if plan is not None:
+            n_ann = int(plan.get("n") or 0)
+        else:
+            n_cand = ANN_CANDIDATOS if candidatos is None else candidatos
+            n_ann = max(n_cand, offset + topk) if n_cand > 0 and cvf.embedding is not None and not filtros else 0
+            if n_ann > ANN_MAX:
+                # pgvector no da más de ANN_MAX vecinos: se re-rankea todo el índice (exacto)
+                n_ann = 0
+        plan = {"f": "vivo", "n": n_ann}
+        ef = ANN_EF_SEARCH if ef_search is None else ef_search
+        pr = ANN_PROBES if probes is None else probes
+        cache = get_signal_cache()
+        cache_key = (usuario_id, modo, n_ann, ef, pr, tuple(sorted((filtros or {}).items())))
+        # Las facetas salen de vacantes, no de vacante_features: con filtros también cuenta su estampa
+        cache_stamp = (cvf.updated_at, index["version"], ContadorCambiosDAO.get(db, Vacante.__tablename__) if filtros else None)
+        sig = cache.get(cache_key, cache_stamp)
+        if sig is None:
+            q_emb = None
+            if modo == "precalculado" and cvf.embedding is not None and len(cvf.embedding) == index["embs"].shape[1]:
+                q_emb = cvf.embedding
 
-        # 3) Índice de vacantes (BM25 + embeddings + términos)
-        idx, jd_terms_list = cm.build_vacante_index(docs)  # <- usa tu cv_matcher
+            # 3b) Etapa 1 opcional: candidatos por facetas (índices en Postgres) o por ANN
+            positions = None
+            if filtros:
+                positions = [index["pos"][i] for i in VacanteDAO.get_ids(db, filtros) if i in index["pos"]]
+                if not positions:
+                    return [], plan
+            elif n_ann > 0:
+                ids = VacanteFeaturesDAO.nearest_ids(db, cvf.embedding, n_ann, ef_search=ef, probes=pr)
+                positions = [index["pos"][i] for i in ids if i in index["pos"]]
 
-        # 4) Rankear usando el TEXTO del CV como query
-        gamma_eff = gamma if (getattr(cvf, "skills", None) and len(cvf.skills) > 0) else 0.0
+            # 4) Señales (coseno, BM25, overlap en una sola pasada) y fusión.
+            #    Overlap por IDs canónicos si todo el índice los tiene; si no, difuso por texto.
+            skill_ids, skill_list = None, cvf.skills
+            if index["term_matrix"] is not None:
+                skill_ids = CVFeaturesService.ensure_skill_ids(db, cvf)
+                skill_list = SkillService.names(db, skill_ids)
+            sig = cm.hybrid_signals(
+                cvf.texto, index, cv_skill_list=skill_list, jd_terms_list=index["terms"],
+                q_emb=q_emb, candidates=positions, cv_skill_ids=skill_ids
+            )
+            cache.put(cache_key, cache_stamp, sig)
 
-        k = min(topk, len(docs))
-        order, final, cos, bm, ol = cm.hybrid_rank(
-            cvf.texto, idx, topk=k, alpha=alpha, beta=beta, gamma=gamma_eff, cv_skill_list=cvf.skills, jd_terms_list=jd_terms_list 
-        )
+        k = min(offset + topk, len(sig["pos"]))
+        order, final, cos, bm, ol = cm.fuse_signals(sig, topk=k, alpha=alpha, beta=beta, gamma=gamma_eff)
+        order, final, cos, bm, ol = (a[offset:] for a in (order, final, cos, bm, ol))
 
-        # 5) Enriquecer con score y términos "bonitos"
+        # 5) Solo se cargan de la BD las vacantes que entran al top
+        vmap = {v.id: v for v in VacanteDAO.get_by_ids(db, [index["ids"][sig["pos"][j]] for j in order], campos=campos)}
+
+        # 6) Enriquecer con score y términos "bonitos" (salen de la misma matriz de overlap)
         ranked = []
-        for rank_pos, i in enumerate(order):
-            v = kept[i]
+        for rank_pos, j in enumerate(order):
+            v = vmap.get(index["ids"][sig["pos"][j]])
+            if v is None:
+                continue
             setattr(v, "match_score", round(float(final[rank_pos]), 4))
-            try:
-                setattr(v, "match_terms", cm.pretty_overlap(cvf.skills, jd_terms_list[i], top=10))
-            except Exception:
-                setattr(v, "match_terms", [])
+            setattr(v, "match_terms", cm.hit_terms(sig["skills"], sig["hits"], j, top=10))
 
             if with_metrics:
                 setattr(v, "match_cos", round(float(cos[rank_pos]), 4))
@@ -154,4 +299,128 @@ class VacanteService:
 
             ranked.append(v)
 
-        return ranked
\ No newline at end of file
+        return ranked, plan
+
+    @staticmethod
+    def rank_page(
+        db: Session,
+        usuario_id: int,
+        topk: int = 100,
+        cursor: str | None = None,
+        campos: tuple | None = None,
+        **opciones
+    ) -> tuple[List[Vacante], str | None]:
+        """
+        Página del ranking de list_for_user_ranked y cursor de la siguiente.
+        El cursor guarda la última posición, la fuente (precalculadas o en vivo)
+        y el pool ANN elegidos en la primera página, y una huella del "snapshot"
+        del ranking (CV, estado de vacante_features y de las precalculadas, de
+        vacantes si hay filtros de facetas, opciones, fuente y pool); si cambió entre páginas responde 410 para que
+        el cliente vuelva a empezar. Todas las páginas salen del mismo ranking.
+        """
+        cvf = CVFeaturesDAO.get_by_usuario(db, usuario_id)
+        if not cvf:
+            return VacanteService.list_for_user_ranked(db, usuario_id, topk=topk, campos=campos, **opciones), None
+
+        base = (
+            cvf.updated_at, VacanteFeaturesDAO.get_stamp(db), RecomendacionDAO.get_stamp(db, usuario_id),
+            ContadorCambiosDAO.get(db, Vacante.__tablename__) if opciones.get("filtros") else None,
+            sorted(opciones.items())
+        )
+
+        def huella(plan: dict) -> str:
+            return hashlib.sha1(repr((base, plan["f"], plan["n"])).encode()).hexdigest()[:16]
+
+        offset, plan = 0, None
+        if cursor:
+            data = decode_cursor(cursor)
+            if (data.get("u") != usuario_id or not isinstance(data.get("p"), int) or data["p"] < 0
+                    or data.get("f") not in ("rec", "vivo") or not isinstance(data.get("n"), int) or data["n"] < 0):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Cursor inválido"
+                )
+            plan = {"f": data["f"], "n": data["n"]}
+            if data.get("s") != huella(plan):
+                raise HTTPException(
+                    status_code=status.HTTP_410_GONE,
+                    detail="El ranking cambió desde la página anterior; vuelve a pedir la primera página"
+                )
+            offset = data["p"]
+
+        ranked, plan = VacanteService._ranking(
+            db, usuario_id, topk=topk, offset=offset, campos=campos, plan=plan, **opciones
+        )
+        siguiente = None
+        if len(ranked) == topk and plan is not None:
+            siguiente = encode_cursor({"u": usuario_id, "s": huella(plan), "p": offset + topk, **plan})
+        return ranked, siguiente
+
+    @staticmethod
+    def rank_candidates(
+        db: Session,
+        vacante_id: int,
+        topk: int = 50,
+        carrera: str | None = None,
+        cuatrimestre: int | None = None,
+        alpha: float = 0.55, beta: float = 0.45, gamma: float = 0.15,
+        with_metrics: bool = False
+    ) -> List[Usuario]:
+        """
+        Ranking inverso para empleadores: los mejores CVs para una vacante.
+        Usa las mismas señales que list_for_user_ranked (coseno, BM25, overlap) con
+        la vacante como query contra el índice de CVs en memoria, sin leer la tabla cv.
+        """
+        VacanteService.get_vacante_by_id(db, vacante_id)
+        vf = VacanteFeaturesDAO.get_by_id(db, vacante_id)
+        if not vf or not vf.jd_text:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"La vacante {vacante_id} no tiene features calculadas"
+            )
+
+        index = CVFeaturesService.sync_index(db).snapshot()
+        if not index["ids"]:
+            return []
+
+        # Filtros por carrera/cuatrimestre antes de puntuar
+        positions = None
+        if carrera or cuatrimestre is not None:
+            ids = UsuarioDAO.ids_by_filters(db, carrera=carrera, cuatrimestre=cuatrimestre)
+            positions = [index["pos"][i] for i in ids if i in index["pos"]]
+
+        q_emb = None
+        if vf.embedding is not None and len(vf.embedding) == index["embs"].shape[1]:
+            q_emb = vf.embedding
+
+        # Aquí los términos de la vacante hacen el papel de "skills de la query"
+        term_ids, terms = None, list(vf.jd_terms or [])
+        if index["term_matrix"] is not None and vf.jd_term_ids is not None:
+            term_ids = list(vf.jd_term_ids)
+            terms = SkillService.names(db, term_ids)
+        gamma_eff = gamma if terms else 0.0
+
+        sig = cm.hybrid_signals(
+            vf.jd_text, index, cv_skill_list=terms, jd_terms_list=index["terms"],
+            q_emb=q_emb, candidates=positions, cv_skill_ids=term_ids
+        )
+        k = min(topk, len(sig["pos"]))
+        order, final, cos, bm, ol = cm.fuse_signals(sig, topk=k, alpha=alpha, beta=beta, gamma=gamma_eff)
+
+        umap = {u.id: u for u in UsuarioDAO.get_by_ids(db, [index["ids"][sig["pos"][j]] for j in order])}
+
+        ranked = []
+        for rank_pos, j in enumerate(order):
+            u = umap.get(index["ids"][sig["pos"][j]])
+            if u is None:
+                continue
+            setattr(u, "match_score", round(float(final[rank_pos]), 4))
+
+            if with_metrics:
+                setattr(u, "match_cos", round(float(cos[rank_pos]), 4))
+                setattr(u, "match_bm25", round(float(bm[rank_pos]), 4))
+                setattr(u, "match_overlap", round(float(ol[rank_pos]), 4))
+
+            ranked.append(u)
+
+        return ranked
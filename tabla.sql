@@ -1,8 +1,37 @@
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 CREATE TABLE vacantes (
     id SERIAL PRIMARY KEY,
     nombre_empresa VARCHAR(255) NOT NULL,
-    datos_vacante TEXT
+    datos_vacante JSONB,
+    -- Búsqueda de texto completo en español (GET /vacantes/search?q=)
+    busqueda TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('spanish', coalesce(datos_vacante->>'title', '')), 'A') ||
+        setweight(to_tsvector('spanish', coalesce(datos_vacante->>'requirements_summary', '')), 'B') ||
+        setweight(to_tsvector('spanish', coalesce(datos_vacante->>'matched_utc_areas', '')), 'B') ||
+        setweight(to_tsvector('spanish', coalesce(datos_vacante->>'company', nombre_empresa)), 'C')
+    ) STORED,
+    -- Facetas (filtros y conteos de GET /vacantes/ y /vacantes/facetas)
+    ciudad TEXT GENERATED ALWAYS AS (nullif(btrim(datos_vacante->>'city'), '')) STORED,
+    estado TEXT GENERATED ALWAYS AS (nullif(btrim(datos_vacante->>'state'), '')) STORED,
+    modalidad TEXT GENERATED ALWAYS AS (nullif(btrim(datos_vacante->>'modality'), '')) STORED,
+    tipo_empleo TEXT GENERATED ALWAYS AS (nullif(btrim(datos_vacante->>'job_type'), '')) STORED,
+    apto_estudiantes BOOLEAN GENERATED ALWAYS AS (
+        CASE lower(btrim(datos_vacante->>'student_friendly')) WHEN 'true' THEN true WHEN 'false' THEN false END
+    ) STORED
 );
+CREATE INDEX ix_vacantes_busqueda ON vacantes USING gin (busqueda);
+CREATE INDEX ix_vacantes_nombre_empresa_trgm ON vacantes USING gin (nombre_empresa gin_trgm_ops);
+CREATE INDEX ix_vacantes_ciudad ON vacantes (ciudad);
+CREATE INDEX ix_vacantes_estado ON vacantes (estado);
+CREATE INDEX ix_vacantes_modalidad ON vacantes (modalidad);
+CREATE INDEX ix_vacantes_tipo_empleo ON vacantes (tipo_empleo);
+CREATE INDEX ix_vacantes_apto_estudiantes ON vacantes (apto_estudiantes);
+-- Una vacante por URL de origen (importar_vacantes.py es idempotente gracias a este índice)
+CREATE UNIQUE INDEX ux_vacantes_source_url ON vacantes ((datos_vacante->>'source_url'));
+-- En una base existente, init_db agrega las columnas generadas y los índices (migraciones.py);
+-- ux_vacantes_source_url se omite con aviso mientras haya vacantes con source_url repetido.
+-- Con datos_vacante TEXT, antes: ALTER TABLE vacantes ALTER COLUMN datos_vacante TYPE JSONB USING datos_vacante::jsonb;
 
 CREATE TABLE usuarios (
     id SERIAL PRIMARY KEY,
@@ -16,10 +45,23 @@ CREATE TABLE usuarios (
 
 CREATE EXTENSION vector;
 
+-- Vocabulario canónico de skills: cada frase normalizada (y sus variantes) -> ID estable
+CREATE TABLE skills (
+  id     SERIAL PRIMARY KEY,
+  nombre TEXT UNIQUE NOT NULL
+);
+
+CREATE TABLE skill_alias (
+  frase    TEXT PRIMARY KEY,
+  skill_id INTEGER NOT NULL REFERENCES skills(id) ON DELETE CASCADE
+);
+CREATE INDEX ix_skill_alias_skill_id ON skill_alias (skill_id);
+
 CREATE TABLE cv_features (
   usuario_id BIGINT PRIMARY KEY REFERENCES usuarios(id) ON DELETE CASCADE,
   texto      TEXT NOT NULL,
   skills     JSONB NOT NULL DEFAULT '[]'::jsonb,
+  skill_ids  INTEGER[],
   embedding  vector(1024) NOT NULL,
   updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
 );
@@ -28,6 +70,72 @@ CREATE TABLE vacante_features (
   vacante_id BIGINT PRIMARY KEY REFERENCES vacantes(id) ON DELETE CASCADE,
   jd_text    TEXT NOT NULL,
   jd_terms   JSONB NOT NULL DEFAULT '[]'::jsonb,
+  jd_term_ids INTEGER[],
   embedding  vector(1024) NOT NULL,
   updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
-);
\ No newline at end of file
+);
+
+-- Contador de cambios por tabla (estampa de cv_features, vacante_features y vacantes para sincronizar
+-- índices y cachés en memoria): cada escritura lo sube en su misma transacción
+CREATE TABLE contador_cambios (
+  tabla VARCHAR(50) PRIMARY KEY,
+  n     BIGINT NOT NULL DEFAULT 0
+);
+
+-- Índices ANN para recuperar candidatos por coseno (pgvector >= 0.5)
+CREATE INDEX ix_cv_features_embedding_hnsw
+  ON cv_features USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64);
+
+CREATE INDEX ix_vacante_features_embedding_hnsw
+  ON vacante_features USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64);
+
+-- Alternativa IVFFlat (construir con la tabla ya poblada; lists ~ filas / 1000):
+-- CREATE INDEX ix_vacante_features_embedding_ivf
+--   ON vacante_features USING ivfflat (embedding vector_cosine_ops) WITH (lists = 100);
+
+-- Top-K de vacantes precalculado por usuario (precalcular_recomendaciones.py)
+CREATE TABLE recomendaciones (
+  usuario_id   INTEGER NOT NULL REFERENCES usuarios(id) ON DELETE CASCADE,
+  vacante_id   INTEGER NOT NULL REFERENCES vacantes(id) ON DELETE CASCADE,
+  posicion     INTEGER NOT NULL,
+  score        DOUBLE PRECISION NOT NULL,
+  cos          DOUBLE PRECISION,
+  bm25         DOUBLE PRECISION,
+  overlap      DOUBLE PRECISION,
+  match_terms  JSONB NOT NULL DEFAULT '[]'::jsonb,
+  calculado_en TIMESTAMPTZ NOT NULL DEFAULT now(),
+  PRIMARY KEY (usuario_id, vacante_id)
+);
+CREATE INDEX ix_recomendaciones_usuario_posicion ON recomendaciones (usuario_id, posicion);
+
+-- CVs subidos (models/cv.py); el PDF se guarda en la fila
+CREATE TABLE cv (
+  id             SERIAL PRIMARY KEY,
+  usuario_id     INTEGER NOT NULL REFERENCES usuarios(id),
+  nombre_archivo VARCHAR(255) NOT NULL,
+  tipo           VARCHAR(100) DEFAULT 'application/pdf',
+  archivo        BYTEA NOT NULL,
+  sha256         VARCHAR(64),
+  fecha_subida   TIMESTAMP DEFAULT now()
+);
+
+-- Cola de extracción de features de CVs subidos (POST /cv responde 202 con el job)
+CREATE TABLE cv_jobs (
+  id           SERIAL PRIMARY KEY,
+  cv_id        INTEGER NOT NULL REFERENCES cv(id) ON DELETE CASCADE,
+  usuario_id   INTEGER NOT NULL REFERENCES usuarios(id) ON DELETE CASCADE,
+  estado       VARCHAR(20) NOT NULL DEFAULT 'pendiente',
+  etapa        VARCHAR(50),
+  progreso     INTEGER NOT NULL DEFAULT 0,
+  intentos     INTEGER NOT NULL DEFAULT 0,
+  error        TEXT,
+  creado_en    TIMESTAMPTZ NOT NULL DEFAULT now(),
+  iniciado_en  TIMESTAMPTZ,
+  terminado_en TIMESTAMPTZ
+);
+CREATE INDEX ix_cv_jobs_estado_id ON cv_jobs (estado, id);
+
+-- Descargas de CV: almacenamiento sin comprimir para que substring() lea solo
+-- los trozos pedidos (streaming y Range). En una base existente, init_db lo
+-- aplica (y reescribe las filas) con migraciones.py
+ALTER TABLE cv ALTER COLUMN archivo SET STORAGE EXTERNAL;
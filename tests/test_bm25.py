@@ -0,0 +1,60 @@
+"""
+Paridad de utils.bm25.SparseBM25 con rank_bm25.BM25Okapi, también tras altas,
+bajas y reordenamientos incrementales.
+Se corre desde la raíz del repo: `python -m pytest tests`.
+"""
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import numpy as np
+from rank_bm25 import BM25Okapi
+
+from utils.bm25 import SparseBM25
+
+CORPUS = [
+    "python django desarrollo web backend".split(),
+    "analista de datos python sql".split(),
+    "desarrollo movil android kotlin".split(),
+    "soporte tecnico redes".split(),
+    "python python ciencia de datos machine learning".split(),
+    "backend java spring sql".split(),
+    [],
+]
+QUERIES = [
+    "python sql".split(),
+    "python python backend".split(),      # término repetido
+    "de datos".split(),                   # idf negativo (término en muchos documentos)
+    "cobol".split(),                      # fuera del vocabulario
+    [],
+]
+
+
+def _igual(bm: SparseBM25, corpus: list):
+    ref = BM25Okapi(corpus)
+    for q in QUERIES:
+        assert np.allclose(bm.get_scores(q), ref.get_scores(q), rtol=1e-5, atol=1e-6)
+        docs = [0, len(corpus) - 1]
+        assert np.allclose(bm.get_batch_scores(q, docs), ref.get_batch_scores(q, docs), rtol=1e-5, atol=1e-6)
+    esperado = np.vstack([ref.get_scores(q) for q in QUERIES])
+    assert np.allclose(bm.get_scores_many(QUERIES), esperado, rtol=1e-5, atol=1e-6)
+
+
+def test_paridad_con_bm25okapi():
+    _igual(SparseBM25(CORPUS), CORPUS)
+
+
+def test_altas_incrementales():
+    bm = SparseBM25(CORPUS[:3])
+    assert list(bm.add(CORPUS[3:])) == list(range(3, len(CORPUS)))
+    _igual(bm, CORPUS)
+
+
+def test_bajas_y_reorden():
+    bm = SparseBM25(CORPUS)
+    bm.remove([1, 4])
+    quedan = [d for i, d in enumerate(CORPUS) if i not in (1, 4)]
+    _igual(bm, quedan)
+    orden = list(reversed(range(len(quedan))))
+    bm.reorder(orden)
+    _igual(bm, [quedan[i] for i in orden])
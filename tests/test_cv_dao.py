@@ -0,0 +1,84 @@
+"""
+Regresión: los listados de CVs nunca leen el archivo (PDF) de la tabla cv.
+
+Corre contra SQLite en memoria y registra cada sentencia con un listener
+`before_cursor_execute`; el tamaño de lo que devuelven get_all y
+get_by_usuario no debe crecer con el tamaño del archivo.
+Se corre desde la raíz del repo: `python -m pytest tests`.
+"""
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import sessionmaker
+
+from database import Base
+from models import CV, Usuario
+from dao.cv_dao import CVDAO
+
+
+@pytest.fixture()
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Usuario.__table__, CV.__table__])
+    session = sessionmaker(bind=engine)()
+    session.sentencias = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        session.sentencias.append(statement)
+
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _usuario(db, matricula: str) -> int:
+    u = Usuario(nombre="Ana", apellidos="López", matricula=matricula, password_hash="x")
+    db.add(u)
+    db.commit()
+    return u.id
+
+
+def _subir(db, usuario_id: int, n_bytes: int):
+    CVDAO.create(db, usuario_id, "cv.pdf", "application/pdf", b"%PDF" + b"x" * n_bytes, sha256="0" * 64)
+
+
+def _bytes_listados(db, usuario_id: int) -> int:
+    """Bytes de los valores que devuelven los dos listados, y revisa el SQL emitido."""
+    db.sentencias.clear()
+    filas = CVDAO.get_all(db) + CVDAO.get_by_usuario(db, usuario_id)
+    assert db.sentencias, "los listados deben consultar la BD"
+    for sql in db.sentencias:
+        assert "cv.archivo" not in sql, sql
+    total = 0
+    for fila in filas:
+        for valor in fila:
+            total += len(valor) if isinstance(valor, (bytes, str)) else 8
+    return total
+
+
+def test_listados_no_leen_el_archivo(db):
+    chico = _usuario(db, "A001")
+    grande = _usuario(db, "A002")
+    _subir(db, chico, 1_000)
+    _subir(db, grande, 1_000_000)
+
+    assert _bytes_listados(db, chico) < 1_000
+    # El CV de 1 MB pesa lo mismo que el de 1 KB en el listado
+    assert _bytes_listados(db, grande) == _bytes_listados(db, chico)
+
+
+def test_get_by_id_no_carga_el_archivo(db):
+    usuario_id = _usuario(db, "A003")
+    _subir(db, usuario_id, 10_000)
+    cv_id = CVDAO.get_all(db)[0].id
+    db.expunge_all()
+
+    cv = CVDAO.get_by_id(db, cv_id)
+    with pytest.raises(InvalidRequestError):
+        cv.archivo
+    assert len(CVDAO.get_archivo(db, cv_id)) == 10_004
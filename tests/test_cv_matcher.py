@@ -0,0 +1,29 @@
+"""
+Regresión del overlap de skills CV/vacante (utils.cv_matcher).
+Se corre desde la raíz del repo: `python -m pytest tests`.
+"""
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import numpy as np
+
+from utils import cv_matcher as cm
+
+
+def test_batch_overlap_sin_terminos_de_vacante():
+    scores, hits = cm.batch_overlap(["python", "machine learning"], [[], []])
+    assert scores.tolist() == [0.0, 0.0]
+    assert hits.shape == (2, 2) and hits.nnz == 0
+
+
+def test_pretty_overlap_vacante_vacia():
+    assert cm.pretty_overlap(["python"], []) == []
+    assert cm.overlap_score(["python"], []) == 0.0
+
+
+def test_batch_overlap_mezcla_vacias_y_con_terminos():
+    scores, hits = cm.batch_overlap(["python"], [[], ["python", "sql"], []])
+    assert np.flatnonzero(scores).tolist() == [1]
+    assert cm.hit_terms(["python"], hits, 1) == ["python"]
+    assert cm.hit_terms(["python"], hits, 0) == []
@@ -0,0 +1,43 @@
+"""
+Matrices compartidas en disco (utils.emb_store): nombre por contenido,
+directorio propio 0700 y escritura por bloques.
+Se corre desde la raíz del repo: `python -m pytest tests`.
+"""
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import numpy as np
+
+from utils import emb_store
+
+
+def test_comparte_por_contenido(tmp_path, monkeypatch):
+    carpeta = tmp_path / "emb"
+    monkeypatch.setattr(emb_store, "EMB_MMAP_DIR", str(carpeta))
+    m = np.random.default_rng(0).random((5, 3), dtype=np.float32)
+    a = emb_store.share_matrix("vac", m)
+    b = emb_store.share_matrix("vac", m.copy())
+    assert isinstance(a, np.memmap) and a.filename == b.filename
+    assert np.array_equal(a, m)
+    assert oct(os.stat(carpeta).st_mode & 0o777) == "0o700"
+    otra = emb_store.share_matrix("vac", m + 1)
+    assert otra.filename != a.filename
+
+
+def test_escritura_por_bloques_igual_a_matriz_completa(tmp_path, monkeypatch):
+    monkeypatch.setattr(emb_store, "EMB_MMAP_DIR", str(tmp_path / "emb"))
+    m = np.arange(12, dtype=np.float32).reshape(4, 3)
+    por_bloques = emb_store.write_matrix("vac", m.shape, [m[:1], m[1:3], m[3:]])
+    assert np.array_equal(por_bloques, m)
+    assert por_bloques.filename == emb_store.share_matrix("vac", m).filename
+
+
+def test_directorio_escribible_por_otros_no_se_usa(tmp_path, monkeypatch):
+    carpeta = tmp_path / "emb"
+    carpeta.mkdir(mode=0o777)
+    os.chmod(carpeta, 0o777)
+    monkeypatch.setattr(emb_store, "EMB_MMAP_DIR", str(carpeta))
+    m = np.ones((2, 2), dtype=np.float32)
+    assert emb_store.share_matrix("vac", m) is m
+    assert emb_store.write_matrix("vac", m.shape, [m]) is None
@@ -0,0 +1,32 @@
+"""
+Caché por contenido (utils.feature_cache): lo que guarda el LRU en memoria no
+retiene los lotes de donde salió, y el disco solo guarda f32/JSON.
+Se corre desde la raíz del repo: `python -m pytest tests`.
+"""
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import numpy as np
+
+from utils.feature_cache import FeatureCache
+
+
+def test_fila_de_un_lote_no_retiene_el_lote():
+    cache = FeatureCache(path="")
+    lote = np.ones((1000, 384), dtype=np.float32)
+    cache.put("k", lote[3])
+    guardado = cache.get("k")
+    assert guardado.base is None and guardado.nbytes == 384 * 4
+    lote[3, 0] = 5.0
+    assert guardado[0] == 1.0
+
+
+def test_disco_guarda_embeddings_y_frases(tmp_path):
+    path = str(tmp_path / "c" / "features.sqlite")
+    FeatureCache(path=path).put("e", np.arange(4, dtype=np.float32))
+    FeatureCache(path=path).put("f", ["python", "sql"])
+    otra = FeatureCache(path=path)
+    assert otra.get("e").tolist() == [0.0, 1.0, 2.0, 3.0]
+    assert otra.get("f") == ["python", "sql"]
+    assert oct(os.stat(tmp_path / "c").st_mode & 0o777) == "0o700"
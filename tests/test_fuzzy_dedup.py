@@ -0,0 +1,66 @@
+"""
+Paridad de la deduplicación en lote (utils.fuzzy_dedup) con la pasada voraz
+original con extractOne, con y sin bloqueo.
+Se corre desde la raíz del repo: `python -m pytest tests`.
+"""
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import random
+
+import numpy as np
+import pytest
+from rapidfuzz import fuzz, process
+
+from utils.fuzzy_dedup import candidate_pairs, dedup_phrases
+
+PALABRAS = ["python", "django", "sql", "datos", "analisis", "machine", "learning", "java", "spring",
+            "redes", "soporte", "excel", "power", "bi", "react", "node", "js", "api", "rest", "git"]
+
+
+def _voraz(phrases, threshold=88):
+    canon = []
+    for c in phrases:
+        if not canon:
+            canon.append(c)
+            continue
+        m = process.extractOne(c, canon, scorer=fuzz.token_set_ratio)
+        if not m or m[1] < threshold:
+            canon.append(c)
+    return canon
+
+
+def _frases(n: int, semilla: int) -> list:
+    rng = random.Random(semilla)
+    frases = []
+    for _ in range(n):
+        frase = " ".join(rng.sample(PALABRAS, rng.randint(1, 4)))
+        if rng.random() < 0.2:  # variantes de escritura
+            i = rng.randrange(len(frase))
+            frase = frase[:i] + frase[i + 1:]
+        frases.append(frase.strip() or "x")
+    return frases
+
+
+@pytest.mark.parametrize("semilla", range(5))
+@pytest.mark.parametrize("bloque", [0, 1000])  # 0 = siempre con bloqueo; 1000 = una sola matriz cdist
+def test_misma_salida_que_el_voraz(semilla, bloque):
+    frases = _frases(300, semilla)
+    assert dedup_phrases(frases, bloque=bloque) == _voraz(frases)
+
+
+@pytest.mark.parametrize("threshold", [70, 88, 95])
+def test_bloqueo_no_pierde_pares_similares(threshold):
+    frases = list(dict.fromkeys(_frases(200, 42)))
+    pares = {tuple(p) for p in candidate_pairs(frases, threshold).tolist()}
+    sim = process.cdist(frases, frases, scorer=fuzz.token_set_ratio) >= threshold
+    for i, j in zip(*np.nonzero(np.triu(sim, k=1))):
+        assert (i, j) in pares
+
+
+def test_casos_borde():
+    assert dedup_phrases([]) == []
+    assert dedup_phrases(["python"]) == ["python"]
+    assert dedup_phrases(["python", "python", "python django"]) == _voraz(["python", "python", "python django"])
+    assert dedup_phrases(["", "", "sql"]) == _voraz(["", "", "sql"])
@@ -0,0 +1,68 @@
+"""
+Cliente del servidor de modelos (utils.model_server): un servidor colgado no
+bloquea al worker, que pasa al respaldo local.
+Se corre desde la raíz del repo: `python -m pytest tests`.
+"""
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import threading
+import time
+from multiprocessing.connection import Listener
+
+import pytest
+
+from utils.model_server import ModelClient, ModelServerUnavailable
+
+CLAVE = b"clave-de-prueba"
+
+
+class _Local:
+    def encode(self, sentences, **kwargs):
+        return "local"
+
+
+def _servidor(path: str, responder: bool) -> Listener:
+    listener = Listener(path, family="AF_UNIX", authkey=CLAVE)
+
+    def atender():
+        conn = listener.accept()
+        while True:
+            try:
+                op, args = conn.recv()
+            except EOFError:
+                return
+            if responder:
+                conn.send(("ok", ["remoto"] * len(args[0])))
+
+    threading.Thread(target=atender, daemon=True).start()
+    return listener
+
+
+def test_servidor_colgado_usa_respaldo(tmp_path):
+    listener = _servidor(str(tmp_path / "m.sock"), responder=False)
+    client = ModelClient(str(tmp_path / "m.sock"), CLAVE, timeout_s=0.3)
+    client.embedder.respaldo = _Local
+    t0 = time.monotonic()
+    assert client.embedder.encode(["hola"]) == "local"
+    assert time.monotonic() - t0 < 5
+    assert not client.disponible()
+    listener.close()
+
+
+def test_servidor_colgado_sin_respaldo_falla(tmp_path):
+    listener = _servidor(str(tmp_path / "m.sock"), responder=False)
+    client = ModelClient(str(tmp_path / "m.sock"), CLAVE, timeout_s=0.3)
+    with pytest.raises(ModelServerUnavailable):
+        client.call("encode", ["hola"], {})
+    listener.close()
+
+
+def test_servidor_responde(tmp_path):
+    listener = _servidor(str(tmp_path / "m.sock"), responder=True)
+    client = ModelClient(str(tmp_path / "m.sock"), CLAVE, timeout_s=5)
+    client.embedder.respaldo = _Local
+    assert client.embedder.encode(["a", "b"]) == ["remoto", "remoto"]
+    assert client.disponible()
+    listener.close()
@@ -0,0 +1,47 @@
+"""
+Regresión de la extracción de PDFs en el pool (utils.pdf_extract).
+Se corre desde la raíz del repo: `python -m pytest tests`.
+"""
+import os
+import subprocess
+import sys
+from io import BytesIO
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import pytest
+from pypdf import PdfWriter
+
+from utils.pdf_extract import PDFError, PDFExtractor
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _pdf_en_blanco(paginas: int = 1) -> bytes:
+    writer = PdfWriter()
+    for _ in range(paginas):
+        writer.add_blank_page(width=200, height=200)
+    buf = BytesIO()
+    writer.write(buf)
+    return buf.getvalue()
+
+
+def test_worker_no_importa_utils():
+    # Los procesos del pool importan pdf_worker al deserializar cada tarea
+    codigo = "import sys, pdf_worker; print(sorted(m for m in ('utils', 'spacy', 'sentence_transformers', 'jose') if m in sys.modules))"
+    out = subprocess.run([sys.executable, "-c", codigo], cwd=RAIZ, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
+
+
+def test_extraccion_en_pool():
+    extractor = PDFExtractor(workers=1, timeout_s=60, pages_per_task=2)
+    try:
+        assert extractor.extract(_pdf_en_blanco(5)).strip() == ""
+    finally:
+        extractor.shutdown()
+
+
+def test_rechaza_pdf_demasiado_grande():
+    extractor = PDFExtractor(workers=1, max_bytes=10)
+    with pytest.raises(PDFError):
+        extractor.extract(_pdf_en_blanco())
@@ -0,0 +1,105 @@
+"""
+Cursores de paginación (utils.paginacion) y del ranking por usuario
+(VacanteService.rank_page): todas las páginas salen del mismo snapshot, y si
+cambia entre páginas la respuesta es 410.
+Se corre desde la raíz del repo: `python -m pytest tests`.
+"""
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from services import vacante_service as vs
+from services.vacante_service import VacanteService
+from utils.paginacion import after_id, decode_cursor, encode_cursor, next_id_cursor
+
+
+def test_cursor_ida_y_vuelta():
+    data = {"u": 7, "p": 20, "f": "vivo", "n": 300, "s": "abc"}
+    cursor = encode_cursor(data)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == data
+
+
+@pytest.mark.parametrize("cursor", ["%%%", encode_cursor({"id": 1})[:-2] + "!!", "WzFd"])  # "WzFd" = [1]
+def test_cursor_mal_formado_da_400(cursor):
+    with pytest.raises(HTTPException) as e:
+        decode_cursor(cursor)
+    assert e.value.status_code == 400
+
+
+def test_cursor_por_id():
+    items = [SimpleNamespace(id=i) for i in (3, 5, 9)]
+    assert next_id_cursor(items, 4) is None
+    assert after_id(next_id_cursor(items, 3)) == 9
+    assert after_id(None) is None
+
+
+class _Estado:
+    """Estado falso de la base: lo que rank_page usa para la huella del snapshot."""
+
+    def __init__(self, monkeypatch):
+        self.cv = SimpleNamespace(updated_at="2026-01-01")
+        self.stamp = (10, 1)
+        self.planes = []
+        monkeypatch.setattr(vs.CVFeaturesDAO, "get_by_usuario", lambda db, u: self.cv)
+        monkeypatch.setattr(vs.VacanteFeaturesDAO, "get_stamp", lambda db: self.stamp)
+        monkeypatch.setattr(vs.RecomendacionDAO, "get_stamp", lambda db, u: None)
+        monkeypatch.setattr(vs.ContadorCambiosDAO, "get", lambda db, tabla: 0)
+        monkeypatch.setattr(VacanteService, "_ranking", self._ranking)
+
+    def _ranking(self, db, usuario_id, topk=100, offset=0, campos=None, plan=None, **opciones):
+        self.planes.append(plan)
+        plan = plan or {"f": "vivo", "n": 300}
+        return [SimpleNamespace(id=offset + i) for i in range(topk)], plan
+
+
+def test_paginas_reusan_el_plan_de_la_primera(monkeypatch):
+    estado = _Estado(monkeypatch)
+    pagina, cursor = VacanteService.rank_page(None, 7, topk=5)
+    assert [v.id for v in pagina] == [0, 1, 2, 3, 4]
+    pagina, cursor = VacanteService.rank_page(None, 7, topk=5, cursor=cursor)
+    assert [v.id for v in pagina] == [5, 6, 7, 8, 9]
+    assert estado.planes == [None, {"f": "vivo", "n": 300}]
+    assert decode_cursor(cursor)["p"] == 10
+
+
+@pytest.mark.parametrize("cambio", ["cv", "vacantes", "opciones"])
+def test_snapshot_distinto_da_410(monkeypatch, cambio):
+    estado = _Estado(monkeypatch)
+    _, cursor = VacanteService.rank_page(None, 7, topk=5, modo="precalculado")
+    opciones = {"modo": "precalculado"}
+    if cambio == "cv":
+        estado.cv = SimpleNamespace(updated_at="2026-02-01")
+    elif cambio == "vacantes":
+        estado.stamp = (10, 2)
+    else:
+        opciones = {"modo": "en_vivo"}
+    with pytest.raises(HTTPException) as e:
+        VacanteService.rank_page(None, 7, topk=5, cursor=cursor, **opciones)
+    assert e.value.status_code == 410
+
+
+def test_cursor_de_otro_usuario_o_plan_invalido_da_400(monkeypatch):
+    _Estado(monkeypatch)
+    _, cursor = VacanteService.rank_page(None, 7, topk=5)
+    with pytest.raises(HTTPException) as e:
+        VacanteService.rank_page(None, 8, topk=5, cursor=cursor)
+    assert e.value.status_code == 400
+    alterado = encode_cursor({**decode_cursor(cursor), "n": -1})
+    with pytest.raises(HTTPException) as e:
+        VacanteService.rank_page(None, 7, topk=5, cursor=alterado)
+    assert e.value.status_code == 400
+
+
+def test_plan_alterado_da_410(monkeypatch):
+    _Estado(monkeypatch)
+    _, cursor = VacanteService.rank_page(None, 7, topk=5)
+    alterado = encode_cursor({**decode_cursor(cursor), "f": "rec"})
+    with pytest.raises(HTTPException) as e:
+        VacanteService.rank_page(None, 7, topk=5, cursor=alterado)
+    assert e.value.status_code == 410
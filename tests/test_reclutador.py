@@ -0,0 +1,46 @@
+"""
+Acceso a los candidatos de una vacante: solo matrículas en RECLUTADORES, y la
+respuesta no expone matrícula ni términos del CV.
+Se corre desde la raíz del repo: `python -m pytest tests`.
+"""
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import pytest
+from fastapi import HTTPException
+
+import dependencies
+from models import Usuario
+from schemas.usuario import CandidatoResponse
+
+
+def _usuario(matricula: str) -> Usuario:
+    return Usuario(id=1, nombre="Ana", apellidos="López", matricula=matricula, carrera="TI", cuatrimestre=5)
+
+
+def test_estudiante_no_ve_candidatos(monkeypatch):
+    monkeypatch.setattr(dependencies, "RECLUTADORES", {"R001"})
+    with pytest.raises(HTTPException) as e:
+        dependencies.get_reclutador(_usuario("A123"))
+    assert e.value.status_code == 403
+
+
+def test_sin_reclutadores_configurados_nadie_entra(monkeypatch):
+    monkeypatch.setattr(dependencies, "RECLUTADORES", set())
+    with pytest.raises(HTTPException):
+        dependencies.get_reclutador(_usuario("R001"))
+
+
+def test_reclutador_configurado(monkeypatch):
+    monkeypatch.setattr(dependencies, "RECLUTADORES", {"R001"})
+    assert dependencies.get_reclutador(_usuario("R001")).matricula == "R001"
+
+
+def test_respuesta_sin_matricula_ni_terminos():
+    u = _usuario("A123")
+    u.match_score = 0.9
+    u.match_terms = ["python"]
+    data = CandidatoResponse.model_validate(u).model_dump()
+    assert "matricula" not in data and "match_terms" not in data
+    assert data["match_score"] == 0.9
@@ -0,0 +1,38 @@
+"""
+Plegado difuso del vocabulario de skills (utils.skill_vocab).
+Se corre desde la raíz del repo: `python -m pytest tests`.
+"""
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from utils.skill_vocab import SkillVocab
+
+
+def _vocab(*nombres: str) -> SkillVocab:
+    vocab = SkillVocab()
+    for i, nombre in enumerate(nombres, start=1):
+        vocab.add_skill(i, nombre)
+    return vocab
+
+
+def test_frases_con_mas_palabras_no_se_pliegan():
+    vocab = _vocab("python")
+    assert vocab.resolve("python django") == (None, False)
+    assert vocab.resolve("machine learning python") == (None, False)
+
+
+def test_no_depende_del_orden_de_registro():
+    a = _vocab("python", "python django")
+    b = _vocab("python django", "python")
+    for frase in ("python", "python django", "django python", "python flask"):
+        sid_a, _ = a.resolve(frase)
+        sid_b, _ = b.resolve(frase)
+        assert a.names.get(sid_a) == b.names.get(sid_b)
+
+
+def test_variantes_de_escritura_se_pliegan():
+    vocab = _vocab("machine learning")
+    assert vocab.resolve("machine learnin") == (1, True)
+    assert vocab.resolve("learning machine") == (1, True)
+    assert vocab.resolve("machine learning") == (1, False)
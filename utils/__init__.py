@@ -15,13 +15,24 @@ from .cv_matcher import (
     normalize_skill,
     is_good_phrase,
     keyphrases_spacy,
+    keyphrases_spacy_many,
     keyphrases_rake,
     dedup_fuzzy,
     mine_skills,
+    mine_skills_many,
     extract_jd_terms,
+    extract_jd_terms_many,
+    batch_overlap,
+    id_overlap,
+    hit_terms,
     pretty_overlap,
     prepare_index,
     overlap_score,
+    cosine_scores,
+    encode_cached,
+    hybrid_signals,
+    fuse_signals,
+    fuse_signals_batch,
     hybrid_rank,
     save_index,
     load_index,
@@ -29,6 +40,19 @@ from .cv_matcher import (
     build_vacante_index
 )
 
+from .feature_index import FeatureIndex, get_vacante_index, get_cv_index
+from .skill_vocab import SkillVocab, get_skill_vocab
+from .signal_cache import SignalCache, get_signal_cache
+from .emb_store import matrix_key, share_matrix, write_matrix
+from .model_server import ModelClient, get_model_client
+from .micro_batch import EncodeBatcher, get_encode_batcher, encode_batcher_stats
+from .feature_cache import FeatureCache, get_feature_cache, content_key
+from .fuzzy_dedup import dedup_phrases, candidate_pairs
+from .pdf_extract import PDFError, PDFExtractor, get_pdf_extractor, extract_pdf_text, pdf_stats
+from .paginacion import CURSOR_HEADER, encode_cursor, decode_cursor, after_id, next_id_cursor
+from .proyeccion import parse_campos
+from .facetas import FACETAS, parse_filtros
+
 __all__ = [
     "verify_password",
     "get_password_hash",
@@ -40,16 +64,60 @@ __all__ = [
     "normalize_skill",
     "is_good_phrase",
     "keyphrases_spacy",
+    "keyphrases_spacy_many",
     "keyphrases_rake",
     "dedup_fuzzy",
     "mine_skills",
+    "mine_skills_many",
     "extract_jd_terms",
+    "extract_jd_terms_many",
+    "batch_overlap",
+    "id_overlap",
+    "hit_terms",
     "pretty_overlap",
     "prepare_index",
     "overlap_score",
+    "cosine_scores",
+    "encode_cached",
+    "hybrid_signals",
+    "fuse_signals",
+    "fuse_signals_batch",
     "hybrid_rank",
     "save_index",
     "load_index",
     "read_pdf_text_bytes",
-    "build_vacante_index"
+    "build_vacante_index",
+    "FeatureIndex",
+    "get_vacante_index",
+    "get_cv_index",
+    "SkillVocab",
+    "get_skill_vocab",
+    "SignalCache",
+    "get_signal_cache",
+    "matrix_key",
+    "share_matrix",
+    "write_matrix",
+    "ModelClient",
+    "get_model_client",
+    "EncodeBatcher",
+    "get_encode_batcher",
+    "encode_batcher_stats",
+    "FeatureCache",
+    "get_feature_cache",
+    "content_key",
+    "dedup_phrases",
+    "candidate_pairs",
+    "PDFError",
+    "PDFExtractor",
+    "get_pdf_extractor",
+    "extract_pdf_text",
+    "pdf_stats",
+    "CURSOR_HEADER",
+    "encode_cursor",
+    "decode_cursor",
+    "after_id",
+    "next_id_cursor",
+    "parse_campos",
+    "FACETAS",
+    "parse_filtros",
 ]
@@ -0,0 +1,155 @@
+"""
+BM25 Okapi vectorizado sobre una matriz dispersa CSR.
+
+Misma fórmula (k1, b, epsilon) que `rank_bm25.BM25Okapi`, así que los scores
+son comparables, pero los pesos por documento se precalculan en una matriz
+documentos × vocabulario y puntuar una query es un solo producto
+disperso-denso. Admite altas y bajas de documentos sin reconstruir todo.
+"""
+from collections import Counter
+import numpy as np
+from scipy import sparse
+
+
+class SparseBM25:
+    """BM25 Okapi con vocabulario interno (término -> columna) y pesos en CSR."""
+
+    def __init__(self, corpus=None, k1: float = 1.5, b: float = 0.75, epsilon: float = 0.25):
+        self.k1 = k1
+        self.b = b
+        self.epsilon = epsilon
+        self.vocab: dict[str, int] = {}
+        self._tf = sparse.csr_matrix((0, 0), dtype=np.float32)
+        self._doc_len = np.zeros(0, dtype=np.float32)
+        self._df = np.zeros(0, dtype=np.int64)
+        self._weights = None
+        self._idf = None
+        if corpus:
+            self.add(corpus)
+
+    @property
+    def corpus_size(self) -> int:
+        return self._tf.shape[0]
+
+    def copy(self) -> "SparseBM25":
+        other = SparseBM25(k1=self.k1, b=self.b, epsilon=self.epsilon)
+        other.vocab = dict(self.vocab)
+        other._tf = self._tf.copy()
+        other._doc_len = self._doc_len.copy()
+        other._df = self._df.copy()
+        other._weights, other._idf = self._weights, self._idf
+        return other
+
+    # ---------- mutaciones ----------
+    def add(self, corpus) -> range:
+        """Agrega documentos (listas de tokens) al final; devuelve sus posiciones."""
+        start = self.corpus_size
+        indptr, indices, data, lens = [0], [], [], []
+        for tokens in corpus:
+            counts = Counter(tokens)
+            for term, c in counts.items():
+                col = self.vocab.get(term)
+                if col is None:
+                    col = self.vocab[term] = len(self.vocab)
+                indices.append(col)
+                data.append(c)
+            indptr.append(len(indices))
+            lens.append(len(tokens))
+
+        n_vocab = len(self.vocab)
+        block = sparse.csr_matrix(
+            (np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int64), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(lens), n_vocab),
+        )
+        tf = self._tf
+        if tf.shape[1] != n_vocab:
+            tf = sparse.csr_matrix((tf.data, tf.indices, tf.indptr), shape=(tf.shape[0], n_vocab))
+        self._tf = sparse.vstack([tf, block], format="csr")
+        self._doc_len = np.concatenate([self._doc_len, np.asarray(lens, dtype=np.float32)])
+        self._df = np.concatenate([self._df, np.zeros(n_vocab - len(self._df), dtype=np.int64)])
+        self._df += np.bincount(block.indices, minlength=n_vocab)
+        self._weights = None
+        return range(start, self.corpus_size)
+
+    def remove(self, positions):
+        """Quita documentos por posición; los posteriores se recorren hacia arriba."""
+        positions = np.asarray(sorted(set(positions)), dtype=np.int64)
+        if positions.size == 0:
+            return
+        keep = np.ones(self.corpus_size, dtype=bool)
+        keep[positions] = False
+        removed = self._tf[positions]
+        self._df -= np.bincount(removed.indices, minlength=len(self._df))
+        self._tf = self._tf[keep]
+        self._doc_len = self._doc_len[keep]
+        self._weights = None
+
+    def reorder(self, order):
+        """Reordena los documentos: el nuevo documento i es el antiguo order[i]."""
+        order = np.asarray(order, dtype=np.int64)
+        self._tf = self._tf[order]
+        self._doc_len = self._doc_len[order]
+        if self._weights is not None:
+            self._weights = self._weights[order]
+
+    # ---------- scoring ----------
+    def prepare(self):
+        """Recalcula idf y la matriz de pesos (se hace solo tras una mutación)."""
+        if self._weights is not None:
+            return
+        n = self.corpus_size
+        avgdl = float(self._doc_len.sum()) / n if n else 0.0
+
+        present = self._df > 0
+        idf = np.zeros(len(self._df), dtype=np.float64)
+        idf[present] = np.log(n - self._df[present] + 0.5) - np.log(self._df[present] + 0.5)
+        if present.any():
+            average_idf = idf[present].sum() / present.sum()
+            idf[present & (idf < 0)] = self.epsilon * average_idf
+        self._idf = idf
+
+        tf = self._tf
+        if avgdl > 0:
+            row_len = np.repeat(self._doc_len, np.diff(tf.indptr))
+            denom = tf.data + self.k1 * (1 - self.b + self.b * row_len / avgdl)
+            data = tf.data * (self.k1 + 1) / denom
+        else:
+            data = np.zeros_like(tf.data)
+        self._weights = sparse.csr_matrix((data, tf.indices, tf.indptr), shape=tf.shape)
+
+    def _query_vector(self, query) -> np.ndarray:
+        q = np.zeros(len(self.vocab), dtype=np.float64)
+        for term in query:
+            col = self.vocab.get(term)
+            if col is not None:
+                q[col] += 1.0
+        return q * self._idf
+
+    def get_scores(self, query) -> np.ndarray:
+        self.prepare()
+        if self.corpus_size == 0:
+            return np.zeros(0)
+        return self._weights @ self._query_vector(query)
+
+    def get_scores_many(self, queries) -> np.ndarray:
+        """Scores de varias queries a la vez (n_queries × n_docs): un producto disperso-disperso."""
+        self.prepare()
+        rows, cols = [], []
+        for r, query in enumerate(queries):
+            for term in query:
+                col = self.vocab.get(term)
+                if col is not None:
+                    rows.append(r)
+                    cols.append(col)
+        q = sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, cols)), shape=(len(queries), len(self.vocab))
+        )  # los términos repetidos se suman, igual que en get_scores
+        q = q @ sparse.diags(self._idf)
+        return np.asarray((q @ self._weights.T).todense())
+
+    def get_batch_scores(self, query, doc_ids) -> np.ndarray:
+        self.prepare()
+        doc_ids = np.asarray(doc_ids, dtype=np.int64)
+        if doc_ids.size == 0:
+            return np.zeros(0)
+        return self._weights[doc_ids] @ self._query_vector(query)
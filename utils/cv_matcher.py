@@ -1,4 +1,4 @@
-import re, pickle, numpy as np
+import os, re, pickle, numpy as np
 import nltk
 from pathlib import Path
 from unidecode import unidecode
@@ -7,34 +7,155 @@ from pdfminer.high_level import extract_text as pdfminer_text
 from rake_nltk import Rake
 from rapidfuzz import process, fuzz
 import spacy
-from rank_bm25 import BM25Okapi
+from scipy import sparse
+from utils.bm25 import SparseBM25
 from sentence_transformers import SentenceTransformer, util
 from io import BytesIO
-
+from utils.model_server import MODEL_SERVER_SOCKET, ModelServerUnavailable, get_model_client
+from utils.micro_batch import ENCODE_BATCH_MAX, get_encode_batcher
+from utils.feature_cache import get_feature_cache, content_key
+from utils.fuzzy_dedup import dedup_phrases
+from utils.pdf_extract import extract_pdf_text
+
+# Con MODEL_SERVER_SOCKET los modelos viven en utils.model_server y aquí solo
+# se usa el cliente; get_nlp/load_embedder cargan el modelo en el proceso actual.
 _nlp = None
 
+# keyphrases_spacy solo usa noun_chunks (parser + morphologizer): NER y lematizador sobran
+NLP_DISABLE = ["ner", "lemmatizer"]
+SPACY_BATCH_SIZE = int(os.getenv("SPACY_BATCH_SIZE", "64"))
+SPACY_N_PROCESS = int(os.getenv("SPACY_N_PROCESS", "1"))
+
 def get_nlp():
     global _nlp
     if _nlp is None:
         import spacy
         try:
-            _nlp = spacy.load("es_core_news_sm")
+            _nlp = spacy.load(NLP_MODEL_NAME, disable=NLP_DISABLE)
         except OSError:
             import spacy.cli
-            spacy.cli.download("es_core_news_sm")
-            _nlp = spacy.load("es_core_news_sm")
+            spacy.cli.download(NLP_MODEL_NAME)
+            _nlp = spacy.load(NLP_MODEL_NAME, disable=NLP_DISABLE)
     return _nlp
 
 _EMB = None
+EMB_MODEL_NAME = "paraphrase-multilingual-MiniLM-L12-v2"
+NLP_MODEL_NAME = "es_core_news_sm"
+
+# Backend del encoder: torch | onnx | onnx-int8 (los ONNX requieren `pip install "sentence-transformers[onnx]"`)
+EMB_BACKEND = os.getenv("EMB_BACKEND", "torch")
+# Instrucciones objetivo de la cuantización int8: avx2 | avx512 | avx512_vnni | arm64
+EMB_ONNX_QUANT = os.getenv("EMB_ONNX_QUANT", "avx2")
+# Dónde se exporta el modelo ONNX cuantizado (se genera una sola vez)
+EMB_ONNX_DIR = os.getenv("EMB_ONNX_DIR", "modelos/minilm-onnx")
+
+def backend_disponible(backend: str) -> str:
+    """Backend que de verdad se carga: los ONNX caen a torch si no hay onnxruntime."""
+    if backend in ("onnx", "onnx-int8"):
+        try:
+            import onnxruntime  # noqa: F401
+        except ImportError:
+            return "torch"
+    return backend
+
+# Los embeddings de cada backend difieren un poco: la caché por contenido los
+# separa, con la etiqueta del backend cargado (no la pedida)
+EMB_MODEL_KEY = f"{EMB_MODEL_NAME}:{backend_disponible(EMB_BACKEND)}"
+
+def load_embedder_backend(backend: str = "torch"):
+    """Carga el SentenceTransformer con el backend pedido (sin cachearlo)."""
+    from sentence_transformers import SentenceTransformer
+    if backend not in ("torch", "onnx", "onnx-int8"):
+        raise ValueError(f"EMB_BACKEND desconocido: {backend}")
+    if backend_disponible(backend) != backend:
+        print(f"⚠️ EMB_BACKEND={backend} requiere onnxruntime (sentence-transformers[onnx]); se usa torch")
+        backend = "torch"
+    if backend == "torch":
+        # modelo mucho más ligero que e5-large
+        return SentenceTransformer(EMB_MODEL_NAME)
+    if backend == "onnx":
+        return SentenceTransformer(EMB_MODEL_NAME, backend="onnx")
 
-def get_embedder():
+    file_name = f"onnx/model_qint8_{EMB_ONNX_QUANT}.onnx"
+    local = Path(EMB_ONNX_DIR)
+    if not (local / file_name).exists():
+        _export_onnx_int8(local, file_name)
+    return SentenceTransformer(str(local), backend="onnx", model_kwargs={"file_name": file_name})
+
+def _export_onnx_int8(local: Path, file_name: str):
+    """
+    Exporta el modelo cuantizado a una carpeta temporal y la publica con un
+    rename, bajo un lock de archivo: varios workers que arrancan a la vez
+    exportan una sola vez y nadie carga una exportación a medias.
+    """
+    import fcntl
+    import shutil
+    import tempfile
+    from sentence_transformers import export_dynamic_quantized_onnx_model
+    local.parent.mkdir(parents=True, exist_ok=True)
+    with open(local.parent / f".{local.name}.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        if (local / file_name).exists():
+            return  # la exportó otro proceso mientras esperábamos
+        print(f"📦 Exportando {EMB_MODEL_NAME} a ONNX int8 ({EMB_ONNX_QUANT}) en {local}")
+        tmp = Path(tempfile.mkdtemp(prefix=f".{local.name}-", dir=local.parent))
+        try:
+            model = SentenceTransformer(EMB_MODEL_NAME, backend="onnx")
+            model.save(str(tmp))
+            export_dynamic_quantized_onnx_model(model, EMB_ONNX_QUANT, str(tmp))
+            if local.exists():
+                shutil.rmtree(local)  # exportación incompleta de una versión anterior
+            os.replace(tmp, local)
+        finally:
+            if tmp.exists():
+                shutil.rmtree(tmp, ignore_errors=True)
+
+def load_embedder():
     global _EMB
     if _EMB is None:
-        from sentence_transformers import SentenceTransformer
-        # modelo mucho más ligero que e5-large
-        _EMB = SentenceTransformer("paraphrase-multilingual-MiniLM-L12-v2")
+        _EMB = load_embedder_backend(EMB_BACKEND)
     return _EMB
 
+def get_embedder():
+    """
+    Embedder para los callers: cliente remoto (con el modelo local de respaldo si
+    el servidor no responde), o el modelo local con micro-batching.
+    """
+    if MODEL_SERVER_SOCKET:
+        embedder = get_model_client().embedder
+        if embedder.respaldo is None:
+            embedder.respaldo = _local_embedder
+        return embedder
+    return _local_embedder()
+
+def _local_embedder():
+    if ENCODE_BATCH_MAX > 1:
+        return get_encode_batcher(load_embedder())
+    return load_embedder()
+
+def encode_cached(texts, normalize_embeddings: bool = False) -> np.ndarray:
+    """
+    Como `get_embedder().encode` pero vía la caché por contenido: solo se
+    codifican (en una llamada) los textos que no estaban en caché.
+    """
+    single = isinstance(texts, str)
+    texts = [texts] if single else list(texts)
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+    cache = get_feature_cache()
+    kind = "emb-norm" if normalize_embeddings else "emb"
+    keys = [content_key(kind, t, EMB_MODEL_KEY) for t in texts]
+    out = [cache.get(k) for k in keys]
+    miss = [i for i, e in enumerate(out) if e is None]
+    if miss:
+        embs = get_embedder().encode([texts[i] for i in miss], normalize_embeddings=normalize_embeddings)
+        for i, e in zip(miss, np.asarray(embs, dtype=np.float32)):
+            e = e.copy()  # la fila sola, no una vista que retenga todo el lote en el LRU
+            cache.put(keys[i], e)
+            out[i] = e
+    embs = np.vstack(out)
+    return embs[0] if single else embs
+
 SEC_PATTERNS = [
     (r'(?im)^(experiencia|laboral|trayectoria)\b', 'experiencia'),
     (r'(?im)^(educaci[oó]n|estudios|formaci[oó]n)\b', 'educacion'),
@@ -131,8 +252,41 @@ def is_good_phrase(p: str) -> bool:
     return True
 
 def keyphrases_spacy(text: str):
-    nlp = get_nlp()
-    doc = nlp(text)
+    return keyphrases_spacy_many([text], n_process=1)[0]
+
+def keyphrases_spacy_many(texts, batch_size=SPACY_BATCH_SIZE, n_process=SPACY_N_PROCESS):
+    """
+    keyphrases_spacy para muchos textos: los que no están en la caché por
+    contenido pasan juntos por `nlp.pipe` (o por el servidor de modelos).
+    """
+    texts = list(texts)
+    cache = get_feature_cache()
+    keys = [content_key("spacy", t, NLP_MODEL_NAME) for t in texts]
+    out = [cache.get(k) for k in keys]
+    miss = [i for i, v in enumerate(out) if v is None]
+    if miss:
+        pending = [texts[i] for i in miss]
+        res = None
+        if MODEL_SERVER_SOCKET and get_model_client().disponible():
+            try:
+                res = get_model_client().keyphrases_spacy_many(pending)
+            except ModelServerUnavailable:
+                res = None  # respaldo local
+        if res is None:
+            res = keyphrases_spacy_many_local(pending, batch_size, n_process)
+        for i, v in zip(miss, res):
+            cache.put(keys[i], v)
+            out[i] = v
+    return [list(v) for v in out]
+
+def keyphrases_spacy_many_local(texts, batch_size=SPACY_BATCH_SIZE, n_process=1):
+    docs = get_nlp().pipe(texts, batch_size=batch_size, n_process=n_process)
+    return [_doc_phrases(doc, t) for t, doc in zip(texts, docs)]
+
+def keyphrases_spacy_local(text: str):
+    return _doc_phrases(get_nlp()(text), text)
+
+def _doc_phrases(doc, text: str):
     cands = set()
     for ch in doc.noun_chunks:
         p = normalize_skill(ch.text)
@@ -143,6 +297,9 @@ def keyphrases_spacy(text: str):
     return list(cands)
 
 def keyphrases_rake(text: str):
+    return list(get_feature_cache().get_or_compute("rake", text, lambda: _keyphrases_rake(text)))
+
+def _keyphrases_rake(text: str):
     r = Rake(language='spanish'); r.extract_keywords_from_text(text)
     out=[]
     for score, phrase in r.get_ranked_phrases_with_scores():
@@ -151,34 +308,109 @@ def keyphrases_rake(text: str):
     return out
 
 def dedup_fuzzy(phrases, threshold=88):
-    canon=[]
-    for c in phrases:
-        if not canon: canon.append(c); continue
-        m = process.extractOne(c, canon, scorer=fuzz.token_set_ratio)
-        if not m or m[1] < threshold: canon.append(c)
-    return canon
+    phrases = list(phrases)
+    return list(get_feature_cache().get_or_compute(
+        f"dedup-{threshold}", "\n".join(phrases), lambda: _dedup_fuzzy(phrases, threshold)
+    ))
 
-def mine_skills(blocks):
+def _dedup_fuzzy(phrases, threshold=88):
+    # mismo resultado que la pasada voraz con extractOne, con bloqueo + cpdist en lote
+    return dedup_phrases(phrases, threshold)
+
+def _skills_text(blocks):
     weighted = []
     for b in blocks:
         # usa enteros 2/2/1 como refuerzo real de texto
         w = 2 if b["title"] == "habilidades" else 2 if b["title"] == "experiencia" else 1
         if b["text"]:
             weighted.append((b["text"] + "\n") * w)
-    txt = "\n".join(weighted)
-    merged = dedup_fuzzy(list(set(keyphrases_spacy(txt) + keyphrases_rake(txt))))
+    return "\n".join(weighted)
+
+def _merge_skills(txt, spacy_terms):
+    merged = dedup_fuzzy(list(set(spacy_terms + keyphrases_rake(txt))))
     merged = [p for p in merged if p not in BANWORDS and is_good_phrase(p)]
     return merged[:200]
 
+def mine_skills(blocks):
+    txt = _skills_text(blocks)
+    return _merge_skills(txt, keyphrases_spacy(txt))
+
+def mine_skills_many(blocks_list, n_process=SPACY_N_PROCESS):
+    """mine_skills para varios CVs con una sola pasada de nlp.pipe."""
+    txts = [_skills_text(blocks) for blocks in blocks_list]
+    return [_merge_skills(t, s) for t, s in zip(txts, keyphrases_spacy_many(txts, n_process=n_process))]
+
 def extract_jd_terms(jd_text: str):
     return dedup_fuzzy(list(set(keyphrases_spacy(jd_text) + keyphrases_rake(jd_text))))
 
+def extract_jd_terms_many(jd_texts, n_process=SPACY_N_PROCESS):
+    """extract_jd_terms para varias vacantes con una sola pasada de nlp.pipe."""
+    jd_texts = list(jd_texts)
+    spacy_terms = keyphrases_spacy_many(jd_texts, n_process=n_process)
+    return [dedup_fuzzy(list(set(s + keyphrases_rake(t)))) for t, s in zip(jd_texts, spacy_terms)]
+
+def _hits_matrix(rows, cols, shape) -> sparse.csc_matrix:
+    """Matriz booleana dispersa skills × vacantes (CSC: las columnas se leen en hit_terms)."""
+    data = np.ones(len(rows), dtype=bool)
+    hits = sparse.csc_matrix((data, (np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64))),
+                             shape=shape, dtype=bool)
+    hits.sum_duplicates()
+    return hits
+
+def _weighted_hits(cv_names, hits) -> np.ndarray:
+    weights = np.array([1.0 if " " in s else 0.6 for s in cv_names])
+    if hits.shape[0] == 0:
+        return np.zeros(hits.shape[1])
+    return np.asarray(hits.T.astype(np.float64) @ weights).ravel()
+
+def batch_overlap(cv_terms, jd_terms_list, threshold=90, chunk=20_000):
+    """
+    Overlap de las skills del CV contra los términos de TODAS las vacantes en una
+    sola pasada: una matriz skills × términos con `process.cdist` (multi-hilo),
+    umbralizada y reducida por vacante.
+    Devuelve (scores, hits); hits (disperso) [s, v] indica que la skill s aparece en la vacante v.
+    """
+    cv_terms = list(cv_terms or [])
+    n = len(jd_terms_list)
+    if not cv_terms or n == 0:
+        return np.zeros(n), _hits_matrix([], [], (len(cv_terms), n))
+
+    lens = np.fromiter((len(t) for t in jd_terms_list), dtype=np.int64, count=n)
+    owner = np.repeat(np.arange(n), lens)
+    flat = [t for terms in jd_terms_list for t in terms]
+    rows, cols = [], []
+    for start in range(0, len(flat), chunk):
+        m = process.cdist(cv_terms, flat[start:start + chunk], scorer=fuzz.token_set_ratio,
+                          score_cutoff=threshold, workers=-1)
+        s_idx, t_idx = np.nonzero(m)
+        rows.append(s_idx)
+        cols.append(owner[start + t_idx])
+
+    if not rows:
+        # Ninguna vacante tiene términos: sin hits (np.concatenate no acepta una lista vacía)
+        return np.zeros(n), _hits_matrix([], [], (len(cv_terms), n))
+    hits = _hits_matrix(np.concatenate(rows), np.concatenate(cols), (len(cv_terms), n))
+    return _weighted_hits(cv_terms, hits), hits
+
+def id_overlap(cv_ids, cv_names, term_matrix):
+    """
+    Overlap con skills ya convertidas a IDs canónicos: intersección de enteros
+    como producto disperso contra la matriz binaria vacantes × skills.
+    Mismo formato de salida que batch_overlap (cv_names alineado con cv_ids).
+    """
+    cols = np.asarray(list(cv_ids or []), dtype=np.int64)
+    valid = np.flatnonzero(cols < term_matrix.shape[1])
+    sub = term_matrix[:, cols[valid]].T.tocoo()
+    hits = _hits_matrix(valid[sub.row], sub.col, (len(cols), term_matrix.shape[0]))
+    return _weighted_hits(cv_names, hits), hits
+
+def hit_terms(cv_terms, hits, col, top=10):
+    """Skills del CV que hicieron match en la columna `col` de `hits` (orden del CV)."""
+    return [cv_terms[s] for s in hits.indices[hits.indptr[col]:hits.indptr[col + 1]][:top]]
+
 def pretty_overlap(cv_terms, jd_terms, top=10):
-    hits=[]
-    for s in cv_terms:
-        m = process.extractOne(s, jd_terms, scorer=fuzz.token_set_ratio)
-        if m and m[1] >= 90: hits.append(s)
-    return hits[:top]
+    _, hits = batch_overlap(cv_terms, [jd_terms])
+    return hit_terms(list(cv_terms or []), hits, 0, top)
 
 # ---------- embeddings / índice ----------
 def prepare_index(cvs):
@@ -190,31 +422,78 @@ def prepare_index(cvs):
             parts.append((b["text"]+"\n")*int(w))
         texts.append("\n".join(parts))
 
-    bm25 = BM25Okapi([t.lower().split() for t in texts])
-    EMB = get_embedder()
-    embs = EMB.encode([f"passage: {t}" for t in texts], normalize_embeddings=True)
+    bm25 = SparseBM25([t.lower().split() for t in texts])
+    embs = encode_cached([f"passage: {t}" for t in texts], normalize_embeddings=True)
     return {"bm25": bm25, "embs": embs, "texts": texts}
 
 def overlap_score(cv_terms, jd_terms):
-    scr = 0.0
-    for s in cv_terms:
-        m = process.extractOne(s, jd_terms, scorer=fuzz.token_set_ratio)
-        if m and m[1] >= 90:
-            scr += 1.0 if " " in s else 0.6
-    return scr
+    scores, _ = batch_overlap(cv_terms, [jd_terms])
+    return float(scores[0])
 
-def hybrid_rank(jd_text, index, topk=5, alpha=0.5, beta=0.25, gamma=0.25,
-                cv_skill_list=None, jd_terms_list=None):
-    EMB = get_embedder()
-    q_emb = EMB.encode(f"query: {jd_text}", normalize_embeddings=True)
-    cos = util.cos_sim(q_emb, index["embs"]).cpu().numpy().ravel()
-    bm  = index["bm25"].get_scores(jd_text.lower().split())
+def cosine_scores(q_emb, embs):
+    """Coseno contra una matriz de embeddings con filas ya normalizadas: un solo producto matriz-vector."""
+    q = np.asarray(q_emb, dtype=np.float32).ravel()
+    n = np.linalg.norm(q)
+    return embs @ (q / n if n else q)
+
+def hybrid_signals(jd_text, index, cv_skill_list=None, jd_terms_list=None, q_emb=None, candidates=None,
+                   cv_skill_ids=None):
+    """
+    Calcula las señales crudas (coseno, BM25, overlap) sin fusionarlas.
+    Con `cv_skill_ids` y un índice con "term_matrix" el overlap se hace por IDs
+    (cv_skill_list debe traer los nombres canónicos de esos IDs).
+    Si se pasa `q_emb` (p.ej. el embedding guardado en cv_features) no se hace
+    inferencia: el coseno sale directo de la matriz del índice.
+    Con `candidates` (posiciones dentro del índice) solo se puntúan esas filas;
+    `pos` mapea cada columna de las señales a su posición en el índice.
+    """
+    embs = index["embs"]
+    pos = np.arange(len(embs)) if candidates is None else np.asarray(candidates, dtype=int)
+    if candidates is not None:
+        embs = embs[pos]
+        if jd_terms_list is not None:
+            jd_terms_list = [jd_terms_list[i] for i in pos]
+
+    skills = list(cv_skill_list or [])
+    sig = {"pos": pos, "skills": skills, "cos": np.zeros(len(pos)), "bm": np.zeros(len(pos)),
+           "ol": None, "hits": _hits_matrix([], [], (len(skills), len(pos)))}
+    if len(pos) == 0:
+        return sig
+
+    if q_emb is None:
+        q_emb = encode_cached(f"query: {jd_text}", normalize_embeddings=True)
+        sig["cos"] = util.cos_sim(q_emb, embs).cpu().numpy().ravel()
+    else:
+        sig["cos"] = cosine_scores(q_emb, embs)
+    tokens = jd_text.lower().split()
+    if candidates is None:
+        sig["bm"] = index["bm25"].get_scores(tokens)
+    else:
+        sig["bm"] = np.asarray(index["bm25"].get_batch_scores(tokens, pos.tolist()), dtype=float)
+
+    term_matrix = index.get("term_matrix")
+    if cv_skill_ids is not None and term_matrix is not None:
+        if candidates is not None:
+            term_matrix = term_matrix[pos]
+        sig["ol"], sig["hits"] = id_overlap(cv_skill_ids, skills, term_matrix)
+    elif cv_skill_list is not None and jd_terms_list is not None:
+        sig["ol"], sig["hits"] = batch_overlap(skills, jd_terms_list)
+    return sig
+
+def fuse_signals(sig, topk=5, alpha=0.5, beta=0.25, gamma=0.25):
+    """
+    Normaliza y fusiona las señales. Devuelve índices LOCALES a las señales
+    (usar sig["pos"][order] para posiciones del índice) y los scores del top.
+    """
+    cos, bm = sig["cos"], sig["bm"]
+    if len(cos) == 0:
+        empty = np.zeros(0)
+        return np.zeros(0, dtype=int), empty, empty, empty, empty
 
     ol = np.zeros_like(cos)
-    if cv_skill_list is not None and jd_terms_list is not None:
-        ol_raw = np.array([overlap_score(cv_skill_list, terms) for terms in jd_terms_list], dtype=float)
-        if ol_raw.max() > 0:
-            ol = (ol_raw - ol_raw.min()) / (ol_raw.max() - ol_raw.min() + 1e-9)
+    ol_raw = sig["ol"]
+    if ol_raw is not None and ol_raw.max() > 0:
+        ol = (ol_raw - ol_raw.min()) / (ol_raw.max() - ol_raw.min() + 1e-9)
 
     cos_n = (cos - cos.min()) / (cos.max() - cos.min() + 1e-9)
     bm_n  = (bm  - bm.min())  / (bm.max()  - bm.min()  + 1e-9)
@@ -223,6 +502,36 @@ def hybrid_rank(jd_text, index, topk=5, alpha=0.5, beta=0.25, gamma=0.25,
     order = np.argsort(-final)[:topk]
     return order, final[order], cos[order], bm[order], ol[order]
 
+def fuse_signals_batch(cos, bm, ol, topk=5, alpha=0.5, beta=0.25, gamma=0.25):
+    """
+    fuse_signals por lotes: cada fila de las matrices (queries × documentos) se
+    normaliza y fusiona por separado. `gamma` puede ser un vector por fila.
+    Devuelve (order, final, cos, bm, ol) como matrices queries × topk.
+    """
+    def minmax(m):
+        lo, hi = m.min(axis=1, keepdims=True), m.max(axis=1, keepdims=True)
+        return (m - lo) / (hi - lo + 1e-9)
+
+    ol_n = np.where(ol.max(axis=1, keepdims=True) > 0, minmax(ol), 0.0)
+    gamma = np.asarray(gamma, dtype=float).reshape(-1, 1) if np.ndim(gamma) else gamma
+    final = alpha * minmax(cos) + beta * minmax(bm) + gamma * ol_n
+
+    k = min(topk, final.shape[1])
+    part = np.argpartition(-final, k - 1, axis=1)[:, :k]
+    order = np.take_along_axis(part, np.argsort(-np.take_along_axis(final, part, axis=1), axis=1), axis=1)
+    take = lambda m: np.take_along_axis(m, order, axis=1)
+    return order, take(final), take(cos), take(bm), take(ol_n)
+
+def hybrid_rank(jd_text, index, topk=5, alpha=0.5, beta=0.25, gamma=0.25,
+                cv_skill_list=None, jd_terms_list=None, q_emb=None, candidates=None):
+    """
+    Ranking híbrido en un paso (hybrid_signals + fuse_signals).
+    El `order` devuelto es de posiciones del índice completo.
+    """
+    sig = hybrid_signals(jd_text, index, cv_skill_list, jd_terms_list, q_emb=q_emb, candidates=candidates)
+    order, final, cos, bm, ol = fuse_signals(sig, topk, alpha, beta, gamma)
+    return sig["pos"][order], final, cos, bm, ol
+
 
 # ---------- serialización ----------
 def save_index(path: Path, cvs, index, cv_skill_list):
@@ -236,30 +545,15 @@ def load_index(path: Path):
     return data["cvs"], data["index"], data["cv_skill_list"]
 
 def read_pdf_text_bytes(b: bytes) -> str:
-    """Extrae texto de un PDF en bytes (bytea) sin tocar disco."""
-    try:
-        from pypdf import PdfReader
-        pdf = PdfReader(BytesIO(b))
-        txt = "\n".join(p.extract_text() or "" for p in pdf.pages)
-        if txt.strip():
-            return txt
-    except Exception:
-        pass
-    # fallback: pdfminer
-    from pdfminer.high_level import extract_text_to_fp
-    bio_in, bio_out = BytesIO(b), BytesIO()
-    extract_text_to_fp(bio_in, bio_out)
-    return bio_out.getvalue().decode("utf-8", errors="ignore")
+    """Extrae texto de un PDF en bytes (bytea) sin tocar disco, en el pool con límites (utils.pdf_extract)."""
+    return extract_pdf_text(b)
 
 def build_vacante_index(vacantes: list):
     """
     vacantes: [{"id": str, "text": str}, ...]
     Crea índice híbrido para TODAS las vacantes y también sus 'terms'.
     """
-    jd_terms_list = []
-    for v in vacantes:
-        terms = dedup_fuzzy(list(set(keyphrases_spacy(v["text"]) + keyphrases_rake(v["text"]))))
-        jd_terms_list.append(terms)
+    jd_terms_list = extract_jd_terms_many([v["text"] for v in vacantes])
     # reusa prepare_index, empaquetando cada vacante como un único bloque
     idx = prepare_index([{"blocks":[{"title":"otros","text":v["text"]}]} for v in vacantes])
     return idx, jd_terms_list
\ No newline at end of file
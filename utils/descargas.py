@@ -0,0 +1,53 @@
+"""
+Helpers HTTP para descargas: ETag fuerte, If-None-Match y Range (un solo rango).
+"""
+import re
+from typing import Optional
+from fastapi import HTTPException, status
+
+_RANGE_RE = re.compile(r"^\s*bytes\s*=\s*(\d*)\s*-\s*(\d*)\s*$", re.IGNORECASE)
+
+
+def strong_etag(digest: str, algoritmo: str = "sha256") -> str:
+    """ETag fuerte a partir del hash del contenido."""
+    return f'"{algoritmo}-{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True si el header If-None-Match incluye el ETag (o es `*`)."""
+    if not if_none_match:
+        return False
+    candidatos = [c.strip() for c in if_none_match.split(",")]
+    # If-None-Match usa comparación débil: W/"x" equivale a "x"
+    return "*" in candidatos or etag in (c[2:] if c.startswith("W/") else c for c in candidatos)
+
+
+def parse_range(range_header: Optional[str], size: int) -> Optional[tuple[int, int]]:
+    """
+    Rango pedido como (inicio, fin) inclusivos, o None para enviar todo
+    (sin header, varios rangos o sintaxis que no es de bytes). 416 si no se puede satisfacer.
+    """
+    if not range_header:
+        return None
+    m = _RANGE_RE.match(range_header)
+    if not m or (not m.group(1) and not m.group(2)):
+        return None
+    inicio, fin = m.group(1), m.group(2)
+    if inicio and fin and int(fin) < int(inicio):
+        return None  # rango inválido: se ignora
+    if inicio:
+        inicio = int(inicio)
+        fin = min(int(fin), size - 1) if fin else size - 1
+    else:
+        # bytes=-N: los últimos N bytes
+        sufijo = int(fin)
+        inicio, fin = max(size - sufijo, 0), size - 1
+        if sufijo == 0:
+            inicio = size
+    if inicio >= size or inicio > fin:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Rango no satisfacible",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return inicio, fin
@@ -0,0 +1,125 @@
+"""
+Matrices de embeddings en disco (.npy) mapeadas en memoria de solo lectura.
+
+Cada worker de gunicorn tiene su propio índice en memoria; si además cada uno
+guarda su copia de la matriz de embeddings, la RSS crece con los workers.
+Aquí la matriz se escribe una vez a un archivo `.npy` cuyo nombre es el hash
+de su contenido, y todos los workers la abren con `mmap_mode="r"`: comparten
+el page cache del sistema operativo, y dos matrices distintas nunca caen en el
+mismo archivo. El archivo se escribe a un temporal y se publica con
+`os.replace`, así que nadie lee uno a medias. El directorio es de la
+aplicación (permisos 0700) y solo se usa si pertenece al usuario del proceso
+y nadie más puede escribir en él: un `.npy` plantado por otro usuario se
+mapearía en todos los workers.
+"""
+import glob
+import hashlib
+import os
+import tempfile
+import numpy as np
+
+# Directorio de las matrices compartidas (se crea con 0700); vacío = cada worker en su propia memoria
+EMB_MMAP_DIR = os.getenv("EMB_MMAP_DIR", os.path.join("cache", "emb"))
+# Versiones anteriores que se conservan por índice (otros workers pueden seguir mapeándolas)
+EMB_MMAP_KEEP = int(os.getenv("EMB_MMAP_KEEP", "3"))
+
+
+def _dir_propio() -> bool:
+    """Crea EMB_MMAP_DIR (0700) si falta y comprueba que sea del usuario del proceso y no escribible por otros."""
+    try:
+        os.makedirs(EMB_MMAP_DIR, mode=0o700, exist_ok=True)
+        st = os.stat(EMB_MMAP_DIR)
+    except OSError as e:
+        print(f"⚠️ No se pudo preparar {EMB_MMAP_DIR}: {e}")
+        return False
+    if st.st_uid != os.getuid() or st.st_mode & 0o022:
+        print(f"⚠️ {EMB_MMAP_DIR} no es del usuario del proceso o lo pueden escribir otros; no se comparten matrices")
+        return False
+    return True
+
+
+def _propio(path: str) -> bool:
+    return os.stat(path).st_uid == os.getuid()
+
+
+def _hasher(shape: tuple):
+    return hashlib.sha1(repr(tuple(shape)).encode())
+
+
+def matrix_key(matriz: np.ndarray) -> str:
+    """Hash del contenido (forma + bytes float32) de la matriz."""
+    h = _hasher(matriz.shape)
+    h.update(np.ascontiguousarray(matriz, dtype=np.float32).data)
+    return h.hexdigest()[:20]
+
+
+def share_matrix(nombre: str, matriz: np.ndarray) -> np.ndarray:
+    """
+    Devuelve la matriz mapeada desde `<EMB_MMAP_DIR>/<nombre>-<hash>.npy`.
+    Si el archivo ya existe (lo escribió otro worker con el mismo contenido)
+    solo se mapea; si no, se escribe de forma atómica. Ante cualquier error se
+    devuelve `matriz` tal cual.
+    """
+    if not EMB_MMAP_DIR or matriz.size == 0 or not _dir_propio():
+        return matriz
+    path = os.path.join(EMB_MMAP_DIR, f"{nombre}-{matrix_key(matriz)}.npy")
+    try:
+        try:
+            mapped = np.load(path, mmap_mode="r") if _propio(path) else None
+            if mapped is not None and mapped.shape == matriz.shape:
+                os.utime(path)  # en uso: que _prune no la tome por vieja
+                return mapped
+        except (FileNotFoundError, ValueError):
+            pass
+        mapped = write_matrix(nombre, matriz.shape, [matriz])
+        return matriz if mapped is None else mapped
+    except OSError as e:
+        print(f"⚠️ No se pudo compartir la matriz {nombre}: {e}")
+        return matriz
+
+
+def write_matrix(nombre: str, shape: tuple, bloques) -> np.ndarray | None:
+    """
+    Escribe una matriz float32 de forma `shape` directo a un `.npy` nuevo a partir
+    de `bloques` (arreglos de filas consecutivas, en orden), sin armarla antes en
+    memoria, y la devuelve mapeada. None si no hay directorio o falla la escritura.
+    """
+    if not EMB_MMAP_DIR or 0 in shape or not _dir_propio():
+        return None
+    try:
+        fd, tmp = tempfile.mkstemp(prefix=f"{nombre}-", suffix=".tmp", dir=EMB_MMAP_DIR)
+        os.close(fd)
+        try:
+            out = np.lib.format.open_memmap(tmp, mode="w+", dtype=np.float32, shape=tuple(shape))
+            h = _hasher(shape)
+            fila = 0
+            for bloque in bloques:
+                bloque = np.ascontiguousarray(bloque, dtype=np.float32)
+                out[fila:fila + len(bloque)] = bloque
+                h.update(bloque.data)
+                fila += len(bloque)
+            if fila != shape[0]:
+                raise ValueError(f"se escribieron {fila} filas de {shape[0]}")
+            out.flush()
+            del out
+            path = os.path.join(EMB_MMAP_DIR, f"{nombre}-{h.hexdigest()[:20]}.npy")
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        _prune(nombre, keep=path)
+        return np.load(path, mmap_mode="r")
+    except (OSError, ValueError) as e:
+        print(f"⚠️ No se pudo escribir la matriz {nombre}: {e}")
+        return None
+
+
+def _prune(nombre: str, keep: str):
+    """Borra versiones viejas; en Linux los mapeos abiertos siguen siendo válidos."""
+    files = sorted(glob.glob(os.path.join(EMB_MMAP_DIR, f"{nombre}-*.npy")), key=os.path.getmtime, reverse=True)
+    for old in [f for f in files if f != keep][max(EMB_MMAP_KEEP - 1, 0):]:
+        try:
+            os.remove(old)
+        except OSError:
+            pass
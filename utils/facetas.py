@@ -0,0 +1,45 @@
+"""
+Filtros por facetas de vacantes (ciudad, estado, modalidad, tipo de empleo, apto para estudiantes).
+
+Las facetas son columnas generadas e indexadas de `vacantes` (ver models.vacante).
+Los filtros de texto aceptan varios valores separados por coma (OR dentro de la
+faceta, AND entre facetas) y se comparan exactos, con los valores que devuelve
+`GET /vacantes/facetas`.
+"""
+from typing import Optional
+from fastapi import Query
+
+FACETAS_TEXTO = ("ciudad", "estado", "modalidad", "tipo_empleo")
+FACETAS = FACETAS_TEXTO + ("apto_estudiantes",)
+
+
+def _valores(valor: Optional[str]) -> Optional[tuple]:
+    if not valor:
+        return None
+    vals = tuple(sorted({v.strip() for v in valor.split(",") if v.strip()}))
+    return vals or None
+
+
+def parse_filtros(
+    ciudad: Optional[str] = None,
+    estado: Optional[str] = None,
+    modalidad: Optional[str] = None,
+    tipo_empleo: Optional[str] = None,
+    apto_estudiantes: Optional[bool] = None,
+) -> Optional[dict]:
+    """Filtros normalizados (valores ordenados, sin vacíos) o None si no hay ninguno."""
+    filtros = {k: v for k, v in zip(FACETAS_TEXTO, map(_valores, (ciudad, estado, modalidad, tipo_empleo))) if v}
+    if apto_estudiantes is not None:
+        filtros["apto_estudiantes"] = apto_estudiantes
+    return filtros or None
+
+
+def filtros_vacante(
+    ciudad: Optional[str] = Query(None, description="Ciudad(es), separadas por coma"),
+    estado: Optional[str] = Query(None, description="Estado(s), separados por coma"),
+    modalidad: Optional[str] = Query(None, description="Modalidad(es), p. ej. On-site,Remote"),
+    tipo_empleo: Optional[str] = Query(None, description="Tipo(s) de empleo, p. ej. fulltime,internship"),
+    apto_estudiantes: Optional[bool] = Query(None, description="Solo vacantes aptas (o no) para estudiantes"),
+) -> Optional[dict]:
+    """Dependency de FastAPI con los parámetros de facetas de los listados de vacantes."""
+    return parse_filtros(ciudad, estado, modalidad, tipo_empleo, apto_estudiantes)
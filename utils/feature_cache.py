@@ -0,0 +1,174 @@
+"""
+Caché direccionada por contenido para embeddings y keyphrases.
+
+La clave es un hash de (tipo de resultado, modelo, versión del pipeline,
+texto normalizado): el mismo texto de vacante o CV cuesta una búsqueda en
+lugar de inferencia, sin importar de qué registro venga. Hay dos niveles:
+un LRU en memoria por proceso y un archivo SQLite compartido en disco,
+acotado en entradas. En disco solo se guardan embeddings como bytes float32
+y listas de frases como JSON (nunca pickle: el archivo no es código).
+Cambiar la extracción de términos o el modelo implica subir PIPELINE_VERSION
+(o cambia el nombre del modelo), lo que deja sin efecto las entradas viejas.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+import numpy as np
+
+# Subir cuando cambie el resultado de keyphrases/dedup/encode para el mismo texto
+PIPELINE_VERSION = "1"
+# Dentro de un directorio de la aplicación (se crea con permisos 0700), no en /tmp
+FEATURE_CACHE_PATH = os.getenv("FEATURE_CACHE_PATH", os.path.join("cache", "features.sqlite"))
+FEATURE_CACHE_SIZE = int(os.getenv("FEATURE_CACHE_SIZE", "4096"))
+# Entradas máximas en disco; al pasarse se borran las escritas hace más tiempo
+FEATURE_CACHE_DISK_MAX = int(os.getenv("FEATURE_CACHE_DISK_MAX", "200000"))
+# Cada cuántas escrituras se revisa el tope en disco
+_PODA_CADA = 256
+
+_MISSING = object()
+
+
+def normalize_for_key(text: str) -> str:
+    """Normalización que no altera los resultados: NFC, fines de línea y extremos."""
+    text = unicodedata.normalize("NFC", text or "")
+    return text.replace("\r\n", "\n").replace("\r", "\n").strip()
+
+
+def content_key(kind: str, text: str, model: str = "") -> str:
+    raw = "\0".join((kind, model, PIPELINE_VERSION, normalize_for_key(text)))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _encode(value) -> tuple[str, bytes] | None:
+    """(tipo, bytes) para guardar en disco; None si el valor no se puede guardar sin pickle."""
+    if isinstance(value, np.ndarray):
+        return "f32", np.ascontiguousarray(value, dtype=np.float32).tobytes()
+    if isinstance(value, (list, tuple)) and all(isinstance(v, str) for v in value):
+        return "json", json.dumps(list(value), ensure_ascii=False).encode("utf-8")
+    return None
+
+
+def _decode(tipo: str, raw: bytes):
+    if tipo == "f32":
+        return np.frombuffer(raw, dtype=np.float32).copy()
+    if tipo == "json":
+        return json.loads(raw.decode("utf-8"))
+    return None
+
+
+class FeatureCache:
+    """LRU en memoria respaldado por SQLite (vacío en `path` = solo memoria)."""
+
+    def __init__(self, path: str = FEATURE_CACHE_PATH, maxsize: int = FEATURE_CACHE_SIZE,
+                 disk_max: int = FEATURE_CACHE_DISK_MAX):
+        self.path = path
+        self.maxsize = maxsize
+        self.disk_max = disk_max
+        self._lock = threading.Lock()
+        self._mem = OrderedDict()
+        self._local = threading.local()  # una conexión SQLite por hilo
+        self._escrituras = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _conn(self):
+        if not self.path:
+            return None
+        db = getattr(self._local, "db", None)
+        if db is None:
+            try:
+                carpeta = os.path.dirname(os.path.abspath(self.path))
+                os.makedirs(carpeta, mode=0o700, exist_ok=True)
+                db = sqlite3.connect(self.path, timeout=5)
+                db.execute("PRAGMA journal_mode=WAL")
+                db.execute("CREATE TABLE IF NOT EXISTS features "
+                           "(clave TEXT PRIMARY KEY, tipo TEXT NOT NULL, valor BLOB NOT NULL)")
+                db.commit()
+                self._local.db = db
+            except (OSError, sqlite3.Error) as e:
+                print(f"⚠️ Caché en disco deshabilitada ({self.path}): {e}")
+                self.path = ""
+                return None
+        return db
+
+    def get(self, key: str, default=None):
+        with self._lock:
+            if key in self._mem:
+                self._mem.move_to_end(key)
+                self.hits += 1
+                return self._mem[key]
+
+        # La lectura en disco va fuera del lock: no serializa los demás hilos
+        value = None
+        db = self._conn()
+        if db is not None:
+            try:
+                row = db.execute("SELECT tipo, valor FROM features WHERE clave = ?", (key,)).fetchone()
+                value = _decode(*row) if row is not None else None
+            except (sqlite3.Error, ValueError):
+                value = None
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return default
+            self._remember(key, value)
+            self.hits += 1
+        return value
+
+    def put(self, key: str, value):
+        if isinstance(value, np.ndarray) and value.base is not None:
+            # Una fila de un lote es una vista: guardarla retendría el lote entero
+            value = value.copy()
+        with self._lock:
+            self._remember(key, value)
+            self._escrituras += 1
+            podar = self._escrituras % _PODA_CADA == 0
+
+        db = self._conn()
+        fila = _encode(value)
+        if db is None or fila is None:
+            return
+        try:
+            db.execute("INSERT OR REPLACE INTO features (clave, tipo, valor) VALUES (?, ?, ?)", (key, *fila))
+            if podar:
+                self._prune(db)
+            db.commit()
+        except sqlite3.Error:
+            pass
+
+    def _prune(self, db):
+        """Deja como mucho `disk_max` entradas; REPLACE da rowid nuevo, así que se van las más viejas."""
+        sobra = db.execute("SELECT count(*) FROM features").fetchone()[0] - self.disk_max
+        if sobra > 0:
+            db.execute("DELETE FROM features WHERE rowid IN "
+                       "(SELECT rowid FROM features ORDER BY rowid LIMIT ?)", (sobra,))
+
+    def get_or_compute(self, kind: str, text: str, compute, model: str = ""):
+        """Resultado cacheado de `compute()` para ese texto; lo calcula y guarda si falta."""
+        key = content_key(kind, text, model)
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def _remember(self, key: str, value):
+        self._mem[key] = value
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.maxsize:
+            self._mem.popitem(last=False)
+
+
+_FEATURE_CACHE = None
+
+
+def get_feature_cache() -> FeatureCache:
+    global _FEATURE_CACHE
+    if _FEATURE_CACHE is None:
+        _FEATURE_CACHE = FeatureCache()
+    return _FEATURE_CACHE
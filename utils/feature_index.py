@@ -0,0 +1,240 @@
+"""
+Índice híbrido en memoria (BM25 + embeddings + términos) compartido entre peticiones.
+
+Se construye una sola vez a partir de las features ya persistidas y se
+actualiza de forma incremental cuando cambia una vacante, en lugar de
+re-extraer términos y re-codificar todo el catálogo en cada ranking.
+"""
+import threading
+from itertools import chain
+import numpy as np
+from scipy import sparse
+from utils.bm25 import SparseBM25
+from utils.emb_store import share_matrix, write_matrix
+
+
+def _empty_snapshot(version: int = 0) -> dict:
+    return {
+        "ids": [], "pos": {}, "texts": [], "tokens": [], "terms": [], "term_ids": [],
+        "embs": np.zeros((0, 0), dtype=np.float32), "bm25": None, "term_matrix": None,
+        "updated": {}, "version": version,
+    }
+
+
+def _term_matrix(term_ids: list):
+    """Matriz binaria CSR filas × IDs de skill; None si alguna fila no tiene IDs."""
+    if any(t is None for t in term_ids):
+        return None
+    lens = [len(t) for t in term_ids]
+    indices = np.fromiter(chain.from_iterable(term_ids), dtype=np.int64, count=sum(lens))
+    indptr = np.concatenate([[0], np.cumsum(lens)]).astype(np.int64)
+    n_cols = int(indices.max()) + 1 if indices.size else 0
+    data = np.ones(indices.size, dtype=np.float32)
+    return sparse.csr_matrix((data, indices, indptr), shape=(len(term_ids), n_cols))
+
+
+def _normalize_rows(m: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(m, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return m / norms
+
+
+class FeatureIndex:
+    """
+    Índice en memoria sobre filas {"id", "text", "terms", "term_ids", "embedding", "updated_at"}.
+
+    Cada mutación publica un snapshot nuevo (copy-on-write), así que las
+    lecturas toman `snapshot()` una vez y trabajan sin bloqueo. El snapshot
+    es compatible con `cv_matcher.hybrid_rank` (claves "bm25" y "embs").
+
+    Las filas se mantienen ordenadas por ID; así, para un mismo estado de la
+    tabla, todos los workers llegan a la misma matriz de embeddings y la
+    comparten mapeada desde disco (ver utils.emb_store, que la identifica por
+    el hash de su contenido).
+    """
+
+    def __init__(self, nombre: str = ""):
+        self.nombre = nombre
+        self._lock = threading.Lock()
+        self._snap = _empty_snapshot()
+        self.stamp = None
+        self.ready = False
+
+    @property
+    def version(self) -> int:
+        return self._snap["version"]
+
+    def snapshot(self) -> dict:
+        return self._snap
+
+    def build(self, rows, stamp=None):
+        """Reconstruye el índice completo a partir de las filas dadas."""
+        with self._lock:
+            items = {}
+            updated = {}
+            for r in rows:
+                updated[r["id"]] = r.get("updated_at")
+                if self._indexable(r):
+                    items[r["id"]] = r
+            self._publish(items, updated, self._snap["version"] + 1)
+            self.stamp = stamp
+            self.ready = True
+            self._share()
+
+    def apply(self, upserts=(), removals=(), stamp=None):
+        """
+        Aplica altas/cambios y bajas en un solo snapshot nuevo, sin reconstruir:
+        las filas afectadas se quitan y las nuevas se agregan al final
+        (matriz de embeddings y BM25 incrementales).
+        """
+        with self._lock:
+            snap = self._snap
+            if not snap["ids"]:
+                items = {r["id"]: r for r in upserts if self._indexable(r)}
+                updated = dict(snap["updated"])
+                for i in removals:
+                    updated.pop(i, None)
+                updated.update({r["id"]: r.get("updated_at") for r in upserts})
+                self._publish(items, updated, snap["version"] + 1)
+            else:
+                self._apply_incremental(snap, list(upserts), list(removals))
+            if stamp is not None:
+                self.stamp = stamp
+                self._share()
+
+    def diff(self, versions: dict) -> tuple[list, list]:
+        """Compara {id: updated_at} de la BD con lo indexado: (ids cambiados, ids eliminados)."""
+        known = self._snap["updated"]
+        missing = object()
+        stale = [i for i, ts in versions.items() if known.get(i, missing) != ts]
+        gone = [i for i in known if i not in versions]
+        return stale, gone
+
+    def upsert(self, row: dict):
+        self.apply(upserts=[row])
+
+    def remove(self, item_id: int):
+        self.apply(removals=[item_id])
+
+    # ---------- internos ----------
+    @staticmethod
+    def _indexable(r: dict) -> bool:
+        emb = r.get("embedding")
+        return bool((r.get("text") or "").strip()) and emb is not None and len(emb) > 0
+
+    def _apply_incremental(self, snap: dict, upserts: list, removals: list):
+        dim = snap["embs"].shape[1]
+        updated = dict(snap["updated"])
+        for i in removals:
+            updated.pop(i, None)
+        latest = {}
+        for r in upserts:
+            updated[r["id"]] = r.get("updated_at")
+            latest[r["id"]] = r
+        new_rows = [r for r in latest.values() if self._indexable(r) and len(r["embedding"]) == dim]
+
+        drop = {snap["pos"][i] for i in list(removals) + list(latest) if i in snap["pos"]}
+        keep = [p for p in range(len(snap["ids"])) if p not in drop]
+
+        nxt = _empty_snapshot(snap["version"] + 1)
+        nxt["updated"] = updated
+        nxt["ids"] = [snap["ids"][p] for p in keep] + [r["id"] for r in new_rows]
+        nxt["pos"] = {i: p for p, i in enumerate(nxt["ids"])}
+        nxt["texts"] = [snap["texts"][p] for p in keep] + [r["text"] for r in new_rows]
+        new_tokens = [r.get("tokens") or r["text"].lower().split() for r in new_rows]
+        nxt["tokens"] = [snap["tokens"][p] for p in keep] + new_tokens
+        nxt["terms"] = [snap["terms"][p] for p in keep] + [list(r.get("terms") or []) for r in new_rows]
+        nxt["term_ids"] = [snap["term_ids"][p] for p in keep] + [r.get("term_ids") for r in new_rows]
+        new_embs = np.zeros((0, dim), dtype=np.float32)
+        if new_rows:
+            new_embs = _normalize_rows(np.vstack([np.asarray(r["embedding"], dtype=np.float32) for r in new_rows]))
+
+        bm25 = snap["bm25"].copy()
+        bm25.remove(sorted(drop))
+        bm25.add(new_tokens)
+        bm25.prepare()
+
+        # Las filas nuevas quedaron al final: volver al orden por ID
+        order = np.argsort(np.asarray(nxt["ids"], dtype=np.int64), kind="stable")
+        if (np.diff(order) != 1).any():
+            for key in ("ids", "texts", "tokens", "terms", "term_ids"):
+                nxt[key] = [nxt[key][p] for p in order]
+            nxt["pos"] = {i: p for p, i in enumerate(nxt["ids"])}
+            bm25.reorder(order)
+        nxt["embs"] = self._gather_embs(snap["embs"], np.asarray(keep, dtype=np.int64), new_embs, order)
+        nxt["term_matrix"] = _term_matrix(nxt["term_ids"])
+        nxt["bm25"] = bm25
+        self._snap = nxt
+
+    def _gather_embs(self, old: np.ndarray, keep: np.ndarray, new: np.ndarray, order: np.ndarray,
+                     bloque: int = 4096) -> np.ndarray:
+        """
+        Matriz del snapshot nuevo: filas `keep` de la anterior más `new`, en el orden `order`.
+        Si la anterior está mapeada desde disco se escribe directo a un archivo nuevo
+        por bloques de filas, sin copiar toda la matriz a la memoria del proceso.
+        """
+        n_old, dim = len(keep), new.shape[1]
+        if self.nombre and isinstance(old, np.memmap) and len(order):
+            def bloques():
+                for start in range(0, len(order), bloque):
+                    src = order[start:start + bloque]
+                    out = np.empty((len(src), dim), dtype=np.float32)
+                    de_old = src < n_old
+                    out[de_old] = old[keep[src[de_old]]]
+                    out[~de_old] = new[src[~de_old] - n_old]
+                    yield out
+            mapped = write_matrix(self.nombre, (len(order), dim), bloques())
+            if mapped is not None:
+                return mapped
+        embs = np.vstack([old[keep], new])
+        return embs if (np.diff(order) == 1).all() else embs[order]
+
+    def _share(self):
+        """Cambia la matriz de embeddings del snapshot actual por la versión mapeada en disco."""
+        snap = self._snap
+        if not self.nombre or not snap["ids"] or isinstance(snap["embs"], np.memmap):
+            return
+        embs = share_matrix(self.nombre, snap["embs"])
+        if embs is not snap["embs"]:
+            self._snap = {**snap, "embs": embs}
+
+    def _publish(self, items: dict, updated: dict, version: int):
+        snap = _empty_snapshot(version)
+        snap["updated"] = updated
+        if not items:
+            self._snap = snap
+            return
+
+        dim = len(next(iter(items.values()))["embedding"])
+        rows = sorted((r for r in items.values() if len(r["embedding"]) == dim), key=lambda r: r["id"])
+
+        snap["ids"] = [r["id"] for r in rows]
+        snap["pos"] = {i: p for p, i in enumerate(snap["ids"])}
+        snap["texts"] = [r["text"] for r in rows]
+        snap["tokens"] = [r.get("tokens") or r["text"].lower().split() for r in rows]
+        snap["terms"] = [list(r.get("terms") or []) for r in rows]
+        snap["term_ids"] = [r.get("term_ids") for r in rows]
+        snap["term_matrix"] = _term_matrix(snap["term_ids"])
+        embs = np.vstack([np.asarray(r["embedding"], dtype=np.float32) for r in rows])
+        snap["embs"] = _normalize_rows(embs)
+        snap["bm25"] = SparseBM25(snap["tokens"])
+        snap["bm25"].prepare()
+        self._snap = snap
+
+
+_VACANTE_INDEX = None
+_CV_INDEX = None
+
+
+def get_vacante_index() -> FeatureIndex:
+    global _VACANTE_INDEX
+    if _VACANTE_INDEX is None:
+        _VACANTE_INDEX = FeatureIndex("vacantes")
+    return _VACANTE_INDEX
+
+
+def get_cv_index() -> FeatureIndex:
+    global _CV_INDEX
+    if _CV_INDEX is None:
+        _CV_INDEX = FeatureIndex("cvs")
+    return _CV_INDEX
@@ -0,0 +1,148 @@
+"""
+Deduplicación difusa de frases en lote, con el mismo resultado que el voraz original.
+
+El voraz recorre las frases en orden y conserva cada una si su `token_set_ratio`
+contra todas las ya conservadas es menor al umbral. Aquí se hace en tres pasos:
+
+1. Bloqueo: pares candidatos que incluyen, garantizado, a todo par con
+   score >= umbral (r = umbral/100, c = r / (2 - r)):
+   - si los tokens compartidos pesan >= c de una de las frases (incluye
+     subconjuntos, score 100), esa frase comparte con la otra alguno de sus
+     tokens más raros (prefijo de tokens);
+   - si no, el score es el `ratio` de dos cadenas con los mismos caracteres
+     que las frases (tokens ordenados sin repetir), así que sus longitudes
+     difieren a lo más en c y comparten >= r·(l1+l2)/2 caracteres: ambas
+     tienen algún carácter en común dentro de su prefijo de caracteres raros.
+2. Los candidatos se puntúan en lote, en C, con `process.cpdist`.
+3. Con el grafo de pares similares se repite la pasada voraz en el orden original.
+
+Las frases con el mismo conjunto de tokens se resuelven antes: una repetida
+nunca se conserva (su original, o la frase que lo descartó, la descarta también).
+Para listas chicas basta una sola matriz `process.cdist`.
+"""
+from collections import Counter
+import numpy as np
+from scipy import sparse
+from rapidfuzz import process, fuzz
+
+# Hasta este número de frases únicas se usa una sola matriz cdist, sin bloqueo
+DEDUP_BLOQUE = 128
+
+
+def _numbered(text: str) -> list:
+    """Caracteres de un texto como conjunto: cada uno numerado por ocurrencia."""
+    seen = Counter()
+    out = []
+    for ch in text:
+        out.append((ch, seen[ch]))
+        seen[ch] += 1
+    return out
+
+
+def _incidence(docs: list, in_prefix) -> tuple:
+    """
+    Matrices frases × elementos (completa y de prefijo). El prefijo son los
+    elementos que `in_prefix(filas, columnas, rango)` acepta, con los elementos
+    de cada frase ordenados de menos a más frecuentes en toda la lista.
+    """
+    vocab = {}
+    rows, cols = [], []
+    for i, elems in enumerate(docs):
+        for x in elems:
+            rows.append(i)
+            cols.append(vocab.setdefault(x, len(vocab)))
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    shape = (len(docs), len(vocab))
+    full = sparse.csr_matrix((np.ones(len(rows), dtype=np.float32), (rows, cols)), shape=shape)
+
+    freq = np.bincount(cols, minlength=len(vocab))
+    order = np.lexsort((cols, freq[cols], rows))
+    rows, cols = rows[order], cols[order]
+    starts = np.searchsorted(rows, rows)
+    keep = in_prefix(rows, cols, np.arange(len(rows)) - starts, starts)
+    prefix = sparse.csr_matrix((np.ones(int(keep.sum()), dtype=np.float32), (rows[keep], cols[keep])), shape=shape)
+    return full, prefix, vocab
+
+
+def candidate_pairs(phrases: list, threshold: float = 88) -> np.ndarray:
+    """Pares (i, j), i < j, que incluyen a todos los de token_set_ratio >= threshold."""
+    n = len(phrases)
+    r = threshold / 100
+    if r <= 2 / 3:
+        # Umbral demasiado bajo para los filtros: todos contra todos
+        return np.stack(np.triu_indices(n, k=1), axis=1).astype(np.int64)
+    c = r / (2 - r)
+
+    tokens = [sorted(set(p.split())) for p in phrases]
+    strs = [" ".join(toks) for toks in tokens]
+    lens = np.array([len(s) for s in strs], dtype=np.float64)
+    eps = 1e-9
+
+    # 1) Tokens compartidos: peso de un token = len + 1; total de la frase = len(s) + 1
+    def tok_prefix(rows, cols, rank, starts):
+        w = weights[cols]
+        acc = np.cumsum(w)
+        before = acc - w - np.concatenate([[0], acc])[starts]
+        return before <= (1 - c) * lens[rows] + eps
+
+    ids = {}
+    tok_ids = [[ids.setdefault(t, len(ids)) for t in toks] for toks in tokens]
+    weights = np.array([len(t) + 1 for t in ids], dtype=np.float64)
+    full, pref, _ = _incidence(tok_ids, tok_prefix)
+    links = pref @ full.T
+
+    # 2) Caracteres comunes con longitudes parecidas
+    need = np.ceil(r * (1 + c) / 2 * lens - eps)
+    _, ch_pref, _ = _incidence([_numbered(s) for s in strs],
+                               lambda rows, cols, rank, starts: rank < lens[rows] - need[rows] + 1)
+    ch_links = (ch_pref @ ch_pref.T).tocoo()
+    la, lb = lens[ch_links.row], lens[ch_links.col]
+    similar = np.minimum(la, lb) >= c * np.maximum(la, lb) - eps
+    ch_links = sparse.csr_matrix((np.ones(int(similar.sum()), dtype=np.float32),
+                                  (ch_links.row[similar], ch_links.col[similar])), shape=(n, n))
+
+    allp = (links + links.T + ch_links).tocoo()
+    upper = allp.row < allp.col
+    return np.stack([allp.row[upper], allp.col[upper]], axis=1).astype(np.int64)
+
+
+def _greedy(n: int, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    """Pasada voraz sobre el grafo de pares similares (rows < cols)."""
+    graph = sparse.csr_matrix((np.ones(len(rows), dtype=bool), (cols, rows)), shape=(n, n))
+    keep = np.zeros(n, dtype=bool)
+    for j in range(n):
+        earlier = graph.indices[graph.indptr[j]:graph.indptr[j + 1]]
+        keep[j] = not keep[earlier].any()
+    return keep
+
+
+def dedup_phrases(phrases, threshold: float = 88, bloque: int = DEDUP_BLOQUE) -> list:
+    """Frases canónicas: las mismas (y en el mismo orden) que la pasada voraz con extractOne."""
+    phrases = list(phrases)
+    if len(phrases) < 2:
+        return phrases
+
+    # Una frase con el mismo conjunto de tokens que otra anterior se descarta
+    # (salvo sin tokens: su score es 0 contra todo y siempre se conserva)
+    first, uniq = {}, []
+    for i, p in enumerate(phrases):
+        key = frozenset(p.split())
+        if not key or first.setdefault(key, i) == i:
+            uniq.append(i)
+    texts = [phrases[i] for i in uniq]
+    n = len(texts)
+
+    if n <= bloque:
+        sim = process.cdist(texts, texts, scorer=fuzz.token_set_ratio, score_cutoff=threshold,
+                            dtype=np.uint8, workers=-1) >= threshold
+        rows, cols = np.nonzero(np.triu(sim, k=1))
+    else:
+        pairs = candidate_pairs(texts, threshold)
+        scores = process.cpdist([texts[i] for i in pairs[:, 0]], [texts[j] for j in pairs[:, 1]],
+                                scorer=fuzz.token_set_ratio, score_cutoff=threshold,
+                                dtype=np.uint8, workers=-1) if len(pairs) else np.zeros(0)
+        rows, cols = pairs[scores >= threshold].T if len(pairs) else (np.zeros(0, int), np.zeros(0, int))
+
+    keep = _greedy(n, rows, cols)
+    return [t for t, k in zip(texts, keep) if k]
@@ -0,0 +1,153 @@
+"""
+Micro-batching dinámico de llamadas a `encode`.
+
+Las peticiones concurrentes (subidas de CV, altas de vacantes, queries en
+vivo) suelen codificar un solo texto cada una. EncodeBatcher las junta en una
+cola durante unos milisegundos o hasta llenar un lote, las ordena por
+longitud, hace una sola llamada al modelo y devuelve a cada quien su vector.
+
+Cualquier error al armar o procesar un lote se entrega a las peticiones de ese
+lote (el hilo sigue vivo), y cada petición espera a lo sumo
+ENCODE_BATCH_TIMEOUT_S antes de fallar con TimeoutError.
+"""
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+from concurrent.futures import TimeoutError as FutureTimeout
+import numpy as np
+
+ENCODE_BATCH_MAX = int(os.getenv("ENCODE_BATCH_MAX", "32"))
+ENCODE_BATCH_WAIT_MS = float(os.getenv("ENCODE_BATCH_WAIT_MS", "5"))
+ENCODE_BATCH_TIMEOUT_S = float(os.getenv("ENCODE_BATCH_TIMEOUT_S", "60"))
+
+
+class EncodeBatcher:
+    """Envoltura de un modelo con `encode` que agrupa las llamadas concurrentes."""
+
+    def __init__(self, model, max_batch: int = ENCODE_BATCH_MAX, max_wait_ms: float = ENCODE_BATCH_WAIT_MS,
+                 timeout_s: float = ENCODE_BATCH_TIMEOUT_S):
+        self.model = model
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max_wait_ms / 1000.0
+        self.timeout = timeout_s
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._lotes = 0
+        self._textos = 0
+        self._ultimo_lote = 0
+
+    def encode(self, sentences, **kwargs):
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts or len(texts) >= self.max_batch:
+            # Ya es un lote completo: no vale la pena esperar en la cola
+            return self.model.encode(sentences, **kwargs)
+
+        fut = Future()
+        self._queue.put((texts, kwargs, fut))
+        self._ensure_worker()
+        try:
+            embs = fut.result(timeout=self.timeout)
+        except FutureTimeout:
+            fut.cancel()
+            raise TimeoutError(f"encode sin respuesta tras {self.timeout:.0f} s") from None
+        return embs[0] if single else embs
+
+    def stats(self) -> dict:
+        """Profundidad de la cola y llenado de los lotes desde el arranque."""
+        lotes = self._lotes
+        return {
+            "cola": self._queue.qsize(),
+            "lotes": lotes,
+            "textos": self._textos,
+            "ultimo_lote": self._ultimo_lote,
+            "max_lote": self.max_batch,
+            "espera_ms": self.max_wait * 1000.0,
+            "llenado_medio": round(self._textos / (lotes * self.max_batch), 4) if lotes else 0.0,
+        }
+
+    # ---------- internos ----------
+    def _ensure_worker(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="encode-batcher", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            try:
+                n = len(batch[0][0])
+                deadline = time.monotonic() + self.max_wait
+                while n < self.max_batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = self._queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                    batch.append(item)
+                    n += len(item[0])
+                self._process(batch)
+            except Exception as e:
+                # Un error fuera del encode no debe matar el hilo ni dejar esperando a nadie
+                for _, _, fut in batch:
+                    _resolve(fut, exc=e)
+
+    def _process(self, batch: list):
+        # Solo se juntan peticiones con los mismos kwargs (p.ej. normalize_embeddings)
+        groups = {}
+        for item in batch:
+            groups.setdefault(tuple(sorted(item[1].items())), []).append(item)
+
+        for key, items in groups.items():
+            flat = [t for texts, _, _ in items for t in texts]
+            order = sorted(range(len(flat)), key=lambda i: len(flat[i]))
+            try:
+                embs = np.asarray(self.model.encode([flat[i] for i in order], **dict(key)))
+                out = np.empty_like(embs)
+                out[order] = embs
+            except Exception as e:
+                for _, _, fut in items:
+                    _resolve(fut, exc=e)
+                continue
+
+            self._lotes += 1
+            self._textos += len(flat)
+            self._ultimo_lote = len(flat)
+            start = 0
+            for texts, _, fut in items:
+                _resolve(fut, out[start:start + len(texts)])
+                start += len(texts)
+
+
+def _resolve(fut: Future, result=None, exc: Exception | None = None):
+    """Entrega el resultado; si la petición ya se resolvió o se canceló (timeout), no hace nada."""
+    try:
+        if exc is not None:
+            fut.set_exception(exc)
+        else:
+            fut.set_result(result)
+    except InvalidStateError:
+        pass
+
+
+_BATCHER = None
+
+
+def get_encode_batcher(model=None) -> EncodeBatcher:
+    """Batcher global; la primera llamada debe pasar el modelo a envolver."""
+    global _BATCHER
+    if _BATCHER is None:
+        _BATCHER = EncodeBatcher(model)
+    return _BATCHER
+
+
+def encode_batcher_stats() -> dict | None:
+    return _BATCHER.stats() if _BATCHER is not None else None
@@ -0,0 +1,202 @@
+"""
+Servidor local de modelos (SentenceTransformer + spaCy) por socket Unix.
+
+Sin servidor, cada worker de gunicorn carga sus propios modelos la primera vez
+que los usa. Con MODEL_SERVER_SOCKET configurado, un solo proceso los carga y
+los workers le mandan las peticiones de `encode` y `keyphrases_spacy`:
+
+    MODEL_SERVER_SOCKET=/run/api-utc/models.sock MODEL_SERVER_AUTHKEY=... python -m utils.model_server
+
+El protocolo es el de `multiprocessing.connection` (mensajes pickle con
+autenticación por MODEL_SERVER_AUTHKEY), así que solo se escucha en un socket
+local, creado ya con permisos 0600 (y su carpeta, si no existe, con 0700), y
+la clave es obligatoria: sin ella el servidor no arranca. Si el servidor no
+responde (o tarda más de MODEL_SERVER_TIMEOUT_S), los workers calculan en su
+propio proceso (respaldo local) y lo vuelven a intentar pasados
+MODEL_SERVER_RETRY_S segundos.
+"""
+import os
+import threading
+import time
+from multiprocessing.connection import Client, Listener
+
+MODEL_SERVER_SOCKET = os.getenv("MODEL_SERVER_SOCKET", "")
+# Sin valor por defecto: una clave conocida dejaría a cualquiera mandar pickles al servidor
+MODEL_SERVER_AUTHKEY = os.getenv("MODEL_SERVER_AUTHKEY", "").encode()
+MODEL_SERVER_RETRY_S = float(os.getenv("MODEL_SERVER_RETRY_S", "30"))
+# Espera máxima de una respuesta; un servidor colgado no debe bloquear al worker
+MODEL_SERVER_TIMEOUT_S = float(os.getenv("MODEL_SERVER_TIMEOUT_S", "30"))
+
+
+class ModelServerUnavailable(ConnectionError):
+    """El servidor de modelos no responde (o falta la clave): usar el respaldo local."""
+
+
+class RemoteEmbedder:
+    """Sustituto de SentenceTransformer con el mismo `encode` para los usos de esta API."""
+
+    def __init__(self, client: "ModelClient", respaldo=None):
+        self._client = client
+        self.respaldo = respaldo  # callable que devuelve el embedder local
+
+    def encode(self, sentences, **kwargs):
+        if self.respaldo is not None and not self._client.disponible():
+            return self.respaldo().encode(sentences, **kwargs)
+        single = isinstance(sentences, str)
+        try:
+            embs = self._client.call("encode", [sentences] if single else list(sentences), kwargs)
+        except ModelServerUnavailable:
+            if self.respaldo is None:
+                raise
+            return self.respaldo().encode(sentences, **kwargs)
+        return embs[0] if single else embs
+
+
+class ModelClient:
+    """Cliente del servidor de modelos; una conexión por hilo, reconecta si se cae."""
+
+    def __init__(self, address: str = MODEL_SERVER_SOCKET, authkey: bytes = MODEL_SERVER_AUTHKEY,
+                 timeout_s: float = MODEL_SERVER_TIMEOUT_S):
+        self.address = address
+        self.authkey = authkey
+        self.timeout = timeout_s
+        self._local = threading.local()
+        self._caido_hasta = 0.0
+        self.embedder = RemoteEmbedder(self)
+
+    def disponible(self) -> bool:
+        """False sin clave o durante MODEL_SERVER_RETRY_S tras una falla de conexión."""
+        return bool(self.authkey) and time.monotonic() >= self._caido_hasta
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = Client(self.address, family="AF_UNIX", authkey=self.authkey)
+        return conn
+
+    def _drop_conn(self):
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn is not None:
+            try:
+                conn.close()
+            except OSError:
+                pass
+
+    def _caido(self, e: Exception) -> ModelServerUnavailable:
+        if time.monotonic() >= self._caido_hasta:
+            print(f"⚠️ Servidor de modelos sin respuesta ({e}); se calcula en este proceso")
+        self._caido_hasta = time.monotonic() + MODEL_SERVER_RETRY_S
+        return ModelServerUnavailable(str(e))
+
+    def call(self, op: str, *args):
+        if not self.authkey:
+            raise ModelServerUnavailable("MODEL_SERVER_AUTHKEY no está definida")
+        for intento in range(2):
+            try:
+                conn = self._conn()
+                conn.send((op, args))
+                if not conn.poll(self.timeout):
+                    raise TimeoutError(f"sin respuesta en {self.timeout:g} s")
+                status, result = conn.recv()
+                break
+            except TimeoutError as e:
+                # La respuesta tardía llegaría a la siguiente llamada: se descarta la conexión.
+                # Sin reintento: el servidor está colgado o saturado
+                self._drop_conn()
+                raise self._caido(e) from e
+            except (EOFError, OSError) as e:
+                self._drop_conn()
+                if intento:
+                    raise self._caido(e) from e
+        if status == "error":
+            raise RuntimeError(f"Servidor de modelos: {result}")
+        return result
+
+    def keyphrases_spacy(self, text: str) -> list:
+        return self.call("keyphrases_spacy", text)
+
+    def keyphrases_spacy_many(self, texts: list) -> list:
+        return self.call("keyphrases_spacy_many", list(texts))
+
+    def stats(self) -> dict | None:
+        return self.call("stats")
+
+
+_CLIENT = None
+
+
+def get_model_client() -> ModelClient:
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = ModelClient()
+    return _CLIENT
+
+
+# ---------- servidor ----------
+def _handle(conn, ops: dict):
+    with conn:
+        while True:
+            try:
+                op, args = conn.recv()
+            except (EOFError, OSError):
+                return
+            try:
+                conn.send(("ok", ops[op](*args)))
+            except Exception as e:
+                conn.send(("error", f"{op}: {e}"))
+
+
+def serve(address: str = MODEL_SERVER_SOCKET, authkey: bytes = MODEL_SERVER_AUTHKEY):
+    """Carga los modelos una vez y atiende a los workers (un hilo por conexión)."""
+    from utils import cv_matcher as cm
+    from utils.micro_batch import get_encode_batcher, encode_batcher_stats
+
+    # Las peticiones de todos los workers se agrupan aquí en lotes
+    embedder = get_encode_batcher(cm.load_embedder())
+    cm.get_nlp()
+    nlp_lock = threading.Lock()
+
+    def keyphrases(text):
+        with nlp_lock:
+            return cm.keyphrases_spacy_local(text)
+
+    def keyphrases_many(texts):
+        with nlp_lock:
+            return cm.keyphrases_spacy_many_local(texts)
+
+    ops = {
+        "encode": lambda texts, kwargs: embedder.encode(texts, **kwargs),
+        "keyphrases_spacy": keyphrases,
+        "keyphrases_spacy_many": keyphrases_many,
+        "stats": encode_batcher_stats,
+    }
+
+    if os.path.exists(address):
+        os.remove(address)
+    carpeta = os.path.dirname(os.path.abspath(address))
+    if not os.path.isdir(carpeta):
+        os.makedirs(carpeta, mode=0o700)
+    # El socket nace con 0600: no hay ventana entre el bind y el chmod
+    umask = os.umask(0o177)
+    try:
+        listener = Listener(address, family="AF_UNIX", authkey=authkey)
+    finally:
+        os.umask(umask)
+    with listener:
+        print(f"🧠 Servidor de modelos escuchando en {address}")
+        while True:
+            try:
+                conn = listener.accept()
+            except Exception as e:
+                print(f"⚠️ Conexión rechazada: {e}")
+                continue
+            threading.Thread(target=_handle, args=(conn, ops), daemon=True).start()
+
+
+if __name__ == "__main__":
+    if not MODEL_SERVER_SOCKET:
+        raise SystemExit("Define MODEL_SERVER_SOCKET con la ruta del socket Unix")
+    if not MODEL_SERVER_AUTHKEY or MODEL_SERVER_AUTHKEY == b"api-utc":
+        raise SystemExit("Define MODEL_SERVER_AUTHKEY con una clave propia (no la de ejemplo)")
+    serve()
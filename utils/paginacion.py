@@ -0,0 +1,53 @@
+"""
+Cursores opacos para paginación keyset.
+
+El cursor es un JSON compacto en base64 url-safe; el cliente solo lo
+reenvía tal cual en `?cursor=`. El siguiente cursor viaja en el header
+`X-Next-Cursor` para no cambiar la forma (lista) de las respuestas.
+"""
+import base64
+import json
+from typing import Optional
+from fastapi import HTTPException, status
+
+CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(data: dict) -> str:
+    raw = json.dumps(data, separators=(",", ":"), sort_keys=True).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """Decodifica un cursor; 400 si está mal formado."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        if not isinstance(data, dict):
+            raise ValueError("cursor no es un objeto")
+        return data
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor inválido"
+        )
+
+
+def after_id(cursor: Optional[str]) -> Optional[int]:
+    """Último ID visto según el cursor de un listado por ID (None = primera página)."""
+    if not cursor:
+        return None
+    last = decode_cursor(cursor).get("id")
+    if not isinstance(last, int):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor inválido"
+        )
+    return last
+
+
+def next_id_cursor(items: list, limit: int) -> Optional[str]:
+    """Cursor de la página siguiente si esta vino llena; None si ya no hay más."""
+    if len(items) < limit or not items:
+        return None
+    return encode_cursor({"id": items[-1].id})
@@ -0,0 +1,192 @@
+"""
+Extracción de texto de PDFs en un pool de procesos, con límites.
+
+pypdf (y pdfminer como respaldo) corren fuera del proceso web: un PDF
+malformado o enorme no bloquea un hilo de la API ni se queda con un CPU sin
+límite. Cada documento tiene un tiempo máximo de pared, un tamaño máximo en
+bytes y un tope de páginas; los documentos largos se reparten por rangos de
+páginas entre los procesos del pool. Se registra qué ruta se tomó (pypdf,
+pdfminer, timeout, ...) y cuánto tardó. Las funciones que corren en el pool
+están en pdf_worker (fuera de `utils`, para que los procesos no carguen los
+modelos al arrancar).
+"""
+import os
+import threading
+import time
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from pdf_worker import pdfminer_text as _pdfminer, try_pypdf_range as _try_pypdf_range
+
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", "2"))  # 0 = extraer en el mismo proceso, sin timeout
+PDF_TIMEOUT_S = float(os.getenv("PDF_TIMEOUT_S", "30"))
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "50"))
+PDF_MAX_BYTES = int(os.getenv("PDF_MAX_BYTES", str(10 * 1024 * 1024)))
+PDF_PAGES_PER_TASK = int(os.getenv("PDF_PAGES_PER_TASK", "8"))
+
+
+class PDFError(ValueError):
+    """PDF rechazado por los límites (tamaño, tiempo) o ilegible."""
+
+
+def _extract_inline(b: bytes, max_pages: int) -> tuple[str, str]:
+    txt, _ = _try_pypdf_range(b, 0, max_pages)
+    if txt and txt.strip():
+        return txt, "pypdf"
+    return _pdfminer(b, max_pages), "pdfminer"
+
+
+# ---------- métricas ----------
+class _Stats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rutas = {}
+
+    def record(self, ruta: str, segundos: float, paginas: int = 0):
+        with self._lock:
+            r = self._rutas.setdefault(ruta, {"documentos": 0, "paginas": 0, "segundos": 0.0, "max_segundos": 0.0})
+            r["documentos"] += 1
+            r["paginas"] += paginas
+            r["segundos"] += segundos
+            r["max_segundos"] = max(r["max_segundos"], segundos)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            rutas = {
+                ruta: {**r, "segundos": round(r["segundos"], 4), "max_segundos": round(r["max_segundos"], 4),
+                       "media_segundos": round(r["segundos"] / r["documentos"], 4)}
+                for ruta, r in self._rutas.items()
+            }
+        return {
+            "workers": PDF_WORKERS,
+            "timeout_s": PDF_TIMEOUT_S,
+            "max_paginas": PDF_MAX_PAGES,
+            "max_bytes": PDF_MAX_BYTES,
+            "rutas": rutas,
+        }
+
+
+_STATS = _Stats()
+
+
+def pdf_stats() -> dict:
+    """Documentos, páginas y tiempos por ruta de extracción desde el arranque."""
+    return _STATS.snapshot()
+
+
+# ---------- pool ----------
+class PDFExtractor:
+    """Pool de procesos (spawn) para extraer texto de PDFs con límites."""
+
+    def __init__(self, workers: int = PDF_WORKERS, timeout_s: float = PDF_TIMEOUT_S,
+                 max_pages: int = PDF_MAX_PAGES, max_bytes: int = PDF_MAX_BYTES,
+                 pages_per_task: int = PDF_PAGES_PER_TASK):
+        self.workers = workers
+        self.timeout_s = timeout_s
+        self.max_pages = max_pages
+        self.max_bytes = max_bytes
+        self.pages_per_task = max(1, pages_per_task)
+        self._lock = threading.Lock()
+        self._pool = None
+
+    def extract(self, b: bytes) -> str:
+        if len(b) > self.max_bytes:
+            _STATS.record("rechazado", 0.0)
+            raise PDFError(f"El PDF excede el tamaño máximo ({self.max_bytes} bytes)")
+
+        t0 = time.perf_counter()
+        if self.workers <= 0:
+            txt, ruta = _extract_inline(b, self.max_pages)
+            _STATS.record(ruta, time.perf_counter() - t0)
+            return txt
+
+        pool = self._get_pool()
+        try:
+            txt, ruta, paginas = self._extract_pooled(pool, b, t0 + self.timeout_s)
+        except BrokenProcessPool:
+            # Un proceso murió (OOM, segfault, o lo mató otro timeout): se descarta
+            # ese pool y se reintenta una sola vez con uno nuevo
+            self._restart(pool)
+            pool = self._get_pool()
+            try:
+                txt, ruta, paginas = self._extract_pooled(pool, b, t0 + self.timeout_s)
+            except BrokenProcessPool:
+                self._restart(pool)
+                _STATS.record("error", time.perf_counter() - t0)
+                raise PDFError("El proceso de extracción del PDF terminó de forma inesperada")
+        _STATS.record(ruta, time.perf_counter() - t0, paginas)
+        return txt
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    # ---------- internos ----------
+    def _extract_pooled(self, pool: ProcessPoolExecutor, b: bytes, deadline: float) -> tuple[str, str, int]:
+        try:
+            # El primer rango también da el total de páginas; el resto se reparte en paralelo
+            first = self._wait(pool.submit(_try_pypdf_range, b, 0, self.pages_per_task), deadline)
+            txt, n_pages = first
+            n_pages = min(n_pages, self.max_pages)
+            if txt is not None and n_pages > self.pages_per_task:
+                futs = [
+                    pool.submit(_try_pypdf_range, b, start, min(start + self.pages_per_task, n_pages))
+                    for start in range(self.pages_per_task, n_pages, self.pages_per_task)
+                ]
+                parts = [txt] + [self._wait(f, deadline)[0] for f in futs]
+                txt = None if any(p is None for p in parts) else "\n".join(parts)
+            if txt and txt.strip():
+                return txt, "pypdf", n_pages
+            fut = pool.submit(_pdfminer, b, self.max_pages)
+            try:
+                return self._wait(fut, deadline), "pdfminer", n_pages
+            except (FutureTimeout, BrokenProcessPool):
+                raise
+            except Exception as e:
+                _STATS.record("error", time.perf_counter() - deadline + self.timeout_s)
+                raise PDFError(f"No se pudo leer el PDF: {str(e)}")
+        except FutureTimeout:
+            _STATS.record("timeout", self.timeout_s)
+            self._restart(pool)
+            raise PDFError(f"La extracción del PDF excedió {self.timeout_s:g} s")
+
+    @staticmethod
+    def _wait(fut, deadline: float):
+        return fut.result(timeout=max(0.0, deadline - time.perf_counter()))
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # spawn: los procesos no heredan los modelos ni los hilos del proceso web
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=mp.get_context("spawn"))
+            return self._pool
+
+    def _restart(self, pool: ProcessPoolExecutor):
+        """
+        Mata los procesos del pool (un PDF colgado no se puede cancelar) o descarta
+        un pool roto, y crea uno nuevo al siguiente uso.
+        """
+        with self._lock:
+            if self._pool is not pool:
+                return
+            self._pool = None
+        for p in list((getattr(pool, "_processes", None) or {}).values()):
+            p.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+_EXTRACTOR = None
+
+
+def get_pdf_extractor() -> PDFExtractor:
+    global _EXTRACTOR
+    if _EXTRACTOR is None:
+        _EXTRACTOR = PDFExtractor()
+    return _EXTRACTOR
+
+
+def extract_pdf_text(b: bytes) -> str:
+    """Texto de un PDF en bytes usando el pool compartido (lanza PDFError si se rechaza)."""
+    return get_pdf_extractor().extract(b)
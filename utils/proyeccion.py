@@ -0,0 +1,37 @@
+"""
+Selección de campos (`fields=` / `exclude=`) sobre el JSONB `datos_vacante`.
+
+Los parámetros llegan como listas separadas por coma; se validan aquí y el
+DAO los convierte en una expresión SQL para que Postgres devuelva solo las
+claves pedidas (ver VacanteDAO.datos_columna).
+"""
+import re
+from typing import Optional
+from fastapi import HTTPException, status
+
+_CLAVE_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]{0,63}$")
+MAX_CLAVES = 50
+
+
+def _claves(valor: str, nombre: str) -> tuple:
+    claves = tuple(dict.fromkeys(c.strip() for c in valor.split(",") if c.strip()))
+    if not claves or len(claves) > MAX_CLAVES or not all(_CLAVE_RE.match(c) for c in claves):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"`{nombre}` debe ser una lista de hasta {MAX_CLAVES} claves separadas por coma"
+        )
+    return claves
+
+
+def parse_campos(fields: Optional[str], exclude: Optional[str]) -> Optional[tuple]:
+    """("fields" | "exclude", claves) o None si no se pidió proyección; 400 si vienen ambos o mal formados."""
+    if fields and exclude:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Usa `fields` o `exclude`, no ambos"
+        )
+    if fields:
+        return "fields", _claves(fields, "fields")
+    if exclude:
+        return "exclude", _claves(exclude, "exclude")
+    return None
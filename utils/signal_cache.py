@@ -0,0 +1,100 @@
+"""
+Caché LRU/TTL de señales crudas de ranking (coseno, BM25, overlap) por usuario.
+
+Guarda el resultado de `cv_matcher.hybrid_signals` para que cambiar pesos,
+`topk` o pedir métricas solo vuelva a correr la normalización y fusión.
+Cada entrada lleva una "estampa" (updated_at del CV, versión del índice de
+vacantes); si ya no coincide con la actual, la entrada se descarta.
+La caché se acota por número de entradas y por bytes (arreglos de numpy y
+matrices dispersas de cada entrada), así el tope de memoria se cumple aunque
+crezca el catálogo de vacantes.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+from scipy import sparse
+
+SIGNAL_CACHE_SIZE = int(os.getenv("SIGNAL_CACHE_SIZE", "1024"))
+SIGNAL_CACHE_TTL = float(os.getenv("SIGNAL_CACHE_TTL", "900"))
+SIGNAL_CACHE_MAX_MB = float(os.getenv("SIGNAL_CACHE_MAX_MB", "128"))
+
+
+def _nbytes(sig: dict) -> int:
+    """Bytes aproximados de una entrada (solo cuentan los arreglos)."""
+    total = 0
+    for v in sig.values():
+        if isinstance(v, np.ndarray):
+            total += v.nbytes
+        elif sparse.issparse(v):
+            total += v.data.nbytes + v.indices.nbytes + v.indptr.nbytes
+    return total
+
+
+class SignalCache:
+    """LRU acotado (entradas y bytes) con expiración; claves (usuario_id, variante) y valores sig."""
+
+    def __init__(self, maxsize: int = SIGNAL_CACHE_SIZE, ttl: float = SIGNAL_CACHE_TTL,
+                 max_bytes: int = int(SIGNAL_CACHE_MAX_MB * 1024 * 1024)):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._data = OrderedDict()
+        self.bytes = 0
+
+    def get(self, key: tuple, stamp: tuple):
+        """Señales guardadas para `key` si siguen vigentes para `stamp`; si no, None."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            entry_stamp, created, sig, size = entry
+            if entry_stamp != stamp or time.monotonic() - created > self.ttl:
+                self._drop(key)
+                return None
+            self._data.move_to_end(key)
+            return sig
+
+    def put(self, key: tuple, stamp: tuple, sig: dict):
+        if self.maxsize <= 0:
+            return
+        size = _nbytes(sig)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._drop(key)
+            self._data[key] = (stamp, time.monotonic(), sig, size)
+            self.bytes += size
+            while len(self._data) > self.maxsize or self.bytes > self.max_bytes:
+                self._drop(next(iter(self._data)))
+
+    def invalidate_usuario(self, usuario_id: int):
+        """Descarta todas las variantes cacheadas de un usuario (p.ej. al re-subir su CV)."""
+        with self._lock:
+            for key in [k for k in self._data if k[0] == usuario_id]:
+                self._drop(key)
+
+    def _drop(self, key: tuple):
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[3]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+_SIGNAL_CACHE = None
+
+
+def get_signal_cache() -> SignalCache:
+    global _SIGNAL_CACHE
+    if _SIGNAL_CACHE is None:
+        _SIGNAL_CACHE = SignalCache()
+    return _SIGNAL_CACHE
@@ -0,0 +1,84 @@
+"""
+Vocabulario canónico de skills en memoria (frase normalizada -> ID entero).
+
+Las variantes difusas de una frase (token_sort_ratio >= umbral) se pliegan al
+mismo ID, así el overlap CV/vacante se reduce a intersección de enteros.
+token_sort_ratio compara las frases completas (sin importar el orden de las
+palabras): "python" y "python django" siguen siendo skills distintas, a
+diferencia de token_set_ratio, que da 100 si las palabras de una frase están
+contenidas en la otra.
+"""
+import threading
+from collections import defaultdict
+from rapidfuzz import process, fuzz
+
+
+class SkillVocab:
+    """Diccionario frase -> ID con índice por token para el plegado difuso."""
+
+    def __init__(self, threshold: int = 90):
+        self.threshold = threshold
+        self.alias: dict[str, int] = {}
+        self.names: dict[int, str] = {}
+        self.max_id = 0
+        self.loaded = False
+        self._by_token = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def add_skill(self, skill_id: int, nombre: str):
+        with self._lock:
+            self.names[skill_id] = nombre
+            self.alias[nombre] = skill_id
+            self.max_id = max(self.max_id, skill_id)
+            for tok in nombre.split():
+                self._by_token[tok].add(skill_id)
+
+    def add_alias(self, frase: str, skill_id: int):
+        with self._lock:
+            self.alias[frase] = skill_id
+
+    def resolve(self, frase: str) -> tuple[int | None, bool]:
+        """
+        Retorna (skill_id, es_variante_nueva). Primero búsqueda exacta y luego
+        difusa contra las skills canónicas que comparten algún token. Los
+        candidatos se copian bajo el lock (add_skill puede estar modificando los
+        conjuntos desde otro hilo); el fuzzy corre fuera de él.
+        """
+        with self._lock:
+            sid = self.alias.get(frase)
+            if sid is not None:
+                return sid, False
+            cands = set()
+            for tok in frase.split():
+                cands |= self._by_token.get(tok, set())
+            choices = {i: self.names[i] for i in cands}
+        if not choices:
+            return None, False
+        m = process.extractOne(
+            frase, choices,
+            scorer=fuzz.token_sort_ratio, score_cutoff=self.threshold
+        )
+        if m is None:
+            return None, False
+        return m[2], True
+
+    def names_for(self, ids) -> list[str]:
+        return [self.names.get(i, "") for i in ids]
+
+    def reset(self):
+        with self._lock:
+            self.alias.clear()
+            self.names.clear()
+            self._by_token.clear()
+            self.max_id = 0
+            self.loaded = False
+
+
+_SKILL_VOCAB = None
+
+
+def get_skill_vocab() -> SkillVocab:
+    global _SKILL_VOCAB
+    if _SKILL_VOCAB is None:
+        _SKILL_VOCAB = SkillVocab()
+    return _SKILL_VOCAB